@@ -1,15 +1,27 @@
 from django.contrib import admin
-from .models import ContactSubmission
+from .models import ContactSubmission, SpamRule
+
+@admin.action(description='Retry email notification')
+def retry_notification(modeladmin, request, queryset):
+    queryset.update(
+        notification_status=ContactSubmission.NOTIFICATION_PENDING,
+        notification_attempts=0,
+        notification_next_attempt_at=None,
+    )
 
 @admin.register(ContactSubmission)
 class ContactSubmissionAdmin(admin.ModelAdmin):
     """Admin interface for contact form submissions."""
     
-    list_display = ['name', 'email', 'subject', 'created_at', 'ip_address']
-    list_filter = ['created_at']
+    list_display = ['name', 'email', 'subject', 'created_at', 'ip_address', 'notification_status']
+    list_filter = ['created_at', 'notification_status']
     search_fields = ['name', 'email', 'subject', 'message']
-    readonly_fields = ['created_at', 'ip_address', 'user_agent']
+    readonly_fields = [
+        'created_at', 'ip_address', 'user_agent', 'notification_status', 'notification_attempts',
+        'notification_next_attempt_at', 'notification_sent_at', 'notification_error',
+    ]
     ordering = ['-created_at']
+    actions = [retry_notification]
     
     fieldsets = [
         ('Contact Information', {
@@ -21,5 +33,22 @@ class ContactSubmissionAdmin(admin.ModelAdmin):
         ('Metadata', {
             'fields': ['created_at', 'ip_address', 'user_agent'],
             'classes': ['collapse']
+        }),
+        ('Notification', {
+            'fields': [
+                'notification_status', 'notification_attempts', 'notification_next_attempt_at',
+                'notification_sent_at', 'notification_error',
+            ],
+            'classes': ['collapse']
         })
-    ]
\ No newline at end of file
+    ]
+
+@admin.register(SpamRule)
+class SpamRuleAdmin(admin.ModelAdmin):
+    """Admin interface for contact form spam rules."""
+    
+    list_display = ['field', 'kind', 'pattern', 'enabled', 'note', 'created_at']
+    list_filter = ['field', 'kind', 'enabled']
+    list_editable = ['enabled']
+    search_fields = ['pattern', 'note']
+    readonly_fields = ['created_at']
@@ -4,4 +4,8 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
-    verbose_name = 'Core Functionality'
\ No newline at end of file
+    verbose_name = 'Core Functionality'
+
+    def ready(self):
+        # Connects the signals that reload spam rules edited in the admin
+        from . import rules  # noqa: F401
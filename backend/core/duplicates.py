@@ -0,0 +1,201 @@
+"""
+Near-duplicate detection for contact messages.
+
+Each message is reduced to a MinHash signature of its character 5-grams,
+after lowercasing and keeping only words. The share of positions in which
+two signatures agree estimates the Jaccard similarity of the messages, so a
+message with a few characters changed still scores close to 1. Signatures
+use a fixed hash, so they are the same in every process, unlike `hash()`.
+
+Recent signatures are kept in a SQLite file in WAL mode that every worker on
+the host shares. They are indexed with banded LSH: each signature is split
+into bands, and each band is indexed by a hash of its values. A lookup only compares against
+signatures that share a whole band with the new one, so its cost depends on
+the number of likely matches rather than on the number of recent messages.
+"""
+
+import hashlib
+import operator
+import os
+import re
+import sqlite3
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from django.conf import settings
+
+# 16 bands of 5 values: messages with a similarity of 0.7 share a band 95%
+# of the time, and of 0.8 over 99.8%; at 0.2 only 0.5% of the time.
+# Shorter shingles are common to most English text, so unrelated long
+# messages would look alike and crowd the buckets
+NUM_HASHES = 80
+BAND_SIZE = 5
+SHINGLE_SIZE = 5
+
+_WORDS = re.compile(r'\w+')
+_MASK = (1 << 64) - 1
+# Offset for values borrowed by empty bins; odd, so every step differs
+_ROTATION = 0x9E3779B97F4A7C15
+# Signature position i takes the smallest hash in [_BOUNDS[i], _BOUNDS[i + 1])
+_BOUNDS = [(i << 64) // NUM_HASHES for i in range(NUM_HASHES + 1)]
+
+# Hashes of shingles seen recently; common ones repeat across messages
+_shingle_hashes: Dict[str, int] = {}
+_SHINGLE_CACHE_SIZE = 50000
+
+def _hash(data: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'big')
+
+def _shingle_hash(shingle: str) -> int:
+    value = _shingle_hashes.get(shingle)
+    if value is None:
+        if len(_shingle_hashes) >= _SHINGLE_CACHE_SIZE:
+            _shingle_hashes.clear()
+        value = _shingle_hashes[shingle] = _hash(shingle.encode())
+    return value
+
+def normalize(text: str) -> str:
+    """Lowercase words separated by single spaces; punctuation is dropped."""
+    return ' '.join(_WORDS.findall(text.lower()))
+
+@lru_cache(maxsize=128)
+def _signature(normalized: str) -> tuple:
+    shingles = {normalized[i:i + SHINGLE_SIZE] for i in range(max(len(normalized) - SHINGLE_SIZE + 1, 1))}
+    hashes = sorted(_shingle_hash(shingle) for shingle in shingles)
+
+    # One hash function split into NUM_HASHES ranges ("one permutation
+    # hashing"): each position is the smallest hash within its range
+    values: List[Optional[int]] = []
+    for position in range(NUM_HASHES):
+        index = bisect_left(hashes, _BOUNDS[position])
+        found = index < len(hashes) and hashes[index] < _BOUNDS[position + 1]
+        values.append(hashes[index] if found else None)
+
+    # Short messages leave ranges empty; each borrows from the next filled one
+    signature = []
+    for position, value in enumerate(values):
+        step = 0
+        while value is None:
+            step += 1
+            value = values[(position + step) % NUM_HASHES]
+        signature.append((value + step * _ROTATION) & _MASK)
+    return tuple(signature)
+
+def signature(text: str) -> tuple:
+    """Stable MinHash signature of a message, NUM_HASHES 64-bit values."""
+    return _signature(normalize(text))
+
+def similarity(a: tuple, b: tuple) -> float:
+    """Estimated Jaccard similarity of the messages behind two signatures."""
+    return sum(map(operator.eq, a, b)) / NUM_HASHES
+
+def _buckets(value: tuple) -> List[int]:
+    """One bucket per band: a hash of the band's number and values, as a SQLite integer."""
+    return [
+        _hash(array('Q', (band, *value[band * BAND_SIZE:(band + 1) * BAND_SIZE])).tobytes()) - (1 << 63)
+        for band in range(NUM_HASHES // BAND_SIZE)
+    ]
+
+class SignatureIndex:
+    """
+    Signatures of recent messages, expiring after a time window.
+
+    Each thread gets its own connection. A signature is stored once, and
+    its id once per band under the band's bucket.
+    """
+
+    # Expired signatures are deleted every PRUNE_EVERY additions
+    PRUNE_EVERY = 100
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._additions = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        # Connections must not cross a fork
+        if conn is None or self._local.pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS signatures ('
+                'id INTEGER PRIMARY KEY, signature BLOB NOT NULL, expires REAL NOT NULL)'
+            )
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS buckets ('
+                'bucket INTEGER NOT NULL, signature INTEGER NOT NULL, expires REAL NOT NULL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS buckets_bucket ON buckets (bucket)')
+            conn.execute('CREATE INDEX IF NOT EXISTS buckets_expires ON buckets (expires)')
+            conn.execute('CREATE INDEX IF NOT EXISTS signatures_expires ON signatures (expires)')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def closest(self, value: tuple, min_similarity: float) -> Optional[float]:
+        """
+        Similarity of the closest recent message, if at least `min_similarity`.
+
+        Returns:
+            The estimated similarity (1.0 for an exact duplicate), or None
+        """
+        buckets = _buckets(value)
+        rows = self._connection().execute(
+            f"SELECT signature FROM signatures WHERE id IN ("
+            f"SELECT signature FROM buckets WHERE bucket IN ({','.join('?' * len(buckets))})"
+            f") AND expires > ?",
+            (*buckets, time.time()),
+        ).fetchall()
+
+        best = max((similarity(value, array('Q', row[0])) for row in rows), default=None)
+        if best is None or best < min_similarity:
+            return None
+        return best
+
+    def add(self, value: tuple, window: float):
+        """Remember a signature for `window` seconds."""
+        expires = time.time() + window
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            signature_id = conn.execute(
+                'INSERT INTO signatures (signature, expires) VALUES (?, ?)',
+                (array('Q', value).tobytes(), expires),
+            ).lastrowid
+            conn.executemany(
+                'INSERT INTO buckets (bucket, signature, expires) VALUES (?, ?, ?)',
+                [(bucket, signature_id, expires) for bucket in _buckets(value)],
+            )
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+
+        self._additions += 1
+        if not self._additions % self.PRUNE_EVERY:
+            now = time.time()
+            conn.execute('DELETE FROM buckets WHERE expires <= ?', (now,))
+            conn.execute('DELETE FROM signatures WHERE expires <= ?', (now,))
+
+    def clear(self):
+        conn = self._connection()
+        conn.execute('DELETE FROM buckets')
+        conn.execute('DELETE FROM signatures')
+
+_index: Optional[SignatureIndex] = None
+
+def get_signature_index() -> SignatureIndex:
+    global _index
+
+    if _index is None:
+        _index = SignatureIndex(str(settings.CONTACT_DUPLICATE_INDEX_PATH))
+    return _index
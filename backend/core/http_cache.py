@@ -0,0 +1,153 @@
+import asyncio
+import hashlib
+import time
+from functools import wraps
+from typing import Any, Callable, Dict, Iterable, Optional
+from urllib.parse import urlencode
+
+from django.core.cache import cache
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+def _cache_key(request, query_params: Iterable[str], normalize: Optional[Callable[[Any], Dict]] = None) -> str:
+    """
+    Canonical cache key for a GET request.
+
+    Only whitelisted query parameters count, in sorted order, so tracking
+    parameters, parameter order and request headers such as User-Agent do
+    not split the cache. With `normalize`, the parameters are the values it
+    parses from the query string instead, so spellings the view treats
+    alike (`limit=020`, `featured=TRUE`) share an entry.
+    """
+    params = None
+    if normalize is not None:
+        try:
+            params = sorted(
+                (name, str(value)) for name, value in normalize(request.GET).items() if value is not None
+            )
+        except ValueError:
+            # The view rejects the query; the error response is not cached
+            pass
+    if params is None:
+        params = sorted(
+            (name, request.GET[name])
+            for name in query_params
+            if name in request.GET
+        )
+    raw = f"{request.path}?{urlencode(params)}"
+    return f"response_cache_{hashlib.sha1(raw.encode()).hexdigest()}"
+
+def _not_modified(request, etag: str, last_modified: float) -> bool:
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match is not None:
+        candidates = [tag.strip() for tag in if_none_match.split(',')]
+        return '*' in candidates or etag in candidates
+
+    if_modified_since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE', ''))
+    return if_modified_since is not None and int(last_modified) <= if_modified_since
+
+def cached_response(
+    timeout: int,
+    query_params: Iterable[str] = (),
+    max_age: Optional[int] = None,
+    s_maxage: Optional[int] = None,
+    stale_while_revalidate: Optional[int] = None,
+    normalize: Optional[Callable[[Any], Dict]] = None,
+):
+    """
+    Cache successful GET responses and answer conditional requests.
+
+    Responses are stored for `timeout` seconds under a canonical key (see
+    `_cache_key`; `normalize` parses the query string the way the view
+    does) together with a strong ETag computed from the body and a
+    Last-Modified time. A matching `If-None-Match` (or, without one,
+    `If-Modified-Since`) gets a 304. `Cache-Control` is set so a CDN can
+    serve and revalidate the response itself.
+
+    Responses carrying a `Warning` header (stale fallbacks) are passed
+    through without being cached.
+
+    Apply below `api_view`/`throttle_classes` so throttling still runs.
+    DRF `Response` objects are rendered to JSON before caching. Async views
+    get an async wrapper that uses the cache's async methods.
+    """
+    max_age = timeout if max_age is None else max_age
+    directives = ['public', f'max-age={max_age}']
+    if s_maxage is not None:
+        directives.append(f's-maxage={s_maxage}')
+    if stale_while_revalidate is not None:
+        directives.append(f'stale-while-revalidate={stale_while_revalidate}')
+    cache_control = ', '.join(directives)
+
+    def decorator(view_func):
+        if asyncio.iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def async_wrapper(request, *args, **kwargs):
+                if request.method not in ('GET', 'HEAD'):
+                    return await view_func(request, *args, **kwargs)
+
+                key = _cache_key(request, query_params, normalize)
+                entry = await cache.aget(key)
+
+                if entry is None:
+                    response = await view_func(request, *args, **kwargs)
+                    if response.status_code != 200 or response.has_header('Warning'):
+                        return response
+
+                    entry = _make_entry(response)
+                    await cache.aset(key, entry, timeout)
+
+                return _respond(request, entry, cache_control)
+
+            return async_wrapper
+
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view_func(request, *args, **kwargs)
+
+            key = _cache_key(request, query_params, normalize)
+            entry = cache.get(key)
+
+            if entry is None:
+                response = view_func(request, *args, **kwargs)
+                if response.status_code != 200 or response.has_header('Warning'):
+                    return response
+
+                entry = _make_entry(response)
+                cache.set(key, entry, timeout)
+
+            return _respond(request, entry, cache_control)
+
+        return wrapper
+
+    return decorator
+
+def _make_entry(response) -> dict:
+    """Cache entry for a successful response; DRF responses are rendered to JSON."""
+    if isinstance(response, Response):
+        body = JSONRenderer().render(response.data)
+        content_type = 'application/json'
+    else:
+        body = response.content
+        content_type = response['Content-Type']
+
+    return {
+        'body': body,
+        'content_type': content_type,
+        'etag': quote_etag(hashlib.sha256(body).hexdigest()[:32]),
+        'last_modified': time.time(),
+    }
+
+def _respond(request, entry: dict, cache_control: str) -> HttpResponse:
+    if _not_modified(request, entry['etag'], entry['last_modified']):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(entry['body'], content_type=entry['content_type'])
+
+    response['ETag'] = entry['etag']
+    response['Last-Modified'] = http_date(entry['last_modified'])
+    response['Cache-Control'] = cache_control
+    return response
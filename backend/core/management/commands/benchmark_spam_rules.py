@@ -0,0 +1,122 @@
+import random
+import re
+import time
+from itertools import islice
+from typing import Dict, List, Tuple
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.rules import DEFAULT_RULES, FULL_MATCH_FIELDS, Rule, RuleEngine
+from core.views import MAX_URLS, URL_PATTERN
+
+# The URL check as it was written before URL_PATTERN was precompiled
+LEGACY_URL_PATTERN = r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+'
+
+class Command(BaseCommand):
+    """
+    Compare the compiled rule engine with checking one pattern at a time.
+
+    The baseline checks submissions the way the serializer used to: one
+    `re.search` per pattern on freshly lowercased text, and `re.findall`
+    over the whole message for URLs. Both paths must reach the same verdict
+    for every submission; the command then reports the time per submission
+    with the built-in rules and with `--extra-rules` keyword rules added.
+    """
+
+    help = 'Benchmark the compiled contact rule engine against per-pattern checks'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--submissions',
+            type=int,
+            default=200,
+            help='Synthetic submissions checked per measurement (default: 200)',
+        )
+        parser.add_argument(
+            '--extra-rules',
+            type=int,
+            default=500,
+            help='Keyword rules added to the message field in the second run (default: 500)',
+        )
+
+    def handle(self, *args, **options):
+        rng = random.Random(0)
+        submissions = [self.make_submission(i, rng) for i in range(options['submissions'])]
+        base_rules = [Rule(entry['field'], entry['kind'], entry['pattern']) for entry in DEFAULT_RULES]
+        extra_rules = [
+            Rule('message', 'keyword', f"offer-{i}-{rng.randrange(10 ** 6)}")
+            for i in range(options['extra_rules'])
+        ]
+
+        for label, rules in [('built-in rules', base_rules), (f"+{len(extra_rules)} keywords", base_rules + extra_rules)]:
+            engine = RuleEngine(rules)
+            by_field = self.group(rules)
+
+            spam = 0
+            for submission in submissions:
+                expected = self.legacy_verdict(by_field, submission)
+                if self.engine_verdict(engine, submission) != expected:
+                    raise CommandError(f"{label}: verdicts differ for {submission}")
+                spam += any(expected)
+
+            legacy_time = self.measure(lambda: [self.legacy_verdict(by_field, s) for s in submissions], len(submissions))
+            engine_time = self.measure(lambda: [self.engine_verdict(engine, s) for s in submissions], len(submissions))
+            self.stdout.write(
+                f"{label} ({len(rules)} rules, {spam}/{len(submissions)} rejected): "
+                f"per-pattern {legacy_time * 1e6:.1f} us/submission, "
+                f"compiled {engine_time * 1e6:.1f} us/submission ({legacy_time / engine_time:.1f}x)"
+            )
+
+        self.stdout.write(self.style.SUCCESS('Verdicts identical for all submissions'))
+
+    def group(self, rules: List[Rule]) -> Dict[str, List[Rule]]:
+        by_field: Dict[str, List[Rule]] = {}
+        for rule in rules:
+            by_field.setdefault(rule.field, []).append(rule)
+        return by_field
+
+    def legacy_verdict(self, by_field: Dict[str, List[Rule]], submission: Dict[str, str]) -> Tuple[bool, ...]:
+        verdict = []
+        for field in ('name', 'subject', 'message', 'email_domain'):
+            value = submission[field]
+            if field in FULL_MATCH_FIELDS:
+                # Domains were looked up in a list
+                verdict.append(value.lower() in [rule.pattern for rule in by_field.get(field, [])])
+            else:
+                verdict.append(any(re.search(rule.regex(), value.lower()) for rule in by_field.get(field, [])))
+        verdict.append(len(re.findall(LEGACY_URL_PATTERN, submission['message'])) > MAX_URLS)
+        return tuple(verdict)
+
+    def engine_verdict(self, engine: RuleEngine, submission: Dict[str, str]) -> Tuple[bool, ...]:
+        verdict = [
+            engine.match(field, submission[field]) is not None
+            for field in ('name', 'subject', 'message', 'email_domain')
+        ]
+        verdict.append(len(list(islice(URL_PATTERN.finditer(submission['message']), MAX_URLS + 1))) > MAX_URLS)
+        return tuple(verdict)
+
+    def measure(self, func, count: int) -> float:
+        """Best of three runs, in seconds per submission."""
+        best = None
+        for _ in range(3):
+            started = time.perf_counter()
+            func()
+            elapsed = (time.perf_counter() - started) / count
+            best = elapsed if best is None else min(best, elapsed)
+        return best
+
+    def make_submission(self, i: int, rng: random.Random) -> Dict[str, str]:
+        words = ['hello', 'project', 'portfolio', 'Django', 'React', 'collaboration', 'freelance', 'question']
+        message = ' '.join(rng.choice(words) for _ in range(rng.randint(20, 120)))
+        # Half the submissions break a rule, each in a different field or check
+        kind = i % 10
+        if kind == 1:
+            message += ' <SCRIPT>alert(1)</script>'
+        elif kind == 2:
+            message += ' see https://a.example.com https://b.example.com https://c.example.com'
+        return {
+            'name': 'Jane <b>' if kind == 3 else f"Jane Doe {i}",
+            'subject': f"Question about project {i}",
+            'message': message + (' https://files.example.com/setup.EXE' if kind == 4 else ''),
+            'email_domain': 'Mailinator.com' if kind == 5 else 'example.com',
+        }
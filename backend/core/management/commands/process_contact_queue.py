@@ -0,0 +1,62 @@
+import logging
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from core.queue import JournalDrainer, get_journal
+
+logger = logging.getLogger(__name__)
+
+class Command(BaseCommand):
+    """
+    Insert contact submissions queued in write-behind mode.
+
+    Web workers drain the journal themselves; this drains it by hand, e.g.
+    after the web process was stopped with entries still queued. It must run
+    on the host (or in the container) that holds the journal file. Several
+    drainers may share a journal; each claims its own batches.
+    """
+
+    help = 'Write queued contact submissions to the database in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.CONTACT_QUEUE_BATCH_SIZE,
+            help='Submissions inserted per batch (default: CONTACT_QUEUE_BATCH_SIZE)',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=settings.CONTACT_QUEUE_INTERVAL,
+            help='Seconds between polls of an empty queue (default: CONTACT_QUEUE_INTERVAL)',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Drain the queue a single time and exit',
+        )
+
+    def handle(self, *args, **options):
+        drainer = JournalDrainer(
+            get_journal(),
+            options['batch_size'],
+            options['interval'],
+            settings.CONTACT_QUEUE_LEASE,
+            settings.CONTACT_QUEUE_MAX_FAILURES,
+        )
+
+        while True:
+            try:
+                drainer.drain()
+            except Exception:
+                # Entries stay in the journal; retried on the next poll
+                logger.exception("Failed to store queued contact submissions")
+                connections.close_all()
+
+            if options['once']:
+                return
+            time.sleep(options['interval'])
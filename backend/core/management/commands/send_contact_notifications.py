@@ -0,0 +1,61 @@
+import logging
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from core.notifications import NotificationDispatcher
+
+logger = logging.getLogger(__name__)
+
+class Command(BaseCommand):
+    """
+    Email the site owner about new contact submissions.
+
+    Polls for pending notifications every `--interval` seconds and sends them
+    over one SMTP connection that stays open between polls. Submissions that
+    pile up between polls are sent as a single digest.
+    """
+
+    help = 'Send email notifications for contact submissions'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=settings.CONTACT_NOTIFY_INTERVAL,
+            help='Seconds between polls for pending notifications (default: CONTACT_NOTIFY_INTERVAL)',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Send the notifications currently due and exit',
+        )
+
+    def handle(self, *args, **options):
+        if not settings.CONTACT_NOTIFY_RECIPIENTS:
+            raise CommandError("CONTACT_NOTIFY_RECIPIENTS is not set; there is nobody to notify")
+
+        dispatcher = NotificationDispatcher()
+        try:
+            while True:
+                try:
+                    outcomes = dispatcher.dispatch()
+                except Exception:
+                    # Submissions stay pending; retried on the next poll
+                    logger.exception("Failed to send contact notifications")
+                    dispatcher.close()
+                    connections.close_all()
+                else:
+                    if outcomes:
+                        logger.info(
+                            "Contact notifications: "
+                            + ', '.join(f"{count} {outcome}" for outcome, count in sorted(outcomes.items()))
+                        )
+
+                if options['once']:
+                    return
+                time.sleep(options['interval'])
+        finally:
+            dispatcher.close()
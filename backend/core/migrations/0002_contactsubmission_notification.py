@@ -0,0 +1,45 @@
+# Generated by Django 4.2.7 on 2026-10-18 20:55
+
+from django.db import migrations, models
+
+
+def skip_earlier_submissions(apps, schema_editor):
+    # Only submissions received from now on are notified about
+    ContactSubmission = apps.get_model('core', 'ContactSubmission')
+    ContactSubmission.objects.update(notification_status='skipped')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contactsubmission',
+            name='notification_attempts',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='contactsubmission',
+            name='notification_error',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='contactsubmission',
+            name='notification_next_attempt_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='contactsubmission',
+            name='notification_sent_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='contactsubmission',
+            name='notification_status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('sent', 'Sent'), ('failed', 'Failed'), ('skipped', 'Skipped')], db_index=True, default='pending', max_length=10),
+        ),
+        migrations.RunPython(skip_earlier_submissions, migrations.RunPython.noop),
+    ]
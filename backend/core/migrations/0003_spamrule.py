@@ -0,0 +1,31 @@
+# Generated by Django 4.2.7 on 2026-10-18 20:59
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_contactsubmission_notification'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SpamRule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('field', models.CharField(choices=[('name', 'Name'), ('subject', 'Subject'), ('message', 'Message'), ('email_domain', 'Email domain')], max_length=20)),
+                ('kind', models.CharField(choices=[('keyword', 'Keyword'), ('regex', 'Regular expression')], default='keyword', max_length=10)),
+                ('pattern', models.CharField(help_text='Regexes run on lowercased text; email domain rules must match the whole domain', max_length=500)),
+                ('enabled', models.BooleanField(default=True)),
+                ('note', models.CharField(blank=True, max_length=200)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'Spam Rule',
+                'verbose_name_plural': 'Spam Rules',
+                'ordering': ['field', 'id'],
+            },
+        ),
+    ]
@@ -1,9 +1,21 @@
+from django.core.exceptions import ValidationError
 from django.db import models
 from django.utils import timezone
 
 class ContactSubmission(models.Model):
     """Model to store contact form submissions."""
     
+    NOTIFICATION_PENDING = 'pending'
+    NOTIFICATION_SENT = 'sent'
+    NOTIFICATION_FAILED = 'failed'
+    NOTIFICATION_SKIPPED = 'skipped'
+    NOTIFICATION_STATUS_CHOICES = [
+        (NOTIFICATION_PENDING, 'Pending'),
+        (NOTIFICATION_SENT, 'Sent'),
+        (NOTIFICATION_FAILED, 'Failed'),
+        (NOTIFICATION_SKIPPED, 'Skipped'),
+    ]
+    
     name = models.CharField(max_length=100)
     email = models.EmailField()
     subject = models.CharField(max_length=200)
@@ -12,10 +24,60 @@ class ContactSubmission(models.Model):
     ip_address = models.GenericIPAddressField(null=True, blank=True)
     user_agent = models.TextField(blank=True)
     
+    # Email notification delivery, updated by `manage.py send_contact_notifications`
+    notification_status = models.CharField(
+        max_length=10, choices=NOTIFICATION_STATUS_CHOICES, default=NOTIFICATION_PENDING, db_index=True
+    )
+    notification_attempts = models.PositiveSmallIntegerField(default=0)
+    notification_next_attempt_at = models.DateTimeField(null=True, blank=True)
+    notification_sent_at = models.DateTimeField(null=True, blank=True)
+    notification_error = models.TextField(blank=True)
+    
     class Meta:
         ordering = ['-created_at']
         verbose_name = 'Contact Submission'
         verbose_name_plural = 'Contact Submissions'
     
     def __str__(self):
-        return f"{self.name} - {self.subject} ({self.created_at.strftime('%Y-%m-%d %H:%M')})"
\ No newline at end of file
+        return f"{self.name} - {self.subject} ({self.created_at.strftime('%Y-%m-%d %H:%M')})"
+
+class SpamRule(models.Model):
+    """Contact form rule managed from the admin, applied without a deploy."""
+    
+    FIELD_CHOICES = [
+        ('name', 'Name'),
+        ('subject', 'Subject'),
+        ('message', 'Message'),
+        ('email_domain', 'Email domain'),
+    ]
+    KIND_KEYWORD = 'keyword'
+    KIND_REGEX = 'regex'
+    KIND_CHOICES = [
+        (KIND_KEYWORD, 'Keyword'),
+        (KIND_REGEX, 'Regular expression'),
+    ]
+    
+    field = models.CharField(max_length=20, choices=FIELD_CHOICES)
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES, default=KIND_KEYWORD)
+    pattern = models.CharField(
+        max_length=500,
+        help_text='Regexes run on lowercased text; email domain rules must match the whole domain'
+    )
+    enabled = models.BooleanField(default=True)
+    note = models.CharField(max_length=200, blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    
+    class Meta:
+        ordering = ['field', 'id']
+        verbose_name = 'Spam Rule'
+        verbose_name_plural = 'Spam Rules'
+    
+    def __str__(self):
+        return f"{self.get_field_display()}: {self.pattern}"
+    
+    def clean(self):
+        from .rules import Rule
+        
+        error = Rule(self.field, self.kind, self.pattern).error()
+        if error:
+            raise ValidationError({'pattern': error})
@@ -0,0 +1,211 @@
+"""
+Email notifications for contact form submissions, sent outside the request path.
+
+Submissions are stored with `notification_status='pending'`; the dispatcher
+(`manage.py send_contact_notifications`) polls for them and mails the site
+owner. It keeps a single SMTP connection open between rounds, so a steady
+trickle of submissions costs one handshake rather than one per message, and
+it closes the connection once it has been idle for a while.
+
+When several submissions are due at once, as during a burst, they go out as
+one digest instead of one message each. Failed sends are retried with
+exponential backoff until `CONTACT_NOTIFY_MAX_ATTEMPTS`, and the outcome is
+recorded on each `ContactSubmission`.
+"""
+
+import logging
+import smtplib
+import time
+from datetime import timedelta
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import ContactSubmission
+
+logger = logging.getLogger(__name__)
+
+# Errors that leave a submission to be retried later
+SEND_ERRORS = (smtplib.SMTPException, OSError)
+# The server refused one message; the connection is still usable
+MESSAGE_ERRORS = (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused, smtplib.SMTPDataError)
+
+def submission_message(submission: ContactSubmission, recipients: List[str]) -> EmailMessage:
+    """Notification for a single submission; replies go to its sender."""
+    body = (
+        f"From: {submission.name} <{submission.email}>\n"
+        f"Received: {submission.created_at.isoformat()}\n"
+        f"IP address: {submission.ip_address or 'unknown'}\n\n"
+        f"{submission.message}\n"
+    )
+    # Line breaks in a header would be rejected as header injection
+    subject = ' '.join(submission.subject.splitlines())
+    return EmailMessage(
+        subject=f"Contact form: {subject}",
+        body=body,
+        to=recipients,
+        reply_to=[submission.email],
+    )
+
+def digest_message(submissions: List[ContactSubmission], recipients: List[str]) -> EmailMessage:
+    """One notification covering several submissions, oldest first."""
+    sections = [
+        f"{index}. {submission.subject}\n"
+        f"From: {submission.name} <{submission.email}>\n"
+        f"Received: {submission.created_at.isoformat()}\n\n"
+        f"{submission.message}\n"
+        for index, submission in enumerate(submissions, start=1)
+    ]
+    return EmailMessage(
+        subject=f"Contact form: {len(submissions)} new submissions",
+        body=('\n' + '-' * 40 + '\n\n').join(sections),
+        to=recipients,
+    )
+
+class NotificationDispatcher:
+    """
+    Sends pending notifications over one reusable mail connection.
+
+    Not thread-safe; run a single dispatcher process per database.
+    """
+
+    def __init__(
+        self,
+        recipients: Optional[List[str]] = None,
+        batch_size: Optional[int] = None,
+        digest_threshold: Optional[int] = None,
+        max_attempts: Optional[int] = None,
+        retry_backoff: Optional[float] = None,
+        idle_timeout: Optional[float] = None,
+    ):
+        self.recipients = recipients or settings.CONTACT_NOTIFY_RECIPIENTS
+        self.batch_size = batch_size or settings.CONTACT_NOTIFY_BATCH_SIZE
+        self.digest_threshold = digest_threshold or settings.CONTACT_NOTIFY_DIGEST_THRESHOLD
+        self.max_attempts = max_attempts or settings.CONTACT_NOTIFY_MAX_ATTEMPTS
+        self.retry_backoff = settings.CONTACT_NOTIFY_RETRY_BACKOFF if retry_backoff is None else retry_backoff
+        self.idle_timeout = settings.CONTACT_NOTIFY_IDLE_TIMEOUT if idle_timeout is None else idle_timeout
+        self._connection = None
+        self._last_used = 0.0
+
+    def due(self) -> List[ContactSubmission]:
+        """Pending submissions whose next attempt is due, oldest first."""
+        now = timezone.now()
+        return list(
+            ContactSubmission.objects.filter(notification_status=ContactSubmission.NOTIFICATION_PENDING)
+            .filter(Q(notification_next_attempt_at__isnull=True) | Q(notification_next_attempt_at__lte=now))
+            .order_by('created_at')[:self.batch_size]
+        )
+
+    def dispatch(self) -> Dict[str, int]:
+        """
+        Run one round: send everything currently due.
+
+        Returns:
+            Number of submissions per outcome ('sent', 'retrying', 'failed')
+        """
+        submissions = self.due()
+        if not submissions:
+            if self._connection is not None and time.monotonic() - self._last_used > self.idle_timeout:
+                self.close()
+            return {}
+
+        if len(submissions) >= self.digest_threshold:
+            groups = [submissions]
+        else:
+            groups = [[submission] for submission in submissions]
+
+        outcomes: Dict[str, int] = {}
+        for index, group in enumerate(groups):
+            try:
+                if len(group) > 1:
+                    message = digest_message(group, self.recipients)
+                else:
+                    message = submission_message(group[0], self.recipients)
+                # Render the headers now, so a bad submission fails on its
+                # own instead of inside the backend (e.g. BadHeaderError)
+                message.message()
+            except ValueError as e:
+                logger.warning(f"Could not build the contact notification for {len(group)} submissions: {e}")
+                self._record_failure(group, e, outcomes)
+                continue
+
+            try:
+                self._send(message)
+            except MESSAGE_ERRORS as e:
+                # Refused by the server; other messages may still go through
+                logger.warning(f"Contact notification for {len(group)} submissions refused: {e}")
+                self._record_failure(group, e, outcomes)
+            except SEND_ERRORS as e:
+                # The server is unreachable; count an attempt for everything due and back off
+                remaining = [submission for rest in groups[index:] for submission in rest]
+                logger.warning(f"Contact notifications failed, retrying {len(remaining)} submissions later: {e}")
+                self._record_failure(remaining, e, outcomes)
+                break
+            else:
+                self._record_success(group)
+                outcomes['sent'] = outcomes.get('sent', 0) + len(group)
+
+        return outcomes
+
+    def close(self):
+        """Close the mail connection, if open."""
+        if self._connection is None:
+            return
+        try:
+            self._connection.close()
+        except SEND_ERRORS:
+            pass
+        self._connection = None
+
+    def _send(self, message: EmailMessage):
+        # The server may have dropped the connection while it sat idle; reconnect once
+        for attempt in range(2):
+            if self._connection is None:
+                connection = get_connection(fail_silently=False)
+                connection.open()
+                self._connection = connection
+            try:
+                self._connection.send_messages([message])
+                self._last_used = time.monotonic()
+                return
+            except smtplib.SMTPServerDisconnected:
+                self.close()
+                if attempt:
+                    raise
+            except MESSAGE_ERRORS:
+                raise
+            except SEND_ERRORS:
+                self.close()
+                raise
+
+    def _record_success(self, submissions: List[ContactSubmission]):
+        ContactSubmission.objects.filter(pk__in=[submission.pk for submission in submissions]).update(
+            notification_status=ContactSubmission.NOTIFICATION_SENT,
+            notification_attempts=F('notification_attempts') + 1,
+            notification_sent_at=timezone.now(),
+            notification_next_attempt_at=None,
+            notification_error='',
+        )
+
+    def _record_failure(self, submissions: List[ContactSubmission], error: Exception, outcomes: Dict[str, int]):
+        now = timezone.now()
+        for submission in submissions:
+            submission.notification_attempts += 1
+            submission.notification_error = str(error) or error.__class__.__name__
+            if submission.notification_attempts >= self.max_attempts:
+                submission.notification_status = ContactSubmission.NOTIFICATION_FAILED
+                submission.notification_next_attempt_at = None
+                outcome = 'failed'
+            else:
+                # 1x, 2x, 4x, ... the base delay
+                delay = self.retry_backoff * 2 ** (submission.notification_attempts - 1)
+                submission.notification_next_attempt_at = now + timedelta(seconds=delay)
+                outcome = 'retrying'
+            outcomes[outcome] = outcomes.get(outcome, 0) + 1
+
+        ContactSubmission.objects.bulk_update(submissions, [
+            'notification_status', 'notification_attempts', 'notification_next_attempt_at', 'notification_error',
+        ])
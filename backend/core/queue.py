@@ -0,0 +1,335 @@
+"""
+Durable local queue for contact submissions in write-behind mode.
+
+Requests append validated submissions to a journal, a SQLite database in
+WAL mode with `synchronous=FULL`, so an entry is on disk before the client
+gets its 202. A background thread in each web worker (`JournalDrainer`)
+claims entries in batches, inserts them with one `bulk_create` and only
+then removes them from the journal. The journal is drained by the process
+that wrote it because platforms that run each Procfile process in its own
+container give every container its own filesystem.
+
+Delivery is at-least-once: a worker that dies mid-batch leaves its claim to
+expire, and the entries are claimed again. Redelivered entries are checked
+against the submissions already stored, so a batch that was inserted but
+not yet acknowledged is not inserted twice.
+"""
+
+import atexit
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import DataError, IntegrityError, connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import ContactSubmission
+
+logger = logging.getLogger(__name__)
+
+# Errors caused by an entry's contents; storing it again will fail the same way
+ENTRY_ERRORS = (IntegrityError, DataError, KeyError, TypeError, ValueError)
+
+class SubmissionJournal:
+    """
+    Append-only journal of submissions waiting to be written to the database.
+
+    Each thread gets its own connection. Claims take the database write
+    lock, so several workers (threads or processes) never claim the same
+    entry while its lease lasts.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        # Connections must not cross a fork
+        if conn is None or self._local.pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            # Sync on every commit: an acknowledged submission survives a power loss too
+            conn.execute('PRAGMA synchronous=FULL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS journal ('
+                'id INTEGER PRIMARY KEY AUTOINCREMENT, payload TEXT NOT NULL, '
+                'enqueued_at REAL NOT NULL, claimed_until REAL, attempts INTEGER NOT NULL DEFAULT 0, '
+                'failures INTEGER NOT NULL DEFAULT 0)'
+            )
+            if 'failures' not in {row[1] for row in conn.execute('PRAGMA table_info(journal)')}:
+                # Journals written before failures were counted
+                conn.execute('ALTER TABLE journal ADD COLUMN failures INTEGER NOT NULL DEFAULT 0')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS dead_letters ('
+                'id INTEGER PRIMARY KEY, payload TEXT NOT NULL, enqueued_at REAL NOT NULL, '
+                'failed_at REAL NOT NULL, error TEXT NOT NULL)'
+            )
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def append(self, record: Dict) -> int:
+        """Durably add a submission; returns its journal id."""
+        cursor = self._connection().execute(
+            'INSERT INTO journal (payload, enqueued_at) VALUES (?, ?)',
+            (json.dumps(record), time.time()),
+        )
+        return cursor.lastrowid
+
+    def claim(self, limit: int, lease: float) -> List[Tuple[int, Dict, int]]:
+        """
+        Claim up to `limit` of the oldest unclaimed (or expired) entries.
+
+        Args:
+            limit: Largest number of entries to claim
+            lease: Seconds before unacknowledged entries may be claimed again
+
+        Returns:
+            List of (journal id, submission, number of times claimed)
+        """
+        conn = self._connection()
+        now = time.time()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            rows = conn.execute(
+                'SELECT id, payload, attempts FROM journal '
+                'WHERE claimed_until IS NULL OR claimed_until <= ? ORDER BY id LIMIT ?',
+                (now, limit),
+            ).fetchall()
+            if rows:
+                conn.execute(
+                    f"UPDATE journal SET claimed_until = ?, attempts = attempts + 1 "
+                    f"WHERE id IN ({','.join('?' * len(rows))})",
+                    (now + lease, *(row[0] for row in rows)),
+                )
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        return [(entry_id, json.loads(payload), attempts + 1) for entry_id, payload, attempts in rows]
+
+    def ack(self, ids: List[int]):
+        """Remove entries that have been written to the database."""
+        if ids:
+            self._connection().execute(
+                f"DELETE FROM journal WHERE id IN ({','.join('?' * len(ids))})", ids
+            )
+
+    def release(self, ids: List[int]):
+        """Make claimed entries available again without waiting for their lease."""
+        if ids:
+            self._connection().execute(
+                f"UPDATE journal SET claimed_until = NULL WHERE id IN ({','.join('?' * len(ids))})", ids
+            )
+
+    def fail(self, entry_id: int, error: Exception, max_failures: int) -> bool:
+        """
+        Count a failure to store one entry.
+
+        The entry is made available again, or moved to the `dead_letters`
+        table once it has failed `max_failures` times.
+
+        Returns:
+            Whether the entry was moved aside
+        """
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute(
+                'UPDATE journal SET failures = failures + 1, claimed_until = NULL WHERE id = ?', (entry_id,)
+            )
+            dead = conn.execute(
+                'INSERT INTO dead_letters (id, payload, enqueued_at, failed_at, error) '
+                'SELECT id, payload, enqueued_at, ?, ? FROM journal WHERE id = ? AND failures >= ?',
+                (time.time(), str(error) or error.__class__.__name__, entry_id, max_failures),
+            ).rowcount
+            if dead:
+                conn.execute('DELETE FROM journal WHERE id = ?', (entry_id,))
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        return bool(dead)
+
+    def pending(self) -> int:
+        """Number of entries not yet written to the database."""
+        return self._connection().execute('SELECT COUNT(*) FROM journal').fetchone()[0]
+
+_journal: Optional[SubmissionJournal] = None
+
+def get_journal() -> SubmissionJournal:
+    global _journal
+
+    if _journal is None:
+        _journal = SubmissionJournal(str(settings.CONTACT_QUEUE_PATH))
+    return _journal
+
+def submission_record(validated_data: Dict, ip_address: Optional[str], user_agent: str) -> Dict:
+    """JSON-safe journal entry for a validated contact form."""
+    return {
+        'name': validated_data['name'],
+        'email': validated_data['email'],
+        'subject': validated_data['subject'],
+        'message': validated_data['message'],
+        'ip_address': ip_address,
+        'user_agent': user_agent,
+        # Set on receipt, not on insert, and used to recognize redelivered entries
+        'created_at': timezone.now().isoformat(),
+    }
+
+def _store(entries: List[Tuple[int, Dict, int]]):
+    """Insert journal entries with one `bulk_create`, skipping ones already stored."""
+    submissions = [
+        ContactSubmission(**dict(record, created_at=parse_datetime(record['created_at'])))
+        for _, record, _ in entries
+    ]
+
+    redelivered = [
+        submission for submission, (_, _, attempts) in zip(submissions, entries) if attempts > 1
+    ]
+    if redelivered:
+        # A previous claim may have been inserted but not acknowledged
+        stored = set(ContactSubmission.objects.filter(
+            created_at__in=[submission.created_at for submission in redelivered],
+        ).values_list('created_at', 'email'))
+        submissions = [
+            submission for submission in submissions
+            if (submission.created_at, submission.email) not in stored
+        ]
+
+    with transaction.atomic():
+        ContactSubmission.objects.bulk_create(submissions)
+
+def flush(journal: SubmissionJournal, batch_size: int, lease: float, max_failures: int) -> int:
+    """
+    Write one batch of queued submissions to the database.
+
+    If the batch is rejected because of its contents, its entries are stored
+    one at a time, so a bad entry cannot hold back the ones behind it. An
+    entry that fails `max_failures` times is moved to the dead letters.
+    Other errors (e.g. the database is down) leave the whole batch queued.
+
+    Returns:
+        Number of entries taken off the journal
+    """
+    claimed = journal.claim(batch_size, lease)
+    if not claimed:
+        return 0
+
+    ids = [entry_id for entry_id, _, _ in claimed]
+    try:
+        _store(claimed)
+    except ENTRY_ERRORS:
+        return _store_each(journal, claimed, max_failures)
+    except Exception:
+        journal.release(ids)
+        raise
+
+    journal.ack(ids)
+    return len(ids)
+
+def _store_each(journal: SubmissionJournal, claimed: List[Tuple[int, Dict, int]], max_failures: int) -> int:
+    removed = 0
+    for index, entry in enumerate(claimed):
+        entry_id = entry[0]
+        try:
+            _store([entry])
+        except ENTRY_ERRORS as e:
+            if journal.fail(entry_id, e, max_failures):
+                logger.error(f"Moved contact submission {entry_id} to the dead letters after {max_failures} failures: {e}")
+                removed += 1
+            else:
+                logger.warning(f"Could not store queued contact submission {entry_id}: {e}")
+            continue
+        except Exception:
+            journal.release([entry_id for entry_id, _, _ in claimed[index:]])
+            raise
+        journal.ack([entry_id])
+        removed += 1
+    return removed
+
+class JournalDrainer:
+    """
+    Writes journaled submissions to the database from a background thread.
+
+    Each web worker runs its own drainer, started by its first write-behind
+    submission. Workers on a host share the journal and each claims its own
+    batches. When the worker exits cleanly it drains once more, so a
+    redeploy leaves as little as possible in a journal that is about to be
+    discarded with its container.
+    """
+
+    def __init__(self, journal: SubmissionJournal, batch_size: int, interval: float, lease: float, max_failures: int):
+        self.journal = journal
+        self.batch_size = batch_size
+        self.interval = interval
+        self.lease = lease
+        self.max_failures = max_failures
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Start the drainer thread if it is not running."""
+        if self._thread is None or not self._thread.is_alive():
+            with self._lock:
+                if self._thread is None or not self._thread.is_alive():
+                    if self._thread is None:
+                        atexit.register(self._drain_at_exit)
+                    self._thread = threading.Thread(target=self._run, name='contact-queue', daemon=True)
+                    self._thread.start()
+
+    def drain(self) -> int:
+        """Store everything queued right now; returns the number of entries taken off."""
+        processed = 0
+        while True:
+            count = flush(self.journal, self.batch_size, self.lease, self.max_failures)
+            processed += count
+            if count < self.batch_size:
+                break
+
+        if processed:
+            logger.info(f"Contact queue drained: {processed} submissions processed, {self.journal.pending()} pending")
+        return processed
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.drain()
+            except Exception:
+                # Entries stay in the journal; retried on the next poll
+                logger.exception("Failed to store queued contact submissions")
+            finally:
+                # Runs outside the request cycle; don't keep a connection open while idle
+                connection.close()
+
+    def _drain_at_exit(self):
+        try:
+            self.drain()
+        except Exception:
+            logger.exception("Failed to store queued contact submissions on exit")
+
+_drainer: Optional[JournalDrainer] = None
+
+def get_drainer() -> JournalDrainer:
+    global _drainer
+
+    if _drainer is None:
+        _drainer = JournalDrainer(
+            get_journal(),
+            settings.CONTACT_QUEUE_BATCH_SIZE,
+            settings.CONTACT_QUEUE_INTERVAL,
+            settings.CONTACT_QUEUE_LEASE,
+            settings.CONTACT_QUEUE_MAX_FAILURES,
+        )
+    return _drainer
@@ -0,0 +1,233 @@
+"""
+Spam and validation rules for contact form fields.
+
+All rules for a field are compiled into one pattern, so checking a field is
+a single scan of its lowercased text however many rules there are. Keywords
+match literally and case-insensitively; regex rules are written for
+lowercase text. Rules come from two places:
+
+- `CONTACT_SPAM_RULES_FILE`, a JSON list of rules that replaces the built-in
+  `DEFAULT_RULES` (read at start-up)
+- enabled `SpamRule` rows, edited in the admin; saving or deleting one makes
+  every worker rebuild its matchers on its next request
+"""
+
+import json
+import logging
+import re
+import time
+import uuid
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import SpamRule
+
+logger = logging.getLogger(__name__)
+
+FIELDS = ('name', 'subject', 'message', 'email_domain')
+
+# Fields matched against their whole value rather than searched
+FULL_MATCH_FIELDS = {'email_domain'}
+
+_MARKUP = r'[<>]|script|javascript|php|sql'
+
+DEFAULT_RULES = [
+    {'field': 'name', 'kind': 'regex', 'pattern': _MARKUP},
+    {'field': 'subject', 'kind': 'regex', 'pattern': _MARKUP},
+    {'field': 'message', 'kind': 'regex', 'pattern': r'<script'},
+    {'field': 'message', 'kind': 'regex', 'pattern': r'javascript:'},
+    {'field': 'message', 'kind': 'regex', 'pattern': r'php'},
+    {'field': 'message', 'kind': 'regex', 'pattern': r'sql\s+(select|insert|update|delete|drop|create)'},
+    # Suspicious file downloads
+    {'field': 'message', 'kind': 'regex', 'pattern': r'http[s]?://[^\s]+\.(exe|zip|rar)'},
+    # Temporary email providers
+    {'field': 'email_domain', 'kind': 'keyword', 'pattern': '10minutemail.com'},
+    {'field': 'email_domain', 'kind': 'keyword', 'pattern': 'tempmail.org'},
+    {'field': 'email_domain', 'kind': 'keyword', 'pattern': 'guerrillamail.com'},
+    {'field': 'email_domain', 'kind': 'keyword', 'pattern': 'mailinator.com'},
+]
+
+RULES_VERSION_KEY = 'contact_spam_rules_version'
+
+_BACKREFERENCE = re.compile(r'\\[1-9]|\(\?P=')
+
+class Rule(NamedTuple):
+    field: str
+    kind: str
+    pattern: str
+
+    def regex(self) -> str:
+        """This rule as a regular expression; keywords match literally."""
+        return re.escape(self.pattern.lower()) if self.kind == SpamRule.KIND_KEYWORD else self.pattern
+
+    def error(self) -> Optional[str]:
+        """Why this rule cannot be used, or None if it is valid."""
+        if self.field not in FIELDS:
+            return f"Unknown field '{self.field}'"
+        if self.kind not in (SpamRule.KIND_KEYWORD, SpamRule.KIND_REGEX):
+            return f"Unknown rule kind '{self.kind}'"
+        if not self.pattern:
+            return "Pattern is empty"
+        try:
+            # Wrapped the way the combined matcher embeds it, so patterns
+            # that only compile on their own (e.g. leading inline flags) fail
+            compiled = re.compile(f"(?:{self.regex()})")
+        except re.error as e:
+            return f"Invalid regular expression: {e}"
+        if compiled.groupindex or _BACKREFERENCE.search(self.regex()):
+            # Group names and numbers clash once rules are combined
+            return "Named groups and backreferences are not supported"
+        return None
+
+def _trie_regex(words: Iterable[str]) -> str:
+    """
+    Regex matching any of `words`, nested by shared prefix.
+
+    A flat alternation makes the regex engine try every word at every
+    position; nested by prefix, each position costs one branch per character
+    and positions that cannot start a word are skipped without trying any.
+    """
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+    return _node_regex(trie)
+
+def _node_regex(node: Dict[str, dict]) -> str:
+    branches = [re.escape(char) + _node_regex(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ''
+    body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+    # A word ends here, and longer ones continue
+    return f"(?:{body})?" if '' in node else body
+
+class RuleEngine:
+    """
+    Precompiled matchers for a set of rules, one per field.
+
+    Each field's keywords are merged into a prefix tree and combined with its
+    regex rules into a single pattern, which is matched against the
+    lowercased text. Which rule matched is only worked out after a hit.
+    """
+
+    def __init__(self, rules: Iterable[Rule]):
+        self.matchers: Dict[str, re.Pattern] = {}
+        self.keywords: Dict[str, Dict[str, Rule]] = {}
+        self.regexes: Dict[str, List[Tuple[Rule, re.Pattern]]] = {}
+
+        for rule in rules:
+            error = rule.error()
+            if error:
+                logger.error(f"Skipping contact rule {rule.field}/{rule.pattern!r}: {error}")
+                continue
+            if rule.kind == SpamRule.KIND_KEYWORD:
+                self.keywords.setdefault(rule.field, {}).setdefault(rule.pattern.lower(), rule)
+            else:
+                self.regexes.setdefault(rule.field, []).append((rule, re.compile(rule.regex())))
+
+        for field in FIELDS:
+            alternatives = [f"(?:{rule.regex()})" for rule, _ in self.regexes.get(field, [])]
+            if field in self.keywords:
+                alternatives.append(_trie_regex(self.keywords[field]))
+            if alternatives:
+                self.matchers[field] = re.compile('|'.join(alternatives))
+
+    def match(self, field: str, text: str) -> Optional[Rule]:
+        """
+        Return a rule `text` breaks, or None.
+
+        Email domain rules must match the whole domain; other rules match
+        anywhere in the text.
+        """
+        matcher = self.matchers.get(field)
+        if matcher is None:
+            return None
+
+        text = text.lower()
+        full = field in FULL_MATCH_FIELDS
+        found = matcher.fullmatch(text) if full else matcher.search(text)
+        if found is None:
+            return None
+
+        rule = self.keywords.get(field, {}).get(found.group())
+        if rule is not None:
+            return rule
+        for rule, compiled in self.regexes.get(field, []):
+            if (compiled.fullmatch(text) if full else compiled.match(text, found.start())):
+                return rule
+        return None
+
+def configured_rules() -> List[Rule]:
+    """Rules from CONTACT_SPAM_RULES_FILE, or the built-in defaults."""
+    path = settings.CONTACT_SPAM_RULES_FILE
+    if not path:
+        entries = DEFAULT_RULES
+    else:
+        try:
+            with open(path) as f:
+                entries = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"Could not load contact rules from {path}, using the defaults: {e}")
+            entries = DEFAULT_RULES
+
+    return [
+        Rule(entry['field'], entry.get('kind', SpamRule.KIND_KEYWORD), entry['pattern'])
+        for entry in entries
+    ]
+
+def stored_rules() -> Optional[List[Rule]]:
+    """Enabled rules from the database, or None if they could not be read."""
+    try:
+        return [
+            Rule(field, kind, pattern)
+            for field, kind, pattern in SpamRule.objects.filter(enabled=True).values_list('field', 'kind', 'pattern')
+        ]
+    except DatabaseError as e:
+        # e.g. migrations not applied yet; the configured rules still apply
+        logger.error(f"Could not load contact rules from the database: {e}")
+        return None
+
+# Seconds before stored rules that failed to load are read again
+STORED_RULES_RETRY = 30
+
+_configured: Optional[List[Rule]] = None
+_engine: Optional[RuleEngine] = None
+_engine_version: Optional[str] = None
+_retry_at: Optional[float] = None
+
+def get_rule_engine() -> RuleEngine:
+    """
+    Return this worker's rule engine, rebuilt whenever stored rules change.
+
+    Costs one cache read per call; the rules are only queried and compiled
+    again after another worker (or this one) bumped the rules version, or
+    every STORED_RULES_RETRY seconds while the database cannot be read.
+    """
+    global _configured, _engine, _engine_version, _retry_at
+
+    version = cache.get(RULES_VERSION_KEY)
+    if (_engine is None or version != _engine_version
+            or (_retry_at is not None and time.monotonic() >= _retry_at)):
+        if _configured is None:
+            _configured = configured_rules()
+        stored = stored_rules()
+        _engine = RuleEngine(_configured + (stored or []))
+        _engine_version = version
+        _retry_at = None if stored is not None else time.monotonic() + STORED_RULES_RETRY
+    return _engine
+
+def invalidate_rules():
+    """Make every worker rebuild its rule engine."""
+    cache.set(RULES_VERSION_KEY, uuid.uuid4().hex, None)
+
+@receiver(post_save, sender=SpamRule)
+@receiver(post_delete, sender=SpamRule)
+def _spam_rule_changed(sender, **kwargs):
+    invalidate_rules()
@@ -1,7 +1,10 @@
 from rest_framework import serializers
 from .models import ContactSubmission
+from .rules import get_rule_engine
 import re
 
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
 class ContactFormSerializer(serializers.ModelSerializer):
     """Serializer for contact form submissions."""
     
@@ -34,69 +37,58 @@ class ContactFormSerializer(serializers.ModelSerializer):
     
     def validate_name(self, value):
         """Validate name field."""
-        if len(value.strip()) < 2:
+        value = value.strip()
+        if len(value) < 2:
             raise serializers.ValidationError("Name must be at least 2 characters long.")
         
         # Check for suspicious patterns
-        if re.search(r'[<>]|script|javascript|php|sql', value.lower()):
+        if get_rule_engine().match('name', value):
             raise serializers.ValidationError("Invalid characters in name.")
         
-        return value.strip()
+        return value
     
     def validate_subject(self, value):
         """Validate subject field."""
-        if len(value.strip()) < 3:
+        value = value.strip()
+        if len(value) < 3:
             raise serializers.ValidationError("Subject must be at least 3 characters long.")
         
+        if '\n' in value or '\r' in value:
+            raise serializers.ValidationError("Subject must be a single line.")
+        
         # Check for suspicious patterns
-        if re.search(r'[<>]|script|javascript|php|sql', value.lower()):
+        if get_rule_engine().match('subject', value):
             raise serializers.ValidationError("Invalid characters in subject.")
         
-        return value.strip()
+        return value
     
     def validate_message(self, value):
         """Validate message field."""
-        if len(value.strip()) < 10:
+        value = value.strip()
+        if len(value) < 10:
             raise serializers.ValidationError("Message must be at least 10 characters long.")
         
-        if len(value.strip()) > 5000:
+        if len(value) > 5000:
             raise serializers.ValidationError("Message is too long. Maximum 5000 characters allowed.")
         
-        # Check for suspicious patterns
-        suspicious_patterns = [
-            r'<script',
-            r'javascript:',
-            r'php',
-            r'sql\s+(select|insert|update|delete|drop|create)',
-            r'http[s]?://[^\s]+\.(exe|zip|rar)',  # Suspicious file downloads
-        ]
+        # Check for suspicious patterns (script injection, SQL, file downloads)
+        if get_rule_engine().match('message', value):
+            raise serializers.ValidationError("Message contains suspicious content.")
         
-        for pattern in suspicious_patterns:
-            if re.search(pattern, value.lower()):
-                raise serializers.ValidationError("Message contains suspicious content.")
-        
-        return value.strip()
+        return value
     
     def validate_email(self, value):
         """Additional email validation."""
         # Basic email pattern validation
-        email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        if not re.match(email_pattern, value):
+        if not EMAIL_PATTERN.match(value):
             raise serializers.ValidationError("Please enter a valid email address.")
         
-        # Block common spam domains
-        spam_domains = [
-            '10minutemail.com',
-            'tempmail.org',
-            'guerrillamail.com',
-            'mailinator.com'
-        ]
-        
-        domain = value.split('@')[1].lower()
-        if domain in spam_domains:
+        # Block temporary email providers
+        value = value.lower()
+        if get_rule_engine().match('email_domain', value.split('@')[1]):
             raise serializers.ValidationError("Temporary email addresses are not allowed.")
         
-        return value.lower()
+        return value
 
 class ContactResponseSerializer(serializers.Serializer):
     """Serializer for contact form response."""
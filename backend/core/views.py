@@ -1,18 +1,28 @@
 import logging
+import re
+import sqlite3
 from datetime import datetime, timedelta
+from itertools import islice
 from django.utils import timezone
 from rest_framework import status
 from rest_framework.decorators import api_view, throttle_classes
 from rest_framework.response import Response
 from rest_framework.throttling import AnonRateThrottle
+from django.conf import settings
 from django.core.cache import cache
 from django.views.decorators.csrf import csrf_exempt
 
+from .duplicates import get_signature_index, signature
+from .http_cache import cached_response
 from .models import ContactSubmission
+from .queue import get_drainer, get_journal, submission_record
 from .serializers import ContactFormSerializer, ContactResponseSerializer
 
 logger = logging.getLogger(__name__)
 
+URL_PATTERN = re.compile(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+')
+MAX_URLS = 2
+
 class ContactRateThrottle(AnonRateThrottle):
     """Custom throttle for contact form submissions."""
     rate = '5/hour'  # Allow 5 submissions per hour per IP
@@ -43,23 +53,27 @@ def is_spam_submission(request, data):
         logger.warning(f"Spam detected: too many submissions from {client_ip}")
         return True
     
-    # Check for duplicate content in recent submissions
-    message_hash = hash(data.get('message', ''))
-    recent_message_key = f"contact_message_{message_hash}"
-    
-    if cache.get(recent_message_key):
-        logger.warning(f"Spam detected: duplicate message from {client_ip}")
-        return True
-    
     # Check message length and patterns
     message = data.get('message', '')
     if len(message) < 10:
         return True
     
-    # Check for too many links
-    import re
-    urls = re.findall(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', message)
-    if len(urls) > 2:
+    # Check for duplicates and near-duplicates of recent submissions, from any worker
+    try:
+        similarity = get_signature_index().closest(signature(message), settings.CONTACT_DUPLICATE_SIMILARITY)
+    except sqlite3.Error as e:
+        logger.error(f"Duplicate message check unavailable: {e}")
+        similarity = None
+    
+    if similarity is not None:
+        logger.warning(
+            f"Spam detected: {'duplicate' if similarity == 1 else 'near-duplicate'} message from {client_ip}"
+        )
+        return True
+    
+    # Check for too many links; stops scanning at the first URL over the limit
+    urls = list(islice(URL_PATTERN.finditer(message), MAX_URLS + 1))
+    if len(urls) > MAX_URLS:
         logger.warning(f"Spam detected: too many URLs from {client_ip}")
         return True
     
@@ -79,7 +93,8 @@ def submit_contact_form(request):
     - message: Message content
     
     Returns:
-    - Success/error response
+    - Success/error response: 201 once stored, or 202 once queued when
+      CONTACT_WRITE_BEHIND is on
     """
     try:
         # Get client information
@@ -105,31 +120,48 @@ def submit_contact_form(request):
                 'timestamp': datetime.now().isoformat()
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        # Save submission
-        contact_submission = serializer.save(
-            ip_address=client_ip,
-            user_agent=user_agent
-        )
+        queued = False
+        if settings.CONTACT_WRITE_BEHIND:
+            # Journal the submission; this worker's drainer inserts it in a batch
+            try:
+                get_journal().append(submission_record(serializer.validated_data, client_ip, user_agent))
+                queued = True
+                get_drainer().start()
+            except sqlite3.Error as e:
+                logger.error(f"Contact queue unavailable, saving submission directly: {e}")
+        
+        if not queued:
+            # Save submission
+            serializer.save(
+                ip_address=client_ip,
+                user_agent=user_agent
+            )
         
-        # Update spam detection counters
+        # Update spam detection counters (add/incr are atomic across workers)
         recent_submissions_key = f"contact_submissions_{client_ip}"
-        recent_count = cache.get(recent_submissions_key, 0)
-        cache.set(recent_submissions_key, recent_count + 1, 3600)  # 1 hour
+        if not cache.add(recent_submissions_key, 1, 3600):  # 1 hour
+            try:
+                cache.incr(recent_submissions_key)
+            except ValueError:
+                # Expired between add and incr
+                cache.set(recent_submissions_key, 1, 3600)
         
-        # Cache message hash to prevent duplicates
-        message_hash = hash(contact_submission.message)
-        cache.set(f"contact_message_{message_hash}", True, 3600)  # 1 hour
+        # Remember the message's signature to reject duplicates
+        try:
+            get_signature_index().add(signature(serializer.validated_data['message']), settings.CONTACT_DUPLICATE_WINDOW)
+        except sqlite3.Error as e:
+            logger.error(f"Could not record message signature: {e}")
         
-        logger.info(f"Contact form submitted successfully from {client_ip}")
+        logger.info(f"Contact form {'queued' if queued else 'submitted'} successfully from {client_ip}")
         
-        # TODO: Send email notification (implement email service)
-        # send_contact_notification(contact_submission)
+        # The email notification is sent by the notification dispatcher
+        # (manage.py send_contact_notifications), outside the request
         
         return Response({
             'success': True,
             'message': 'Thank you for your message! I\'ll get back to you soon.',
             'timestamp': datetime.now().isoformat()
-        }, status=status.HTTP_201_CREATED)
+        }, status=status.HTTP_202_ACCEPTED if queued else status.HTTP_201_CREATED)
         
     except Exception as e:
         logger.error(f"Error submitting contact form: {e}")
@@ -140,6 +172,7 @@ def submit_contact_form(request):
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 @api_view(['GET'])
+@cached_response(60 * 60, s_maxage=24 * 60 * 60, stale_while_revalidate=24 * 60 * 60)
 def contact_info(request):
     """
     Get contact information and form configuration.
@@ -0,0 +1,19 @@
+from django.contrib import admin
+from .models import GitHubProfile, GitHubRepository
+
+@admin.register(GitHubProfile)
+class GitHubProfileAdmin(admin.ModelAdmin):
+    """Admin interface for synced GitHub profiles."""
+    
+    list_display = ['username', 'public_repos', 'followers', 'following', 'synced_at', 'last_full_sync_at']
+    readonly_fields = ['synced_at', 'last_full_sync_at']
+
+@admin.register(GitHubRepository)
+class GitHubRepositoryAdmin(admin.ModelAdmin):
+    """Admin interface for synced GitHub repositories."""
+    
+    list_display = ['name', 'owner', 'language', 'stargazers_count', 'forks_count', 'updated_at', 'synced_at']
+    list_filter = ['owner', 'language']
+    search_fields = ['name', 'description']
+    readonly_fields = ['synced_at']
+    ordering = ['owner', '-stargazers_count']
\ No newline at end of file
@@ -0,0 +1,388 @@
+import asyncio
+import logging
+from datetime import timedelta
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from . import ratelimit, swr
+from .breaker import get_breaker
+from .client import get_async_client
+from .models import GitHubProfile
+from .services import (
+    PROFILE_QUERY,
+    GitHubAPIError,
+    GitHubNotFoundError,
+    GitHubService,
+    _page_number,
+    _reached_unchanged,
+    _readme_text,
+)
+
+logger = logging.getLogger(__name__)
+
+class AsyncGitHubService(GitHubService):
+    """
+    GitHub service for async views.
+
+    Every call to GitHub goes through `AsyncGitHubClient`, so waiting on a
+    slow upstream costs an idle coroutine instead of a worker thread.
+    Database and cache work reuses the sync implementation. The inherited
+    sync methods still work, so code such as the payload and index builders
+    accepts either service.
+    """
+
+    async def _arequest(self, endpoint: str, params: Optional[Dict] = None) -> Tuple[Dict, bool, Dict]:
+        """Async version of `_request`; shares its stored validators."""
+        url = f"{self.BASE_URL}{endpoint}"
+        validator_key = self._validator_key(endpoint, params)
+        stored = await cache.aget(validator_key)
+
+        headers = dict(self.headers)
+        if stored:
+            if stored.get('etag'):
+                headers['If-None-Match'] = stored['etag']
+            if stored.get('last_modified'):
+                headers['If-Modified-Since'] = stored['last_modified']
+
+        await sync_to_async(self._check_breaker, thread_sensitive=False)()
+        await sync_to_async(self._claim_budget, thread_sensitive=False)('core')
+        response = None
+        try:
+            response = await get_async_client().get(url, headers=headers, params=params)
+            await sync_to_async(ratelimit.record, thread_sensitive=False)(response)
+
+            if response.status_code == 304 and stored:
+                await sync_to_async(get_breaker().record_success, thread_sensitive=False)()
+                return stored['data'], False, stored.get('links', {})
+
+            if response.status_code == 404:
+                await sync_to_async(get_breaker().record_success, thread_sensitive=False)()
+                raise GitHubNotFoundError(f"GitHub resource not found: {endpoint}")
+
+            response.raise_for_status()
+            data = response.json()
+        except (httpx.HTTPError, ValueError) as e:
+            logger.error(f"GitHub API request failed: {e}")
+            await sync_to_async(self._record_failure, thread_sensitive=False)(response)
+            raise GitHubAPIError(f"Failed to fetch data from GitHub: {str(e)}")
+
+        await sync_to_async(get_breaker().record_success, thread_sensitive=False)()
+
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if etag or last_modified:
+            await cache.aset(validator_key, {
+                'etag': etag,
+                'last_modified': last_modified,
+                'data': data,
+                'links': response.links,
+            }, settings.GITHUB_VALIDATOR_TTL)
+
+        return data, True, response.links
+
+    async def _agraphql(self, query: str, variables: Dict) -> Dict:
+        """Async version of `_graphql`."""
+        await sync_to_async(self._check_breaker, thread_sensitive=False)()
+        await sync_to_async(self._claim_budget, thread_sensitive=False)('graphql')
+        response = None
+        try:
+            response = await get_async_client().post(
+                f"{self.BASE_URL}/graphql",
+                headers=self.headers,
+                json={'query': query, 'variables': variables},
+            )
+            await sync_to_async(ratelimit.record, thread_sensitive=False)(response)
+            response.raise_for_status()
+            payload = response.json()
+        except (httpx.HTTPError, ValueError) as e:
+            logger.error(f"GitHub GraphQL request failed: {e}")
+            await sync_to_async(self._record_failure, thread_sensitive=False)(response)
+            raise GitHubAPIError(f"Failed to fetch data from GitHub: {str(e)}")
+
+        await sync_to_async(get_breaker().record_success, thread_sensitive=False)()
+
+        if payload.get('errors'):
+            message = '; '.join(error.get('message', 'unknown error') for error in payload['errors'])
+            logger.error(f"GitHub GraphQL query failed: {message}")
+            raise GitHubAPIError(f"GitHub GraphQL error: {message}")
+
+        return payload['data']
+
+    async def _afetch_profile_graphql(self, known: Optional[Dict] = None) -> Tuple[Dict, List[Dict]]:
+        """Async version of `_fetch_profile_graphql`."""
+        user_data = {}
+        repos_data = []
+        cursor = None
+
+        for page in range(settings.GITHUB_MAX_PAGES):
+            data = await self._agraphql(PROFILE_QUERY, {
+                'login': self.username,
+                'pageSize': 100,
+                'cursor': cursor,
+                'withProfile': page == 0,
+            })
+
+            page_user, page_repos, page_info = self._parse_graphql_page(data, page == 0)
+            if page == 0:
+                user_data = page_user
+            repos_data.extend(page_repos)
+
+            if not page_info['hasNextPage']:
+                break
+            if known is not None and _reached_unchanged(page_repos, known):
+                break
+            cursor = page_info['endCursor']
+
+        # Sort by stars and update date
+        repos_data.sort(key=lambda x: (x['stargazers_count'], x['updated_at']), reverse=True)
+        return user_data, repos_data
+
+    async def _afetch_repository_pages(self, per_page: int) -> Tuple[List[List[Dict]], bool]:
+        """
+        Async version of `_fetch_repository_pages`.
+
+        Pages after the first are requested concurrently, at most
+        GITHUB_MAX_WORKERS at a time.
+        """
+        endpoint = f"/users/{self.username}/repos"
+
+        first_page, changed, links = await self._arequest(endpoint, self._repository_page_params(per_page, 1))
+        pages = [first_page]
+
+        last_page = min(_page_number(links.get('last', {}).get('url')) or 1, settings.GITHUB_MAX_PAGES)
+        if last_page > 1:
+            semaphore = asyncio.Semaphore(settings.GITHUB_MAX_WORKERS)
+
+            async def fetch(page):
+                async with semaphore:
+                    return await self._arequest(endpoint, self._repository_page_params(per_page, page))
+
+            results = await asyncio.gather(*(fetch(page) for page in range(2, last_page + 1)))
+            for data, page_changed, _ in results:
+                pages.append(data)
+                changed = changed or page_changed
+
+        return [page for page in pages if page], changed
+
+    async def _afetch_repositories_rest(self, per_page: int) -> List[Dict]:
+        """Async version of `_fetch_repositories_rest`."""
+        pages, changed = await self._afetch_repository_pages(per_page)
+
+        snapshot = await cache.aget(f"github_repos_snapshot_{self.username}")
+        if not changed and snapshot:
+            # Every page answered 304: the processed list is still current
+            logger.info("Repository data unchanged upstream, reusing processed snapshot")
+            return snapshot['repos']
+
+        return self._process_repository_pages(pages)
+
+    async def _afetch_changed_repositories_rest(self, per_page: int, known: Dict) -> List[Dict]:
+        """Async version of `_fetch_changed_repositories_rest`."""
+        endpoint = f"/users/{self.username}/repos"
+        repos_data = []
+
+        for page in range(1, settings.GITHUB_MAX_PAGES + 1):
+            data, _, _ = await self._arequest(endpoint, self._repository_page_params(per_page, page))
+
+            page_repos = [
+                self._process_repository(repo)
+                for repo in data
+                if not repo.get('fork', True)  # Exclude forks
+            ]
+            repos_data.extend(page_repos)
+
+            if len(data) < per_page or _reached_unchanged(page_repos, known):
+                break
+
+        return repos_data
+
+    async def _afetch_upstream(self, full: bool, per_page: int, known: Dict) -> Tuple[Dict, List[Dict]]:
+        """Async version of `_fetch_upstream`."""
+        if self.use_graphql:
+            return await self._afetch_profile_graphql(known if not full else None)
+
+        user_data, _, _ = await self._arequest(f"/users/{self.username}")
+        if full:
+            repos_data = await self._afetch_repositories_rest(per_page)
+        else:
+            repos_data = await self._afetch_changed_repositories_rest(per_page, known)
+        return user_data, repos_data
+
+    async def arefresh_database(self, full: bool = False, per_page: int = 50) -> bool:
+        """Async version of `sync_database`."""
+        full, known = await sync_to_async(self._plan_sync)(full)
+        user_data, repos_data = await self._afetch_upstream(full, per_page, known)
+        return await sync_to_async(self._store_sync)(user_data, repos_data, full)
+
+    async def _aensure_synced(self, per_page: int = 50) -> GitHubProfile:
+        """Async version of `_ensure_synced`."""
+        profile = await GitHubProfile.objects.filter(username=self.username).afirst()
+        stale_before = timezone.now() - timedelta(seconds=await sync_to_async(self.repos_soft_ttl)())
+
+        if profile is None or profile.synced_at < stale_before:
+            await self.arefresh_database(per_page=per_page)
+            profile = await GitHubProfile.objects.aget(username=self.username)
+
+        return profile
+
+    async def aget_repositories(self, per_page: int = 50) -> List[Dict]:
+        """Async version of `get_repositories`; shares its cache entries."""
+        if not self.username:
+            raise GitHubAPIError("GitHub username not configured")
+
+        return await swr.aget_or_refresh(
+            f"github_repos_{self.username}",
+            ratelimit.aprioritized(ratelimit.INTERACTIVE, lambda: self._aload_repositories(per_page)),
+            soft_ttl=await sync_to_async(self.repos_soft_ttl)(),
+            hard_ttl=settings.GITHUB_REPOS_HARD_TTL,
+            lock_timeout=settings.GITHUB_REFRESH_LOCK_TTL,
+            refresh_loader=ratelimit.aprioritized(ratelimit.REFRESH, lambda: self._aload_repositories(per_page)),
+        )
+
+    async def _aload_repositories(self, per_page: int = 50) -> List[Dict]:
+        try:
+            await self._aensure_synced(per_page)
+            return await sync_to_async(self._read_repositories)()
+
+        except Exception as e:
+            logger.error(f"Error fetching repositories: {e}")
+            raise GitHubAPIError(f"Failed to fetch repositories: {str(e)}")
+
+    async def aget_user_stats(self) -> Dict:
+        """Async version of `get_user_stats`; shares its cache entries."""
+        if not self.username:
+            raise GitHubAPIError("GitHub username not configured")
+
+        return await swr.aget_or_refresh(
+            f"github_stats_{self.username}",
+            ratelimit.aprioritized(ratelimit.INTERACTIVE, self._aload_user_stats),
+            soft_ttl=await sync_to_async(self.stats_soft_ttl)(),
+            hard_ttl=settings.GITHUB_STATS_HARD_TTL,
+            lock_timeout=settings.GITHUB_REFRESH_LOCK_TTL,
+            refresh_loader=ratelimit.aprioritized(ratelimit.REFRESH, self._aload_user_stats),
+        )
+
+    async def _aupdate_languages(self, repos: List[Dict]):
+        """Async version of `_update_languages`; requests run concurrently on the event loop."""
+        languages = await sync_to_async(self._load_languages)()
+        stale = languages.stale(repos)
+        if not stale:
+            return
+
+        semaphore = asyncio.Semaphore(settings.GITHUB_MAX_WORKERS)
+
+        async def fetch(repo):
+            async with semaphore:
+                with ratelimit.priority(ratelimit.PREFETCH):
+                    try:
+                        data, _, _ = await self._arequest(self._languages_endpoint(repo))
+                    except GitHubAPIError as e:
+                        logger.warning(f"Could not fetch languages for {repo['name']}: {e}")
+                        return None
+                return data
+
+        results = await asyncio.gather(*(fetch(repo) for repo in stale))
+        fetched = {repo['id']: counts for repo, counts in zip(stale, results) if counts is not None}
+        await sync_to_async(self._store_languages)(languages, repos, fetched)
+
+    async def _arender_markdown(self, text: str, context: str) -> str:
+        """Async version of `_render_markdown`."""
+        await sync_to_async(self._check_breaker, thread_sensitive=False)()
+        await sync_to_async(self._claim_budget, thread_sensitive=False)('core')
+        response = None
+        try:
+            response = await get_async_client().post(
+                f"{self.BASE_URL}/markdown",
+                headers=self.headers,
+                json={'text': text, 'mode': 'gfm', 'context': context},
+            )
+            await sync_to_async(ratelimit.record, thread_sensitive=False)(response)
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            logger.error(f"GitHub markdown rendering failed: {e}")
+            await sync_to_async(self._record_failure, thread_sensitive=False)(response)
+            raise GitHubAPIError(f"Failed to render markdown on GitHub: {str(e)}")
+
+        await sync_to_async(get_breaker().record_success, thread_sensitive=False)()
+        return response.text
+
+    async def _afetch_readme(self, repo: Dict) -> Optional[Dict]:
+        """Async version of `_fetch_readme`, at prefetch priority."""
+        with ratelimit.priority(ratelimit.PREFETCH):
+            try:
+                data, _, _ = await self._arequest(self._readme_endpoint(repo))
+                if not await sync_to_async(self._has_rendered_readme)(repo, data):
+                    html = await self._arender_markdown(_readme_text(data), self._readme_context(repo))
+                    await sync_to_async(self._store_rendered_readme)(repo, data, html)
+            except GitHubNotFoundError:
+                return {'pushed_at': repo['pushed_at'], 'sha': None}
+            except GitHubAPIError as e:
+                logger.warning(f"Could not fetch README for {repo['name']}: {e}")
+                return None
+
+        return {'pushed_at': repo['pushed_at'], 'sha': data['sha']}
+
+    async def aprefetch_readmes(self, repos: List[Dict]) -> int:
+        """Async version of `prefetch_readmes`; requests run concurrently on the event loop."""
+        entries = await cache.aget(self._readmes_key()) or {}
+        stale = await sync_to_async(self._stale_readmes)(repos, entries)
+
+        semaphore = asyncio.Semaphore(settings.GITHUB_MAX_WORKERS)
+
+        async def fetch(repo):
+            async with semaphore:
+                return await self._afetch_readme(repo)
+
+        results = await asyncio.gather(*(fetch(repo) for repo in stale))
+        fetched = {repo['id']: entry for repo, entry in zip(stale, results) if entry is not None}
+        await sync_to_async(self._store_readmes)(entries, repos, fetched)
+        return len(stale)
+
+    async def _aload_user_stats(self) -> Dict:
+        try:
+            profile = await self._aensure_synced()
+            repos = await self.aget_repositories()
+            if settings.GITHUB_LANGUAGE_STATS == 'bytes':
+                # Fetch changed byte counts here so `_compute_user_stats` finds none stale
+                await self._aupdate_languages(repos)
+            return await sync_to_async(self._compute_user_stats)(profile.to_dict(), repos)
+
+        except Exception as e:
+            logger.error(f"Error fetching user stats: {e}")
+            raise GitHubAPIError(f"Failed to fetch user statistics: {str(e)}")
+
+    async def arefresh(self, full: bool = False) -> Dict:
+        """Async version of `sync`."""
+        if not self.username:
+            raise GitHubAPIError("GitHub username not configured")
+
+        changed = await self.arefresh_database(full=full)
+
+        repos = await sync_to_async(self._read_repositories)()
+        await swr.astore(
+            f"github_repos_{self.username}", repos,
+            await sync_to_async(self.repos_soft_ttl)(), settings.GITHUB_REPOS_HARD_TTL,
+        )
+
+        profile = await GitHubProfile.objects.aget(username=self.username)
+        if settings.GITHUB_LANGUAGE_STATS == 'bytes':
+            await self._aupdate_languages(repos)
+        stats = await sync_to_async(self._compute_user_stats)(profile.to_dict(), repos)
+        await swr.astore(
+            f"github_stats_{self.username}", stats,
+            await sync_to_async(self.stats_soft_ttl)(), settings.GITHUB_STATS_HARD_TTL,
+        )
+
+        if settings.GITHUB_PREFETCH_READMES:
+            await self.aprefetch_readmes(repos)
+
+        return {
+            'repositories': repos,
+            'stats': stats,
+            'changed': changed,
+        }
@@ -0,0 +1,258 @@
+import logging
+import math
+from datetime import datetime
+from functools import wraps
+from typing import Optional, Sequence
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from rest_framework import status
+from rest_framework.throttling import AnonRateThrottle
+
+from core.http_cache import cached_response
+
+from . import ratelimit
+from .async_services import AsyncGitHubService
+from .breaker import OPEN, get_breaker
+from .encoders import encode_repositories, render_json
+from .indexes import InvalidCursor, get_repository_index
+from .payloads import repositories_payload, stale_repositories_payload, stale_stats_payload, stats_payload
+from .profiles import resolve_profile
+from .search import get_search_index
+from .services import GitHubAPIError
+from .views import (
+    FETCH_REPOSITORIES,
+    FETCH_STATS,
+    INDEX_QUERY_PARAMS,
+    REFRESH_CACHE,
+    GitHubRateThrottle,
+    handle_github_error,
+    last_known_good,
+    parse_repository_query,
+    stale_response,
+    unknown_profile_response,
+)
+
+logger = logging.getLogger(__name__)
+
+def json_response(data, status_code: int = status.HTTP_200_OK) -> HttpResponse:
+    """Render data the way DRF's JSONRenderer would."""
+    return HttpResponse(render_json(data), status=status_code, content_type='application/json')
+
+def error_response(error: Exception, context: str) -> HttpResponse:
+    response = handle_github_error(error, context)
+    return json_response(response.data, response.status_code)
+
+def profile_not_found(username: str) -> HttpResponse:
+    response = unknown_profile_response(username)
+    return json_response(response.data, response.status_code)
+
+async def _reject(request, method: str, throttle_classes: Sequence) -> Optional[HttpResponse]:
+    """Method check and throttling, matching what `api_view`/`throttle_classes` do for sync views."""
+    allowed = (method, 'HEAD', 'OPTIONS') if method == 'GET' else (method, 'OPTIONS')
+    if request.method not in allowed:
+        return json_response(
+            {'detail': f'Method "{request.method}" not allowed.'},
+            status.HTTP_405_METHOD_NOT_ALLOWED,
+        )
+
+    for throttle_class in throttle_classes:
+        throttle = throttle_class()
+        if not await sync_to_async(throttle.allow_request)(request, None):
+            wait = throttle.wait()
+            detail = 'Request was throttled.'
+            if wait is not None:
+                detail += f' Expected available in {math.ceil(wait)} seconds.'
+            response = json_response({'detail': detail}, status.HTTP_429_TOO_MANY_REQUESTS)
+            if wait is not None:
+                response['Retry-After'] = str(math.ceil(wait))
+            return response
+
+    return None
+
+def async_api_view(method: str, throttle_classes: Sequence = (GitHubRateThrottle,)):
+    """Async counterpart of `api_view` + `throttle_classes` for a single HTTP method."""
+
+    def decorator(view_func):
+        @wraps(view_func)
+        async def wrapper(request, *args, **kwargs):
+            rejected = await _reject(request, method, throttle_classes)
+            if rejected is not None:
+                return rejected
+            return await view_func(request, *args, **kwargs)
+
+        # Like `api_view`: no session auth, so no CSRF token to check
+        wrapper.csrf_exempt = True
+        return wrapper
+
+    return decorator
+
+@async_api_view('GET')
+@cached_response(
+    60,
+    query_params=('limit', 'featured') + INDEX_QUERY_PARAMS,
+    s_maxage=300,
+    stale_while_revalidate=3600,
+    normalize=parse_repository_query,
+)
+async def get_repositories(request, username=None):
+    """
+    Async version of `views.get_repositories`; same parameters and response.
+    """
+    try:
+        try:
+            query = parse_repository_query(request.GET)
+        except ValueError as e:
+            return json_response({
+                'success': False,
+                'message': str(e),
+                'timestamp': datetime.now().isoformat()
+            }, status.HTTP_400_BAD_REQUEST)
+
+        profile = resolve_profile(username)
+        if profile is None:
+            return profile_not_found(username)
+
+        github_service = AsyncGitHubService(profile)
+
+        # Fill or revalidate the cache without tying up a thread on GitHub;
+        # the payload and index builders below then only read the cache
+        await github_service.aget_repositories()
+
+        if not any(request.GET.get(param) for param in INDEX_QUERY_PARAMS):
+            body = await sync_to_async(repositories_payload)(
+                github_service, query['limit'], query['featured']
+            )
+            return HttpResponse(body, content_type='application/json')
+
+        index = await sync_to_async(get_repository_index)(github_service)
+        try:
+            repos, next_cursor, total = index.query(**query)
+        except InvalidCursor as e:
+            return json_response({
+                'success': False,
+                'message': str(e),
+                'timestamp': datetime.now().isoformat()
+            }, status.HTTP_400_BAD_REQUEST)
+
+        data = encode_repositories(repos)
+
+        return json_response({
+            'success': True,
+            'count': len(data),
+            'total': total,
+            'next_cursor': next_cursor,
+            'data': data,
+            'last_updated': datetime.now().isoformat()
+        })
+
+    except GitHubAPIError as e:
+        logger.error(f"GitHub API error in get_repositories: {e}")
+        data = await sync_to_async(last_known_good)(lambda: stale_repositories_payload(github_service, query))
+        if data is not None:
+            return stale_response(data)
+        return error_response(e, FETCH_REPOSITORIES)
+
+    except Exception as e:
+        logger.error(f"Unexpected error in get_repositories: {e}")
+        return error_response(e, FETCH_REPOSITORIES)
+
+@async_api_view('GET')
+@cached_response(60, s_maxage=300, stale_while_revalidate=3600)
+async def get_github_stats(request, username=None):
+    """
+    Async version of `views.get_github_stats`.
+    """
+    try:
+        profile = resolve_profile(username)
+        if profile is None:
+            return profile_not_found(username)
+
+        github_service = AsyncGitHubService(profile)
+
+        await github_service.aget_user_stats()
+        body = await sync_to_async(stats_payload)(github_service)
+        return HttpResponse(body, content_type='application/json')
+
+    except GitHubAPIError as e:
+        logger.error(f"GitHub API error in get_github_stats: {e}")
+        data = await sync_to_async(last_known_good)(lambda: stale_stats_payload(github_service))
+        if data is not None:
+            return stale_response(data)
+        return error_response(e, FETCH_STATS)
+
+    except Exception as e:
+        logger.error(f"Unexpected error in get_github_stats: {e}")
+        return error_response(e, FETCH_STATS)
+
+@async_api_view('POST')
+async def refresh_cache(request, username=None):
+    """
+    Async version of `views.refresh_cache`.
+    """
+    try:
+        profile = resolve_profile(username)
+        if profile is None:
+            return profile_not_found(username)
+
+        github_service = AsyncGitHubService(profile)
+
+        result = await github_service.arefresh()
+
+        # Bring this worker's search index up to date with the new data
+        await sync_to_async(get_search_index)(github_service)
+
+        return json_response({
+            'success': True,
+            'message': 'Cache refreshed successfully',
+            'data': {
+                'repositories_count': len(result['repositories']),
+                'total_stars': result['stats']['total_stars'],
+                'changed': result['changed'],
+                'last_updated': datetime.now().isoformat()
+            }
+        })
+
+    except GitHubAPIError as e:
+        logger.error(f"GitHub API error in refresh_cache: {e}")
+        return error_response(e, REFRESH_CACHE)
+
+    except Exception as e:
+        logger.error(f"Unexpected error in refresh_cache: {e}")
+        return error_response(e, REFRESH_CACHE)
+
+@async_api_view('GET', throttle_classes=(AnonRateThrottle,))
+async def health_check(request):
+    """
+    Async version of `views.health_check`.
+    """
+    try:
+        github_service = AsyncGitHubService()
+
+        config_status = {
+            'has_token': bool(github_service.token),
+            'has_username': bool(github_service.username),
+            'service_available': True
+        }
+
+        breaker_state = await sync_to_async(get_breaker().state)()
+        config_status['api_accessible'] = config_status['has_username'] and breaker_state != OPEN
+
+        return json_response({
+            'success': True,
+            'service': 'GitHub API Integration',
+            'status': 'healthy' if all(config_status.values()) else 'degraded',
+            'configuration': config_status,
+            'circuit_breaker': breaker_state,
+            'rate_limit': await sync_to_async(ratelimit.status)(),
+            'timestamp': datetime.now().isoformat()
+        })
+
+    except Exception as e:
+        return json_response({
+            'success': False,
+            'service': 'GitHub API Integration',
+            'status': 'unhealthy',
+            'error': str(e),
+            'timestamp': datetime.now().isoformat()
+        }, status.HTTP_503_SERVICE_UNAVAILABLE)
@@ -0,0 +1,107 @@
+import logging
+import time
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+class CircuitBreaker:
+    """
+    Circuit breaker whose state lives in the shared cache.
+
+    Every worker sees the same state, so once `failure_threshold` calls in
+    a row have failed, in any workers, all of them stop calling upstream.
+    Failures are counted until the next success rather than within a time
+    window, since a single call retrying a slow upstream can take longer
+    than `reset_timeout`. After `reset_timeout` seconds the circuit is
+    half-open: a single trial request, claimed with `cache.add`, is let
+    through. Its success closes the circuit; its failure opens it again.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: int):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self._opened_key = f"circuit_{name}_opened_at"
+        self._failures_key = f"circuit_{name}_failures"
+        self._trial_key = f"circuit_{name}_trial"
+
+    def state(self) -> str:
+        opened_at = cache.get(self._opened_key)
+        if opened_at is None:
+            return CLOSED
+        if time.time() - opened_at < self.reset_timeout:
+            return OPEN
+        return HALF_OPEN
+
+    def allow_request(self) -> bool:
+        """Whether a call may go upstream now."""
+        state = self.state()
+        if state == CLOSED:
+            return True
+        if state == OPEN:
+            return False
+        return cache.add(self._trial_key, True, self.reset_timeout)
+
+    def record_success(self):
+        if cache.get(self._opened_key) is not None:
+            logger.info(f"Circuit '{self.name}' closed")
+            cache.delete_many([self._opened_key, self._failures_key, self._trial_key])
+        elif cache.get(self._failures_key):
+            cache.delete(self._failures_key)
+
+    def record_failure(self):
+        if cache.get(self._opened_key) is not None:
+            # Only a half-open trial gets here; back to open for another period
+            cache.set(self._opened_key, time.time(), None)
+            cache.delete(self._trial_key)
+            logger.warning(f"Circuit '{self.name}' trial request failed, staying open")
+            return
+
+        # Consecutive failures; record_success() resets the count
+        cache.add(self._failures_key, 0, None)
+        try:
+            failures = cache.incr(self._failures_key)
+        except ValueError:
+            # Deleted by a success between add and incr
+            failures = 1
+            cache.set(self._failures_key, failures, None)
+
+        if failures >= self.failure_threshold:
+            cache.set(self._opened_key, time.time(), None)
+            logger.warning(f"Circuit '{self.name}' opened after {failures} failures")
+
+    def release_trial(self):
+        """
+        Give up a half-open trial that ended without telling whether upstream is back.
+
+        E.g. the call was refused before it was sent, or upstream rejected the
+        request itself. Another trial may go through right away instead of
+        after another `reset_timeout`.
+        """
+        if cache.get(self._opened_key) is not None:
+            cache.delete(self._trial_key)
+
+    def reset(self):
+        cache.delete_many([self._opened_key, self._failures_key, self._trial_key])
+
+_breaker: Optional[CircuitBreaker] = None
+
+def get_breaker() -> CircuitBreaker:
+    """Return the circuit breaker guarding calls to GitHub."""
+    global _breaker
+
+    if _breaker is None:
+        _breaker = CircuitBreaker(
+            'github',
+            failure_threshold=settings.GITHUB_BREAKER_FAILURE_THRESHOLD,
+            reset_timeout=settings.GITHUB_BREAKER_RESET_TIMEOUT,
+        )
+    return _breaker
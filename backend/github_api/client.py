@@ -0,0 +1,255 @@
+import asyncio
+import logging
+import random
+import threading
+import time
+import weakref
+from typing import Dict, Optional, Union
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Status codes worth retrying: transient upstream failures
+RETRYABLE_STATUS_CODES = {500, 502, 503, 504}
+
+class GitHubClient:
+    """
+    Connection-pooled HTTP client for the GitHub API.
+
+    A single instance is shared by every request handled in a worker so
+    TCP/TLS connections are kept alive between calls. Transient failures
+    are retried with jittered exponential backoff, and rate-limit
+    responses are waited out when GitHub says the wait is short.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = 10,
+        timeout: float = 10,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0,
+        max_rate_limit_wait: float = 60,
+    ):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_rate_limit_wait = max_rate_limit_wait
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict] = None,
+        params: Optional[Dict] = None,
+        json: Optional[Dict] = None,
+    ) -> requests.Response:
+        """
+        Send a request, retrying transient failures.
+
+        Connection errors are re-raised once retries are exhausted; HTTP
+        error responses are returned as-is for the caller to handle.
+        """
+        attempt = 0
+
+        while True:
+            try:
+                response = self.session.request(
+                    method, url, headers=headers, params=params, json=json, timeout=self.timeout
+                )
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if attempt >= self.max_retries:
+                    raise
+                delay = self._backoff(attempt)
+                logger.warning(f"GitHub request to {url} failed ({e}), retrying in {delay:.2f}s")
+                time.sleep(delay)
+                attempt += 1
+                continue
+
+            if attempt < self.max_retries:
+                delay = self._retry_delay(response, attempt)
+                if delay is not None:
+                    logger.warning(
+                        f"GitHub returned {response.status_code} for {url}, retrying in {delay:.2f}s"
+                    )
+                    time.sleep(delay)
+                    attempt += 1
+                    continue
+
+            return response
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request('POST', url, **kwargs)
+
+    def _backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _retry_delay(self, response: Union[requests.Response, httpx.Response], attempt: int) -> Optional[float]:
+        """Return how long to wait before retrying, or None if the response is final."""
+        if response.status_code in RETRYABLE_STATUS_CODES:
+            return max(self._backoff(attempt), _retry_after(response) or 0)
+
+        if response.status_code in (403, 429):
+            wait = rate_limit_wait(response)
+            if wait is None:
+                return None
+            if wait > self.max_rate_limit_wait:
+                logger.warning(f"GitHub rate limit hit, reset in {wait:.0f}s; not waiting")
+                return None
+            return wait
+
+        return None
+
+class AsyncGitHubClient(GitHubClient):
+    """
+    `GitHubClient` for async code, built on a pooled `httpx.AsyncClient`.
+
+    Retries, backoff and rate-limit waits behave exactly as in the sync
+    client, but waiting happens with `asyncio.sleep`, so a slow or
+    rate-limited GitHub holds no worker thread.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = 10,
+        timeout: float = 10,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0,
+        max_rate_limit_wait: float = 60,
+    ):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_rate_limit_wait = max_rate_limit_wait
+
+        self.session = httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+        )
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict] = None,
+        params: Optional[Dict] = None,
+        json: Optional[Dict] = None,
+    ) -> httpx.Response:
+        """
+        Send a request, retrying transient failures.
+
+        Connection errors are re-raised once retries are exhausted; HTTP
+        error responses are returned as-is for the caller to handle.
+        """
+        attempt = 0
+
+        while True:
+            try:
+                response = await self.session.request(method, url, headers=headers, params=params, json=json)
+            except httpx.TransportError as e:
+                if attempt >= self.max_retries:
+                    raise
+                delay = self._backoff(attempt)
+                logger.warning(f"GitHub request to {url} failed ({e}), retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+
+            if attempt < self.max_retries:
+                delay = self._retry_delay(response, attempt)
+                if delay is not None:
+                    logger.warning(
+                        f"GitHub returned {response.status_code} for {url}, retrying in {delay:.2f}s"
+                    )
+                    await asyncio.sleep(delay)
+                    attempt += 1
+                    continue
+
+            return response
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request('GET', url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request('POST', url, **kwargs)
+
+def _retry_after(response: Union[requests.Response, httpx.Response]) -> Optional[float]:
+    value = response.headers.get('Retry-After')
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        return None
+
+def rate_limit_wait(response: Union[requests.Response, httpx.Response]) -> Optional[float]:
+    """
+    Seconds GitHub asks us to wait, or None if the response is not rate limited.
+
+    Secondary rate limits send `Retry-After`; the primary limit sends
+    `X-RateLimit-Remaining: 0` with the reset time as an epoch timestamp.
+    """
+    retry_after = _retry_after(response)
+    if retry_after is not None:
+        return retry_after
+
+    if response.headers.get('X-RateLimit-Remaining') == '0':
+        try:
+            reset = float(response.headers['X-RateLimit-Reset'])
+        except (KeyError, ValueError):
+            return None
+        return max(reset - time.time(), 0) + 1
+
+    return None
+
+_client: Optional[GitHubClient] = None
+_client_lock = threading.Lock()
+
+def get_client() -> GitHubClient:
+    """Return the worker-wide GitHub client, creating it on first use."""
+    global _client
+
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = GitHubClient(
+                    pool_size=settings.GITHUB_POOL_SIZE,
+                    timeout=settings.GITHUB_TIMEOUT,
+                    max_retries=settings.GITHUB_MAX_RETRIES,
+                    backoff_base=settings.GITHUB_BACKOFF_BASE,
+                    max_rate_limit_wait=settings.GITHUB_RATE_LIMIT_MAX_WAIT,
+                )
+    return _client
+
+# httpx clients are tied to the event loop they were first used on
+_async_clients: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncGitHubClient]' = weakref.WeakKeyDictionary()
+
+def get_async_client() -> AsyncGitHubClient:
+    """Return the async GitHub client for the running event loop, creating it on first use."""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = _async_clients[loop] = AsyncGitHubClient(
+            pool_size=settings.GITHUB_POOL_SIZE,
+            timeout=settings.GITHUB_TIMEOUT,
+            max_retries=settings.GITHUB_MAX_RETRIES,
+            backoff_base=settings.GITHUB_BACKOFF_BASE,
+            max_rate_limit_wait=settings.GITHUB_RATE_LIMIT_MAX_WAIT,
+        )
+    return client
@@ -0,0 +1,146 @@
+import logging
+from typing import Any, Callable, Dict, List
+
+from django.conf import settings
+from rest_framework import fields, serializers
+from rest_framework.renderers import JSONRenderer
+
+from .serializers import RepositorySerializer, GitHubStatsSerializer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Field classes whose `to_representation` is a plain type conversion
+_CONVERSIONS = {
+    fields.IntegerField: 'int',
+    fields.FloatField: 'float',
+    fields.CharField: 'str',
+    fields.URLField: 'str',
+    fields.EmailField: 'str',
+    fields.SlugField: 'str',
+}
+
+def _value_expression(field: fields.Field, value: str, namespace: Dict[str, Any]) -> str:
+    """
+    Python expression equivalent to `field.to_representation(value)`.
+
+    Known field types are inlined; anything else calls the field itself, so
+    the generated code never changes the output, only how fast it is made.
+    """
+    name = f"_field{len(namespace)}"
+
+    conversion = _CONVERSIONS.get(type(field))
+    if conversion is not None:
+        return f"{conversion}({value})"
+
+    if type(field) is fields.DateTimeField:
+        # Strings pass through unchanged; empty values and datetimes go to DRF
+        namespace[name] = field
+        return f"({value} if {value}.__class__ is str and {value} else {name}.to_representation({value}))"
+
+    if type(field) is fields.ListField:
+        item = _value_expression(field.child, 'item', namespace)
+        return f"[None if item is None else {item} for item in {value}]"
+
+    if isinstance(field, serializers.ListSerializer):
+        namespace[name] = compile_serializer(field.child)
+        return f"[{name}(item) for item in {value}]"
+
+    if isinstance(field, serializers.Serializer):
+        namespace[name] = compile_serializer(field)
+        return f"{name}({value})"
+
+    namespace[name] = field
+    return f"{name}.to_representation({value})"
+
+def compile_serializer(serializer: serializers.Serializer) -> Callable[[Any], Dict]:
+    """
+    Generate a function equivalent to `serializer.to_representation`.
+
+    Only meant for read-only output of trusted dicts: the generated code
+    reads each key directly and converts it inline instead of going through
+    DRF's per-field `get_attribute`/`to_representation` calls. Items that are
+    not plain dicts, or that lack one of the keys, are handed to the
+    serializer itself, so the result always matches DRF's.
+    """
+    namespace: Dict[str, Any] = {'_serializer': serializer}
+    reads = []
+    entries = []
+
+    for index, field in enumerate(serializer._readable_fields):
+        if field.source == '*' or len(field.source_attrs) != 1:
+            # Dotted or whole-object sources; nothing to gain from inlining
+            return serializer.to_representation
+
+        value = f"v{index}"
+        reads.append(f"        {value} = obj[{field.source!r}]")
+        expression = _value_expression(field, value, namespace)
+        entries.append(f"        {field.field_name!r}: None if {value} is None else {expression},")
+
+    source = '\n'.join([
+        "def encode(obj):",
+        "    if obj.__class__ is not dict:",
+        "        return _serializer.to_representation(obj)",
+        "    try:",
+        *reads,
+        "    except KeyError:",
+        "        return _serializer.to_representation(obj)",
+        "    return {",
+        *entries,
+        "    }",
+    ])
+    exec(compile(source, f"<encoder {type(serializer).__name__}>", 'exec'), namespace)
+    return namespace['encode']
+
+_renderer = JSONRenderer()
+_json_encoder = _renderer.encoder_class(
+    ensure_ascii=_renderer.ensure_ascii,
+    allow_nan=not _renderer.strict,
+    separators=(',', ':') if _renderer.compact else (', ', ': '),
+)
+
+def _use_orjson() -> bool:
+    return (
+        orjson is not None
+        and settings.JSON_ENCODER_BACKEND == 'orjson'
+        and _renderer.compact
+        and not _renderer.ensure_ascii
+        and _renderer.strict
+    )
+
+def _reject(obj):
+    raise TypeError
+
+def render_json(data: Any) -> bytes:
+    """
+    Render data to the same bytes as `JSONRenderer().render(data)`.
+
+    With `JSON_ENCODER_BACKEND=orjson` (and orjson installed) plain data is
+    encoded by orjson; anything it would format differently, such as
+    datetimes, decimals or integers over 64 bits, falls back to the standard
+    encoder.
+    """
+    if data is None:
+        return b''
+
+    if _use_orjson():
+        try:
+            body = orjson.dumps(data, default=_reject, option=orjson.OPT_PASSTHROUGH_DATETIME)
+        except TypeError:
+            pass
+        else:
+            return body.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+    body = _json_encoder.encode(data)
+    return body.replace('\u2028', '\\u2028').replace('\u2029', '\\u2029').encode()
+
+encode_repository = compile_serializer(RepositorySerializer())
+encode_stats = compile_serializer(GitHubStatsSerializer())
+
+def encode_repositories(repos: List[Dict]) -> List[Dict]:
+    """Fast equivalent of `RepositorySerializer(repos, many=True).data`."""
+    return [encode_repository(repo) for repo in repos]
@@ -0,0 +1,195 @@
+import base64
+import binascii
+import json
+import time
+from bisect import bisect_left
+from typing import Dict, List, Optional, Set, Tuple
+
+from . import swr
+from .profiles import get_profile_states
+from .services import GitHubService
+
+# Topics that mark a repository as featured
+FEATURED_TOPICS = {'featured', 'portfolio', 'showcase'}
+
+# Sort keys; ties fall back to list position so every order is total
+SORT_KEYS = {
+    'stars': lambda repo: (repo['stargazers_count'], repo['updated_at']),
+    'forks': lambda repo: (repo['forks_count'], repo['updated_at']),
+    'updated': lambda repo: (repo['updated_at'],),
+    'created': lambda repo: (repo['created_at'],),
+    'name': lambda repo: (repo['name'].lower(),),
+}
+
+DIRECTIONS = ('asc', 'desc')
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor is malformed or from another data version."""
+    pass
+
+class RepositoryIndex:
+    """
+    Lookup structures over one version of the cached repository list.
+
+    Built once per data version: posting sets for language, topic and the
+    featured flag, plus every sort order precomputed as an array of list
+    positions. Range filters (`min_stars`, `updated_since`) are answered by
+    bisecting the presorted star and update-time orders.
+    """
+
+    def __init__(self, repos: List[Dict], version: str):
+        self.repos = repos
+        self.version = version
+
+        self.by_name: Dict[str, int] = {repo['name'].lower(): position for position, repo in enumerate(repos)}
+        self.by_language: Dict[str, Set[int]] = {}
+        self.by_topic: Dict[str, Set[int]] = {}
+        self.featured: Set[int] = set()
+
+        for position, repo in enumerate(repos):
+            if repo['language']:
+                self.by_language.setdefault(repo['language'].lower(), set()).add(position)
+            for topic in repo['topics']:
+                self.by_topic.setdefault(topic.lower(), set()).add(position)
+            if repo['stargazers_count'] > 0 or FEATURED_TOPICS.intersection(repo['topics']):
+                self.featured.add(position)
+
+        # orders[(sort, direction)] lists positions; ranks[...] maps position -> index in it
+        self.orders: Dict[Tuple[str, str], List[int]] = {}
+        self.ranks: Dict[Tuple[str, str], List[int]] = {}
+        for sort, key in SORT_KEYS.items():
+            ascending = sorted(range(len(repos)), key=lambda position: (key(repos[position]), position))
+            descending = sorted(
+                range(len(repos)), key=lambda position: (key(repos[position]), -position), reverse=True
+            )
+            for direction, order in (('asc', ascending), ('desc', descending)):
+                ranks = [0] * len(repos)
+                for rank, position in enumerate(order):
+                    ranks[position] = rank
+                self.orders[(sort, direction)] = order
+                self.ranks[(sort, direction)] = ranks
+
+        stars_order = self.orders[('stars', 'asc')]
+        self._stars_sorted = [repos[position]['stargazers_count'] for position in stars_order]
+        updated_order = self.orders[('updated', 'asc')]
+        self._updated_sorted = [repos[position]['updated_at'] for position in updated_order]
+
+    def get(self, name: str) -> Optional[Dict]:
+        """The repository with this name (case-insensitive), or None."""
+        position = self.by_name.get(name.lower())
+        return self.repos[position] if position is not None else None
+
+    def query(
+        self,
+        language: Optional[str] = None,
+        topic: Optional[str] = None,
+        min_stars: Optional[int] = None,
+        updated_since: Optional[str] = None,
+        featured: bool = False,
+        sort: str = 'stars',
+        direction: str = 'desc',
+        limit: int = 20,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Dict], Optional[str], int]:
+        """
+        Filter, sort and page the repositories.
+
+        Args:
+            updated_since: Timestamp in GitHub's format (`YYYY-MM-DDTHH:MM:SSZ`)
+            cursor: Opaque cursor from a previous page of the same query
+
+        Returns:
+            Tuple of (page of repositories, cursor for the next page or
+            None, total number of matches)
+        """
+        order_key = (sort, direction)
+        candidates = self._candidates(language, topic, min_stars, updated_since, featured)
+
+        after = -1
+        if cursor is not None:
+            after = self._decode_cursor(cursor, order_key)
+
+        ranks = self.ranks[order_key]
+        if candidates is None:
+            total = len(self.repos)
+            matches = self.orders[order_key][after + 1:after + 2 + limit]
+        else:
+            total = len(candidates)
+            matches = sorted(
+                (position for position in candidates if ranks[position] > after),
+                key=ranks.__getitem__,
+            )[:limit + 1]
+
+        page = matches[:limit]
+        next_cursor = None
+        if len(matches) > limit and page:
+            next_cursor = self._encode_cursor(order_key, ranks[page[-1]])
+
+        return [self.repos[position] for position in page], next_cursor, total
+
+    def _candidates(self, language, topic, min_stars, updated_since, featured) -> Optional[Set[int]]:
+        """Intersect the posting sets for the active filters; None means no filter."""
+        sets = []
+        if language:
+            sets.append(self.by_language.get(language.lower(), set()))
+        if topic:
+            sets.append(self.by_topic.get(topic.lower(), set()))
+        if featured:
+            sets.append(self.featured)
+        if min_stars is not None:
+            start = bisect_left(self._stars_sorted, min_stars)
+            sets.append(set(self.orders[('stars', 'asc')][start:]))
+        if updated_since is not None:
+            start = bisect_left(self._updated_sorted, updated_since)
+            sets.append(set(self.orders[('updated', 'asc')][start:]))
+
+        if not sets:
+            return None
+        sets.sort(key=len)
+        return sets[0].intersection(*sets[1:])
+
+    def _encode_cursor(self, order_key: Tuple[str, str], rank: int) -> str:
+        raw = json.dumps({'v': self.version, 'o': list(order_key), 'r': rank}, separators=(',', ':'))
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+    def _decode_cursor(self, cursor: str, order_key: Tuple[str, str]) -> int:
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            rank = int(data['r'])
+            version = data['v']
+            cursor_order = tuple(data['o'])
+        except (binascii.Error, ValueError, KeyError, TypeError):
+            raise InvalidCursor("Malformed cursor")
+
+        if version != self.version:
+            raise InvalidCursor("Cursor expired; repository data has changed")
+        if cursor_order != order_key:
+            raise InvalidCursor("Cursor belongs to a different sort order")
+        return rank
+
+def get_repository_index(service: GitHubService) -> RepositoryIndex:
+    """
+    Return the index for the current repository data.
+
+    While the data is fresh an already-built index is returned without
+    loading the repository list; otherwise the normal stale-while-revalidate
+    lookup runs first. Each profile keeps only the index for its current
+    data version, in the worker's LRU of profile states.
+    """
+    data_key = f"github_repos_{service.username}"
+    meta = swr.get_meta(data_key)
+    if meta is None or meta['fresh_until'] <= time.time():
+        service.get_repositories()
+        meta = swr.get_meta(data_key)
+
+    if meta is None:
+        return RepositoryIndex(service.get_repositories(), '')
+
+    state = get_profile_states().get(service.username)
+    index = state.get('repository_index')
+    if index is not None and index.version == meta['version']:
+        return index
+
+    index = state['repository_index'] = RepositoryIndex(service.get_repositories(), meta['version'])
+    return index
@@ -0,0 +1,94 @@
+import uuid
+from typing import Dict, List, Optional
+
+class LanguageBytes:
+    """
+    Byte counts per language for each repository, with running totals.
+
+    Each repository's `/languages` result is kept with the `pushed_at` it
+    was fetched for, so only repositories pushed to since need fetching
+    again. Totals are adjusted by the difference between a repository's old
+    and new counts instead of being summed from scratch.
+
+    The state is a plain dict, suitable for the cache:
+    `{'repos': {id: {'pushed_at', 'bytes'}}, 'totals', 'repo_counts', 'version'}`.
+    """
+
+    def __init__(self, state: Optional[Dict] = None):
+        self.state = state or {
+            'repos': {},
+            'totals': {},
+            'repo_counts': {},
+            'version': None,
+        }
+
+    @property
+    def totals(self) -> Dict[str, int]:
+        """Bytes per language across all repositories."""
+        return self.state['totals']
+
+    @property
+    def repo_counts(self) -> Dict[str, int]:
+        """Number of repositories containing each language."""
+        return self.state['repo_counts']
+
+    @property
+    def version(self) -> Optional[str]:
+        """Changes whenever the totals do."""
+        return self.state['version']
+
+    def stale(self, repos: List[Dict]) -> List[Dict]:
+        """Repositories without counts for their current `pushed_at`."""
+        entries = self.state['repos']
+        return [
+            repo for repo in repos
+            if repo['id'] not in entries or entries[repo['id']]['pushed_at'] != repo['pushed_at']
+        ]
+
+    def update(self, repos: List[Dict], fetched: Dict[int, Dict[str, int]]) -> bool:
+        """
+        Apply freshly fetched counts and drop repositories no longer listed.
+
+        Args:
+            repos: The current repository list
+            fetched: `/languages` results keyed by repository id. Stale
+                repositories missing here keep their previous counts.
+
+        Returns:
+            Whether the totals changed
+        """
+        entries = self.state['repos']
+        listed = {repo['id']: repo for repo in repos}
+        changed = False
+
+        for repo_id in [repo_id for repo_id in entries if repo_id not in listed]:
+            self._apply(entries.pop(repo_id)['bytes'], -1)
+            changed = True
+
+        for repo_id, counts in fetched.items():
+            if repo_id not in listed:
+                continue
+            previous = entries.get(repo_id)
+            if previous is not None:
+                self._apply(previous['bytes'], -1)
+            self._apply(counts, 1)
+            entries[repo_id] = {'pushed_at': listed[repo_id]['pushed_at'], 'bytes': counts}
+            changed = changed or previous is None or previous['bytes'] != counts
+
+        if changed or self.state['version'] is None:
+            self.state['version'] = uuid.uuid4().hex
+        return changed
+
+    def _apply(self, counts: Dict[str, int], sign: int):
+        totals = self.state['totals']
+        repo_counts = self.state['repo_counts']
+
+        for language, size in counts.items():
+            total = totals.get(language, 0) + sign * size
+            repos = repo_counts.get(language, 0) + sign
+            if repos > 0:
+                totals[language] = total
+                repo_counts[language] = repos
+            else:
+                totals.pop(language, None)
+                repo_counts.pop(language, None)
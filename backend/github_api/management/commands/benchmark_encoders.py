@@ -0,0 +1,119 @@
+import time
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from github_api import encoders
+from github_api.serializers import RepositorySerializer, GitHubStatsSerializer
+
+class Command(BaseCommand):
+    """
+    Compare DRF serializers with the compiled encoders in `github_api.encoders`.
+
+    Both paths render the same synthetic payloads; the command fails if the
+    bytes ever differ, then reports the time per payload and the speedup for
+    each available JSON backend.
+    """
+
+    help = 'Benchmark compiled encoders against DRF serializers'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--repos',
+            type=int,
+            default=50,
+            help='Repositories per list payload (default: 50)',
+        )
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=500,
+            help='Payloads rendered per measurement (default: 500)',
+        )
+
+    def handle(self, *args, **options):
+        repos = [self.make_repository(i) for i in range(options['repos'])]
+        stats = self.make_stats()
+        iterations = options['iterations']
+
+        renderer = JSONRenderer()
+        cases = [
+            (
+                'repositories',
+                lambda: renderer.render({'success': True, 'data': RepositorySerializer(repos, many=True).data}),
+                lambda: encoders.render_json({'success': True, 'data': encoders.encode_repositories(repos)}),
+            ),
+            (
+                'stats',
+                lambda: renderer.render({'success': True, 'data': GitHubStatsSerializer(stats).data}),
+                lambda: encoders.render_json({'success': True, 'data': encoders.encode_stats(stats)}),
+            ),
+        ]
+
+        backends = ['json'] + (['orjson'] if encoders.orjson is not None else [])
+        original_backend = encoders.settings.JSON_ENCODER_BACKEND
+
+        try:
+            for name, drf_path, fast_path in cases:
+                expected = drf_path()
+                drf_time = self.measure(drf_path, iterations)
+                self.stdout.write(f"{name}: DRF {drf_time * 1e6:.1f} us/payload")
+
+                for backend in backends:
+                    encoders.settings.JSON_ENCODER_BACKEND = backend
+                    if fast_path() != expected:
+                        raise CommandError(f"{name}: '{backend}' output differs from DRF")
+                    fast_time = self.measure(fast_path, iterations)
+                    self.stdout.write(
+                        f"{name}: compiled/{backend} {fast_time * 1e6:.1f} us/payload "
+                        f"({drf_time / fast_time:.1f}x)"
+                    )
+        finally:
+            encoders.settings.JSON_ENCODER_BACKEND = original_backend
+
+        self.stdout.write(self.style.SUCCESS('Output identical for all backends'))
+
+    def measure(self, func, iterations: int) -> float:
+        """Best of three runs, in seconds per call."""
+        best = None
+        for _ in range(3):
+            started = time.perf_counter()
+            for _ in range(iterations):
+                func()
+            elapsed = (time.perf_counter() - started) / iterations
+            best = elapsed if best is None else min(best, elapsed)
+        return best
+
+    def make_repository(self, i: int) -> dict:
+        return {
+            'id': 1000 + i,
+            'name': f"project-{i}",
+            # Non-ASCII and U+2028 exercise the renderer's escaping rules
+            'description': f"Project {i} – naïve café second line" if i % 5 == 0 else f"Project {i}",
+            'html_url': f"https://github.com/user/project-{i}",
+            'homepage': None if i % 3 else f"https://project-{i}.example.com",
+            'topics': ['django', 'react', f"topic-{i % 7}"],
+            'stargazers_count': i * 3,
+            'forks_count': i,
+            'language': None if i % 11 == 0 else 'Python',
+            'updated_at': '2024-01-01T00:00:00Z',
+            'created_at': '2023-01-01T00:00:00Z',
+            'visibility': 'public',
+            'pushed_at': '2024-01-01T00:00:00Z',
+        }
+
+    def make_stats(self) -> dict:
+        return {
+            'total_repos': 50,
+            'total_stars': 150,
+            'total_forks': 45,
+            'public_repos': 50,
+            'followers': 10,
+            'following': 5,
+            'languages': [
+                {'name': name, 'count': count, 'percentage': round(count / 50 * 100, 1), 'color': '#586069'}
+                for name, count in [('Python', 20), ('TypeScript', 15), ('Go', 9), ('C++', 6)]
+            ],
+            'last_updated': datetime.now().isoformat(),
+        }
@@ -0,0 +1,93 @@
+import logging
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from github_api.profiles import resolve_profile
+from github_api.sync import next_delay, sync_all
+
+logger = logging.getLogger(__name__)
+
+class Command(BaseCommand):
+    """
+    Refresh cached GitHub data from outside the request path.
+
+    Runs `GitHubService.sync` for every configured profile on a fixed
+    interval with random jitter. Web workers already do this in the
+    background (GITHUB_BACKGROUND_SYNC); this command is for cron and manual
+    runs. It must share the web workers' cache: with the default SQLite
+    cache, run it on the same host (or in the same container).
+    """
+
+    help = 'Periodically refresh cached GitHub data'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=settings.GITHUB_SYNC_INTERVAL,
+            help='Seconds between refreshes (default: GITHUB_SYNC_INTERVAL)',
+        )
+        parser.add_argument(
+            '--jitter',
+            type=float,
+            default=settings.GITHUB_SYNC_JITTER,
+            help='Random +/- fraction applied to each interval (default: GITHUB_SYNC_JITTER)',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Refresh a single time and exit',
+        )
+        parser.add_argument(
+            '--profile',
+            action='append',
+            dest='profiles',
+            metavar='USERNAME',
+            help='Only sync this profile; may be repeated (default: every configured profile)',
+        )
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Fetch every repository page on the first run instead of only changed ones',
+        )
+
+    def handle(self, *args, **options):
+        interval = options['interval']
+        jitter = options['jitter']
+
+        soft_ttl = min(settings.GITHUB_REPOS_SOFT_TTL, settings.GITHUB_STATS_SOFT_TTL)
+        if not options['once'] and interval * (1 + jitter) >= soft_ttl:
+            self.stderr.write(self.style.WARNING(
+                f"Sync interval {interval}s (+{jitter:.0%} jitter) is not shorter than the "
+                f"{soft_ttl}s soft TTL; requests may still see stale data."
+            ))
+
+        if settings.CACHE_BACKEND == 'locmem':
+            raise CommandError(
+                "CACHE_BACKEND=locmem keeps the cache inside each process; "
+                "this command would refresh a cache no web worker reads"
+            )
+
+        usernames = None
+        if options['profiles']:
+            usernames = []
+            for username in options['profiles']:
+                profile = resolve_profile(username)
+                if profile is None:
+                    raise CommandError(f"'{username}' is not a configured GitHub profile")
+                usernames.append(profile)
+
+        full = options['full']
+        while True:
+            sync_all(full=full, usernames=usernames)
+            full = False
+
+            if options['once']:
+                return
+
+            # Cache TTLs stretch as the rate limit budget runs low; the interval follows
+            delay = next_delay(interval, jitter)
+            logger.info(f"Next GitHub sync in {delay:.0f}s")
+            time.sleep(delay)
@@ -0,0 +1,31 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from .sync import get_background_sync
+
+class BackgroundSyncMiddleware:
+    """
+    Starts this worker's background GitHub sync with its first request.
+
+    Started from a request rather than at import, so the thread belongs to
+    the worker process and not to a server master that forks it away.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if settings.GITHUB_BACKGROUND_SYNC:
+            get_background_sync().start()
+        if self.async_mode:
+            return self.__acall__(request)
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        return await self.get_response(request)
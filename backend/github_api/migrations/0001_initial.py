@@ -0,0 +1,58 @@
+# Generated by Django 4.2.7 on 2026-10-18 20:17
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GitHubProfile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('username', models.CharField(max_length=100, unique=True)),
+                ('public_repos', models.PositiveIntegerField(default=0)),
+                ('followers', models.PositiveIntegerField(default=0)),
+                ('following', models.PositiveIntegerField(default=0)),
+                ('synced_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('last_full_sync_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'GitHub Profile',
+                'verbose_name_plural': 'GitHub Profiles',
+            },
+        ),
+        migrations.CreateModel(
+            name='GitHubRepository',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('github_id', models.BigIntegerField(unique=True)),
+                ('owner', models.CharField(max_length=100)),
+                ('name', models.CharField(max_length=255)),
+                ('description', models.TextField(blank=True)),
+                ('html_url', models.URLField()),
+                ('homepage', models.CharField(blank=True, max_length=500, null=True)),
+                ('topics', models.JSONField(blank=True, default=list)),
+                ('stargazers_count', models.PositiveIntegerField(default=0)),
+                ('forks_count', models.PositiveIntegerField(default=0)),
+                ('language', models.CharField(blank=True, max_length=50, null=True)),
+                ('visibility', models.CharField(default='public', max_length=20)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('pushed_at', models.DateTimeField(blank=True, null=True)),
+                ('synced_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'GitHub Repository',
+                'verbose_name_plural': 'GitHub Repositories',
+                'ordering': ['-stargazers_count', '-updated_at'],
+                'indexes': [models.Index(fields=['owner', '-stargazers_count', '-updated_at'], name='github_api__owner_29ccb8_idx')],
+            },
+        ),
+    ]
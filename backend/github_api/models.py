@@ -0,0 +1,84 @@
+from django.db import models
+from django.utils import timezone
+
+# GitHub's timestamp format, e.g. 2024-01-01T00:00:00Z
+GITHUB_DATETIME_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+
+def format_github_datetime(value):
+    """Format a stored datetime the way the GitHub API returns it."""
+    if value is None:
+        return None
+    return value.astimezone(timezone.utc).strftime(GITHUB_DATETIME_FORMAT)
+
+class GitHubProfile(models.Model):
+    """Profile counters for a GitHub user, refreshed by each sync."""
+
+    username = models.CharField(max_length=100, unique=True)
+    public_repos = models.PositiveIntegerField(default=0)
+    followers = models.PositiveIntegerField(default=0)
+    following = models.PositiveIntegerField(default=0)
+    synced_at = models.DateTimeField(default=timezone.now)
+    last_full_sync_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = 'GitHub Profile'
+        verbose_name_plural = 'GitHub Profiles'
+
+    def __str__(self):
+        return self.username
+
+    def to_dict(self):
+        """Return the profile counters in the shape of the `/users/{username}` fields we read."""
+        return {
+            'public_repos': self.public_repos,
+            'followers': self.followers,
+            'following': self.following,
+        }
+
+class GitHubRepository(models.Model):
+    """A public, non-fork repository owned by a synced GitHub user."""
+
+    github_id = models.BigIntegerField(unique=True)
+    owner = models.CharField(max_length=100)
+    name = models.CharField(max_length=255)
+    description = models.TextField(blank=True)
+    html_url = models.URLField()
+    homepage = models.CharField(max_length=500, null=True, blank=True)
+    topics = models.JSONField(default=list, blank=True)
+    stargazers_count = models.PositiveIntegerField(default=0)
+    forks_count = models.PositiveIntegerField(default=0)
+    language = models.CharField(max_length=50, null=True, blank=True)
+    visibility = models.CharField(max_length=20, default='public')
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    pushed_at = models.DateTimeField(null=True, blank=True)
+    synced_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-stargazers_count', '-updated_at']
+        indexes = [
+            models.Index(fields=['owner', '-stargazers_count', '-updated_at']),
+        ]
+        verbose_name = 'GitHub Repository'
+        verbose_name_plural = 'GitHub Repositories'
+
+    def __str__(self):
+        return f"{self.owner}/{self.name}"
+
+    def to_dict(self):
+        """Return the repository in the processed shape GitHubService caches."""
+        return {
+            'id': self.github_id,
+            'name': self.name,
+            'description': self.description,
+            'html_url': self.html_url,
+            'homepage': self.homepage,
+            'topics': self.topics,
+            'stargazers_count': self.stargazers_count,
+            'forks_count': self.forks_count,
+            'language': self.language,
+            'updated_at': format_github_datetime(self.updated_at),
+            'created_at': format_github_datetime(self.created_at),
+            'visibility': self.visibility,
+            'pushed_at': format_github_datetime(self.pushed_at),
+        }
@@ -0,0 +1,178 @@
+import logging
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+
+from . import swr
+from .encoders import encode_repositories, encode_repository, encode_stats, render_json
+from .indexes import RepositoryIndex, get_repository_index
+from .search import SearchIndex
+from .services import GitHubService
+
+logger = logging.getLogger(__name__)
+
+def _cached_payload(data_key: str, variant: str, refresh: Callable[[], None], build: Callable[[], Dict]) -> bytes:
+    """
+    Return the rendered JSON for one variant of a cached data set.
+
+    Rendered bytes are stored next to the data and tagged with the data's
+    version, so they are built once per version and variant. `refresh`
+    runs the normal stale-while-revalidate lookup whenever the data is
+    missing or stale.
+    """
+    meta = swr.get_meta(data_key)
+    if meta is None or meta['fresh_until'] <= time.time():
+        refresh()
+        meta = swr.get_meta(data_key)
+
+    payload_key = f"{data_key}_payload_{variant}"
+    entry = cache.get(payload_key)
+    if entry is not None and meta is not None and entry['version'] == meta['version']:
+        return entry['body']
+
+    body = render_json(build())
+    if meta is not None:
+        cache.set(payload_key, {
+            'version': meta['version'],
+            'body': body,
+        }, settings.GITHUB_REPOS_HARD_TTL)
+        logger.info(f"Built '{variant}' payload for {data_key}")
+    return body
+
+def repositories_payload(service: GitHubService, limit: int, featured_only: bool) -> bytes:
+    """Rendered `/repos/` response body for a limit/featured combination."""
+
+    def build():
+        repos, _, _ = get_repository_index(service).query(featured=featured_only, limit=limit)
+        data = encode_repositories(repos)
+        return {
+            'success': True,
+            'count': len(data),
+            'data': data,
+            'last_updated': datetime.now().isoformat(),
+        }
+
+    return _cached_payload(
+        f"github_repos_{service.username}",
+        f"limit{limit}_featured{int(featured_only)}",
+        service.get_repositories,
+        build,
+    )
+
+def stats_payload(service: GitHubService) -> bytes:
+    """Rendered `/stats/` response body."""
+
+    def build():
+        return {
+            'success': True,
+            'data': encode_stats(service.get_user_stats()),
+        }
+
+    return _cached_payload(
+        f"github_stats_{service.username}",
+        'default',
+        service.get_user_stats,
+        build,
+    )
+
+def encode_search_results(results: List[Tuple[Dict, float]]) -> List[Dict]:
+    """Serialized search hits, each with its relevance `score`."""
+    data = []
+    for repo, score in results:
+        item = encode_repository(repo)
+        item['score'] = round(score, 4)
+        data.append(item)
+    return data
+
+def stale_repositories_payload(service: GitHubService, query: Dict) -> Optional[Dict]:
+    """
+    `/repos/` response data built from the last-known-good snapshot.
+
+    Used when GitHub cannot be reached; makes no upstream calls. Returns
+    None if there is no snapshot to serve.
+
+    Raises:
+        InvalidCursor: If `query` has a cursor the snapshot cannot resolve
+    """
+    snapshot = service.last_known_repositories()
+    if snapshot is None:
+        return None
+
+    repos, next_cursor, total = RepositoryIndex(snapshot['repos'], snapshot['version']).query(**query)
+    data = encode_repositories(repos)
+    saved_at = snapshot.get('saved_at')
+    return {
+        'success': True,
+        'stale': True,
+        'count': len(data),
+        'total': total,
+        'next_cursor': next_cursor,
+        'data': data,
+        'last_updated': datetime.fromtimestamp(saved_at).isoformat() if saved_at else None,
+    }
+
+def repository_detail(service: GitHubService, repo: Dict, fetch_readme: bool = True) -> Dict:
+    """`/repos/<name>/` data: the repository with its rendered, sanitized README."""
+    readme = service.get_readme(repo, fetch=fetch_readme)
+    return dict(
+        encode_repository(repo),
+        readme_html=readme['html'] if readme else None,
+        readme_sha=readme['sha'] if readme else None,
+    )
+
+def stale_repository_detail_payload(service: GitHubService, name: str) -> Optional[Dict]:
+    """
+    `/repos/<name>/` response data from the last-known-good snapshot.
+
+    Returns None if there is no snapshot or it has no such repository;
+    only a README already in the cache is included.
+    """
+    snapshot = service.last_known_repositories()
+    if snapshot is None:
+        return None
+
+    repo = RepositoryIndex(snapshot['repos'], snapshot['version']).get(name)
+    if repo is None:
+        return None
+
+    saved_at = snapshot.get('saved_at')
+    return {
+        'success': True,
+        'stale': True,
+        'data': repository_detail(service, repo, fetch_readme=False),
+        'last_updated': datetime.fromtimestamp(saved_at).isoformat() if saved_at else None,
+    }
+
+def stale_search_payload(service: GitHubService, query: str, limit: int) -> Optional[Dict]:
+    """`/search/` response data over the last-known-good snapshot, or None."""
+    snapshot = service.last_known_repositories()
+    if snapshot is None:
+        return None
+
+    index = SearchIndex()
+    index.update(snapshot['repos'], snapshot['version'])
+    data = encode_search_results(index.search(query, limit))
+    saved_at = snapshot.get('saved_at')
+    return {
+        'success': True,
+        'stale': True,
+        'query': query,
+        'count': len(data),
+        'data': data,
+        'last_updated': datetime.fromtimestamp(saved_at).isoformat() if saved_at else None,
+    }
+
+def stale_stats_payload(service: GitHubService) -> Optional[Dict]:
+    """`/stats/` response data from the last-known-good statistics, or None."""
+    stats = service.last_known_stats()
+    if stats is None:
+        return None
+
+    return {
+        'success': True,
+        'stale': True,
+        'data': encode_stats(stats),
+    }
@@ -0,0 +1,82 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+
+def configured_profiles() -> List[str]:
+    """
+    Usernames served by this backend, the default profile first.
+
+    GITHUB_USERNAME is the default profile, served at `/api/github/...`;
+    GITHUB_PROFILES lists further ones, served at `/api/github/<username>/...`.
+    """
+    names = [settings.GITHUB_USERNAME] + list(settings.GITHUB_PROFILES)
+    profiles = {}
+    for name in names:
+        if name and name.lower() not in profiles:
+            profiles[name.lower()] = name
+    return list(profiles.values())
+
+def default_profile() -> str:
+    """Username served when a request does not name one, or '' if none is configured."""
+    profiles = configured_profiles()
+    return profiles[0] if profiles else ''
+
+def resolve_profile(username: Optional[str]) -> Optional[str]:
+    """
+    Map a username from a URL onto its configured spelling.
+
+    GitHub usernames are case-insensitive; using one spelling keeps every
+    cache key and database row for a profile in one place.
+
+    Returns:
+        The configured username, the default profile if `username` is
+        None, or None if the username is not configured
+    """
+    if username is None:
+        return default_profile()
+
+    for name in configured_profiles():
+        if name.lower() == username.lower():
+            return name
+    return None
+
+class ProfileStates:
+    """
+    In-process data kept per profile, such as search and repository indexes.
+
+    Holds at most `max_profiles` profiles per worker. Each access marks the
+    profile as recently used; when a new profile would exceed the limit, the
+    least recently used one is dropped with everything kept for it and is
+    rebuilt from the shared cache on its next request. Memory therefore
+    grows with the number of recently visited profiles, not the number of
+    configured ones.
+    """
+
+    def __init__(self, max_profiles: int):
+        self.max_profiles = max_profiles
+        self._states: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, username: str) -> Dict[str, Any]:
+        """Return the mutable state dict for a profile, creating it if needed."""
+        with self._lock:
+            state = self._states.get(username)
+            if state is None:
+                state = self._states[username] = {}
+                while len(self._states) > self.max_profiles:
+                    self._states.popitem(last=False)
+            else:
+                self._states.move_to_end(username)
+            return state
+
+_profile_states: Optional[ProfileStates] = None
+
+def get_profile_states() -> ProfileStates:
+    """Return this worker's per-profile state."""
+    global _profile_states
+
+    if _profile_states is None:
+        _profile_states = ProfileStates(settings.GITHUB_MAX_ACTIVE_PROFILES)
+    return _profile_states
@@ -0,0 +1,202 @@
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Awaitable, Callable, Dict, Optional, Union
+
+import httpx
+import requests
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+# Rate limit buckets reported by readiness and health checks
+RESOURCES = ('core', 'graphql')
+
+# Call priorities, highest first:
+# - interactive: loads a visitor is waiting on (cold cache misses)
+# - refresh: background revalidation, the sync worker and manual refreshes
+# - prefetch: optional extra data that can wait for the next reset
+INTERACTIVE = 'interactive'
+REFRESH = 'refresh'
+PREFETCH = 'prefetch'
+PRIORITIES = (INTERACTIVE, REFRESH, PREFETCH)
+
+# Cache TTLs are multiplied by the factor of the first threshold the
+# remaining fraction of the budget falls below
+TTL_STEPS = ((0.1, 8), (0.25, 4), (0.5, 2))
+
+_priority: ContextVar[str] = ContextVar('github_call_priority', default=REFRESH)
+
+def _key(resource: str) -> str:
+    return f"github_rate_limit_{resource}"
+
+def _remaining_key(resource: str) -> str:
+    return f"github_rate_limit_{resource}_remaining"
+
+def _reserve(level: str) -> float:
+    """Fraction of the limit that calls of this priority must leave unspent."""
+    return {
+        INTERACTIVE: 0.0,
+        REFRESH: settings.GITHUB_BUDGET_REFRESH_RESERVE,
+        PREFETCH: settings.GITHUB_BUDGET_PREFETCH_RESERVE,
+    }[level]
+
+def record(response: Union[requests.Response, httpx.Response]):
+    """
+    Remember the rate limit headers of a GitHub response in the shared cache.
+
+    Every response carries them, so the remaining budget is known without
+    ever calling `/rate_limit`. Entries expire when the limit resets.
+    """
+    headers = response.headers
+    try:
+        limit = int(headers['X-RateLimit-Limit'])
+        remaining = int(headers['X-RateLimit-Remaining'])
+        reset = int(headers['X-RateLimit-Reset'])
+    except (KeyError, ValueError):
+        return
+
+    resource = headers.get('X-RateLimit-Resource', 'core')
+    timeout = max(int(reset - time.time()), 1)
+    cache.set(_key(resource), {
+        'limit': limit,
+        'remaining': remaining,
+        'reset': reset,
+        'observed_at': time.time(),
+    }, timeout)
+    # Counter that `acquire` claims calls from between responses
+    cache.set(_remaining_key(resource), remaining, timeout)
+
+def get(resource: str = 'core') -> Optional[Dict]:
+    """Last observed `{'limit', 'remaining', 'reset', 'observed_at'}` for a bucket, or None."""
+    state = cache.get(_key(resource))
+    if state is None or state['reset'] <= time.time():
+        return None
+    return state
+
+def current_priority() -> str:
+    return _priority.get()
+
+@contextmanager
+def priority(level: str):
+    """Run the GitHub calls made inside the block at the given priority."""
+    token = _priority.set(level)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+def prioritized(level: str, func: Callable[[], Any]) -> Callable[[], Any]:
+    """Wrap a loader so its GitHub calls run at the given priority."""
+
+    @wraps(func)
+    def wrapper():
+        with priority(level):
+            return func()
+
+    return wrapper
+
+def aprioritized(level: str, func: Callable[[], Awaitable[Any]]) -> Callable[[], Awaitable[Any]]:
+    """Async version of `prioritized` for loaders returning a coroutine."""
+
+    @wraps(func)
+    async def wrapper():
+        with priority(level):
+            return await func()
+
+    return wrapper
+
+def acquire(resource: str = 'core', level: Optional[str] = None) -> bool:
+    """
+    Claim one call from the shared budget.
+
+    Calls are refused once they would dig into the share of the limit
+    reserved for higher priorities (GITHUB_BUDGET_*_RESERVE), so
+    background work stops well before GitHub starts rejecting requests and
+    visitors' loads still get through. The claim is an atomic decrement of
+    a counter shared by every worker; the next response resets it to what
+    GitHub reports, which also returns the claims of free `304`s.
+
+    Args:
+        resource: Rate limit bucket the call is charged to
+        level: Call priority; defaults to the one set with `priority`
+    """
+    level = level or current_priority()
+    state = get(resource)
+    if state is None:
+        # Nothing observed yet, or the limit has reset since
+        return True
+
+    try:
+        remaining = cache.decr(_remaining_key(resource))
+    except ValueError:
+        return True
+
+    if remaining < _reserve(level) * state['limit']:
+        cache.incr(_remaining_key(resource))
+        logger.warning(
+            f"GitHub {resource} budget low ({remaining + 1}/{state['limit']}), "
+            f"refusing {level} call until reset"
+        )
+        return False
+    return True
+
+def ttl_factor(resource: str = 'core') -> int:
+    """How much cache TTLs are currently stretched for this bucket."""
+    return _ttl_factor(get(resource))
+
+def _ttl_factor(state: Optional[Dict]) -> int:
+    if state is None or not settings.GITHUB_ADAPTIVE_TTL:
+        return 1
+
+    fraction = state['remaining'] / state['limit'] if state['limit'] else 0
+    for threshold, factor in TTL_STEPS:
+        if fraction < threshold:
+            return factor
+    return 1
+
+def adaptive_ttl(ttl: int, resource: str = 'core', maximum: Optional[int] = None) -> int:
+    """
+    Stretch a TTL as the budget of a bucket runs low.
+
+    Never beyond the moment the limit resets (a fresh budget needs no
+    stretching), nor beyond `maximum`.
+    """
+    # Read once: the entry may expire or reset between two reads
+    state = get(resource)
+    factor = _ttl_factor(state)
+    if factor == 1:
+        return ttl
+
+    until_reset = state['reset'] - time.time()
+    stretched = max(ttl, min(ttl * factor, int(until_reset)))
+    return min(stretched, maximum) if maximum is not None else stretched
+
+def status() -> Dict[str, Optional[Dict]]:
+    """
+    Budget of every bucket in RESOURCES, or None for buckets not seen yet.
+
+    Besides the observed headers, each entry has the live remaining count,
+    the current TTL factor and which priorities may still spend.
+    """
+    result = {}
+    for resource in RESOURCES:
+        state = get(resource)
+        if state is None:
+            result[resource] = None
+            continue
+
+        remaining = cache.get(_remaining_key(resource), state['remaining'])
+        result[resource] = dict(
+            state,
+            remaining=remaining,
+            ttl_factor=_ttl_factor(state),
+            available={
+                level: remaining - 1 >= _reserve(level) * state['limit']
+                for level in PRIORITIES
+            },
+        )
+    return result
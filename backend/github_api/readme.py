@@ -0,0 +1,151 @@
+import re
+from html import escape
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Set, Tuple
+from urllib.parse import urljoin, urlparse
+
+ALLOWED_TAGS = {
+    'a', 'abbr', 'b', 'blockquote', 'br', 'code', 'dd', 'del', 'details', 'div', 'dl', 'dt',
+    'em', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'hr', 'i', 'img', 'ins', 'kbd', 'li', 'mark',
+    'ol', 'p', 'picture', 'pre', 'q', 's', 'samp', 'source', 'span', 'strike', 'strong', 'sub',
+    'summary', 'sup', 'table', 'tbody', 'td', 'tfoot', 'th', 'thead', 'tr', 'tt', 'ul', 'var',
+}
+
+# Dropped together with everything inside them. Void elements such as
+# <embed> and <frame> have no end tag and must not be listed here; they are
+# dropped like any other tag missing from ALLOWED_TAGS
+DROPPED_TAGS = {
+    'script', 'style', 'iframe', 'object', 'noscript', 'template',
+    'textarea', 'select', 'button', 'form', 'title', 'svg', 'math',
+}
+
+VOID_TAGS = {'br', 'hr', 'img', 'source'}
+
+GLOBAL_ATTRIBUTES = {'class', 'id', 'title', 'align', 'dir', 'lang'}
+
+TAG_ATTRIBUTES = {
+    'a': {'href', 'name'},
+    'img': {'src', 'alt', 'width', 'height'},
+    'source': {'srcset', 'media', 'type'},
+    'ol': {'start', 'type'},
+    'td': {'colspan', 'rowspan'},
+    'th': {'colspan', 'rowspan', 'scope'},
+    'details': {'open'},
+    'q': {'cite'},
+    'blockquote': {'cite'},
+}
+
+URL_ATTRIBUTES = {'href', 'src', 'cite', 'srcset'}
+
+ALLOWED_SCHEMES = {'http', 'https', 'mailto'}
+
+# Browsers ignore these inside a URL scheme, e.g. "java\tscript:"
+_IGNORED_URL_CHARS = re.compile(r'[\x00-\x20\x7f]+')
+
+class _Sanitizer(HTMLParser):
+    """Rebuilds HTML keeping only allowlisted tags, attributes and URLs."""
+
+    def __init__(self, link_base: Optional[str], image_base: Optional[str]):
+        super().__init__(convert_charrefs=True)
+        self.link_base = link_base
+        self.image_base = image_base
+        self.output: List[str] = []
+        self.open_tags: List[str] = []
+        self.dropped_depth = 0
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]):
+        if tag in DROPPED_TAGS:
+            self.dropped_depth += 1
+            return
+        if self.dropped_depth or tag not in ALLOWED_TAGS:
+            return
+
+        self.output.append(f"<{tag}{self._attributes(tag, attrs)}>")
+        if tag not in VOID_TAGS:
+            self.open_tags.append(tag)
+
+    def handle_startendtag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag: str):
+        if tag in DROPPED_TAGS:
+            self.dropped_depth = max(self.dropped_depth - 1, 0)
+            return
+        if self.dropped_depth or tag not in self.open_tags:
+            return
+
+        # Close anything left open inside it, so the output stays well nested
+        while self.open_tags:
+            open_tag = self.open_tags.pop()
+            self.output.append(f"</{open_tag}>")
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data: str):
+        if not self.dropped_depth:
+            self.output.append(escape(data, quote=False))
+
+    def close(self) -> str:
+        super().close()
+        while self.open_tags:
+            self.output.append(f"</{self.open_tags.pop()}>")
+        return ''.join(self.output)
+
+    def _attributes(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> str:
+        allowed: Set[str] = GLOBAL_ATTRIBUTES | TAG_ATTRIBUTES.get(tag, set())
+        kept: Dict[str, str] = {}
+
+        for name, value in attrs:
+            if name not in allowed or name in kept:
+                continue
+            value = value or ''
+            if name == 'id' and not value.startswith('user-content-'):
+                # Only GitHub's prefixed anchors, which cannot clobber page ids
+                continue
+            if name in URL_ATTRIBUTES:
+                value = self._url(tag, name, value)
+                if value is None:
+                    continue
+            kept[name] = value
+
+        if tag == 'a' and 'href' in kept:
+            kept['rel'] = 'nofollow noopener'
+
+        return ''.join(f' {name}="{escape(value)}"' for name, value in kept.items())
+
+    def _url(self, tag: str, name: str, value: str) -> Optional[str]:
+        if name == 'srcset':
+            candidates = [self._url(tag, 'src', part.strip()) for part in value.split(',') if part.strip()]
+            return ', '.join(candidates) if candidates and None not in candidates else None
+
+        # The first token; srcset candidates carry a width descriptor after it
+        url, _, descriptor = value.strip().partition(' ')
+        if url.startswith('#'):
+            return value.strip()
+
+        scheme = urlparse(_IGNORED_URL_CHARS.sub('', url)).scheme.lower()
+        if scheme:
+            if scheme not in ALLOWED_SCHEMES:
+                return None
+        else:
+            base = self.image_base if name in ('src', 'srcset') else self.link_base
+            if base:
+                url = urljoin(base, url)
+
+        return f"{url} {descriptor}".strip()
+
+def sanitize_html(html: str, link_base: Optional[str] = None, image_base: Optional[str] = None) -> str:
+    """
+    Reduce rendered README HTML to markup that is safe to embed in a page.
+
+    Only allowlisted tags and attributes are kept; scripts, styles, frames,
+    forms and inline SVG are removed with their contents, and URLs must be
+    http(s), mailto or fragment links. Relative URLs are resolved against
+    the README's location: links against `link_base` (the file on
+    github.com) and images against `image_base` (its raw download URL).
+    """
+    sanitizer = _Sanitizer(link_base, image_base)
+    sanitizer.feed(html)
+    return sanitizer.close()
@@ -0,0 +1,244 @@
+import heapq
+import math
+import re
+import threading
+import time
+from bisect import bisect_left, insort
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from . import swr
+from .profiles import get_profile_states
+from .services import GitHubService
+
+# Weight of a term occurrence per field; a name match outranks a description match
+FIELD_WEIGHTS = {
+    'name': 3.0,
+    'topics': 2.0,
+    'description': 1.0,
+}
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Score multiplier for terms matched only by prefix rather than exactly
+PREFIX_WEIGHT = 0.7
+
+# Most index terms a single query token may expand to by prefix
+MAX_PREFIX_EXPANSIONS = 50
+
+# Ranking boost per order of magnitude of stars: score * (1 + STAR_BOOST * log1p(stars))
+STAR_BOOST = 0.1
+
+_WORD_RE = re.compile(r'[A-Za-z0-9]+')
+_CAMEL_RE = re.compile(r'[A-Z]+(?![a-z])|[A-Z]?[a-z]+|[0-9]+')
+
+def tokenize(text: str, split_words: bool = True) -> List[str]:
+    """
+    Split text into lowercase search terms.
+
+    Words are split on punctuation and, with `split_words`, also on
+    camelCase and letter/digit boundaries while keeping the whole word, so
+    `my-portfolioWebsite` yields `my`, `portfoliowebsite`, `portfolio` and
+    `website`.
+    """
+    tokens = []
+    for word in _WORD_RE.findall(text or ''):
+        lowered = word.lower()
+        tokens.append(lowered)
+        if not split_words:
+            continue
+        parts = _CAMEL_RE.findall(word)
+        if len(parts) > 1:
+            tokens.extend(part.lower() for part in parts)
+    return tokens
+
+def _document_terms(repo: Dict) -> Counter:
+    """Field-weighted term frequencies for one repository."""
+    terms = Counter()
+    for term in tokenize(repo['name']):
+        terms[term] += FIELD_WEIGHTS['name']
+    for term in tokenize(' '.join(repo['topics'])):
+        terms[term] += FIELD_WEIGHTS['topics']
+    for term in tokenize(repo['description']):
+        terms[term] += FIELD_WEIGHTS['description']
+    return terms
+
+def _indexed_fields(repo: Dict) -> Tuple:
+    return repo['name'], repo['description'], tuple(repo['topics'])
+
+class SearchIndex:
+    """
+    Inverted index over repository names, descriptions and topics.
+
+    Postings map each term to `{repo id: weighted term frequency}`; a sorted
+    term list answers prefix lookups by bisection. `update` diffs a new
+    repository list against the indexed one and only re-indexes repositories
+    whose searchable fields changed, so a webhook update to one repository
+    costs one document rather than a rebuild.
+    """
+
+    def __init__(self):
+        self.version: Optional[str] = None
+        self.repos: Dict[int, Dict] = {}
+        self.postings: Dict[str, Dict[int, float]] = {}
+        self.terms: List[str] = []
+        self.doc_terms: Dict[int, Counter] = {}
+        self.doc_lengths: Dict[int, float] = {}
+        self.total_length = 0.0
+        # BM25 length normalisation and star boost per repository
+        self.doc_norms: Dict[int, float] = {}
+        self.boosts: Dict[int, float] = {}
+        self._lock = threading.Lock()
+
+    def update(self, repos: List[Dict], version: Optional[str]) -> int:
+        """
+        Bring the index in line with `repos`.
+
+        Returns:
+            Number of repositories that were (re-)indexed or removed
+        """
+        with self._lock:
+            current = {repo['id']: repo for repo in repos}
+            changed = 0
+
+            for repo_id in list(self.repos):
+                if repo_id not in current:
+                    self._remove(repo_id)
+                    changed += 1
+
+            for repo_id, repo in current.items():
+                previous = self.repos.get(repo_id)
+                if previous is None:
+                    self._add(repo)
+                    changed += 1
+                elif _indexed_fields(previous) != _indexed_fields(repo):
+                    self._remove(repo_id)
+                    self._add(repo)
+                    changed += 1
+                else:
+                    # Star counts and dates only affect ranking and output
+                    self.repos[repo_id] = repo
+
+            if self.repos:
+                average_length = self.total_length / len(self.repos)
+                self.doc_norms = {
+                    repo_id: BM25_K1 * (1 - BM25_B + BM25_B * length / average_length)
+                    for repo_id, length in self.doc_lengths.items()
+                }
+            else:
+                self.doc_norms = {}
+            self.boosts = {
+                repo_id: 1 + STAR_BOOST * math.log1p(repo['stargazers_count'])
+                for repo_id, repo in self.repos.items()
+            }
+
+            self.version = version
+            return changed
+
+    def _add(self, repo: Dict):
+        repo_id = repo['id']
+        terms = _document_terms(repo)
+        self.repos[repo_id] = repo
+        self.doc_terms[repo_id] = terms
+        length = sum(terms.values())
+        self.doc_lengths[repo_id] = length
+        self.total_length += length
+
+        for term, frequency in terms.items():
+            posting = self.postings.get(term)
+            if posting is None:
+                posting = self.postings[term] = {}
+                insort(self.terms, term)
+            posting[repo_id] = frequency
+
+    def _remove(self, repo_id: int):
+        for term in self.doc_terms.pop(repo_id):
+            posting = self.postings[term]
+            del posting[repo_id]
+            if not posting:
+                del self.postings[term]
+                del self.terms[bisect_left(self.terms, term)]
+        self.total_length -= self.doc_lengths.pop(repo_id)
+        del self.repos[repo_id]
+
+    def _expand(self, token: str) -> List[Tuple[str, float]]:
+        """Index terms matching `token` exactly or by prefix, with their weight."""
+        matches = []
+        start = bisect_left(self.terms, token)
+        for term in self.terms[start:start + MAX_PREFIX_EXPANSIONS]:
+            if not term.startswith(token):
+                break
+            matches.append((term, 1.0 if term == token else PREFIX_WEIGHT))
+        return matches
+
+    def search(self, query: str, limit: int = 20) -> List[Tuple[Dict, float]]:
+        """
+        Rank repositories for a free-text query.
+
+        Every query token is matched against index terms exactly and by
+        prefix (so partial words work while typing). Documents are scored
+        with BM25 over the field-weighted term frequencies and boosted by
+        their star count.
+
+        Returns:
+            List of (repository, score), best first
+        """
+        # Documents are indexed with their word parts, so whole query words suffice
+        tokens = list(dict.fromkeys(tokenize(query, split_words=False)))
+        if not tokens:
+            return []
+
+        with self._lock:
+            count = len(self.repos)
+            if not count:
+                return []
+            doc_norms = self.doc_norms
+
+            scores: Dict[int, float] = {}
+            for token in tokens:
+                # Best weight per document across this token's expansions
+                best: Dict[int, float] = {}
+                for term, weight in self._expand(token):
+                    posting = self.postings[term]
+                    idf = math.log(1 + (count - len(posting) + 0.5) / (len(posting) + 0.5))
+                    factor = weight * idf * (BM25_K1 + 1)
+                    for repo_id, frequency in posting.items():
+                        score = factor * frequency / (frequency + doc_norms[repo_id])
+                        if score > best.get(repo_id, 0.0):
+                            best[repo_id] = score
+                for repo_id, score in best.items():
+                    scores[repo_id] = scores.get(repo_id, 0.0) + score
+
+            boosts = self.boosts
+            top = heapq.nsmallest(
+                limit,
+                ((-score * boosts[repo_id], self.repos[repo_id]['name'].lower(), repo_id)
+                 for repo_id, score in scores.items()),
+            )
+            return [(self.repos[repo_id], -score) for score, _, repo_id in top]
+
+def get_search_index(service: GitHubService) -> SearchIndex:
+    """
+    Return the search index for the current repository data.
+
+    Each profile has one index, kept in the worker's LRU of profile states.
+    When the cached repository list has a new version, the existing index
+    is updated incrementally from it instead of being rebuilt.
+    """
+    data_key = f"github_repos_{service.username}"
+    meta = swr.get_meta(data_key)
+    if meta is None or meta['fresh_until'] <= time.time():
+        service.get_repositories()
+        meta = swr.get_meta(data_key)
+
+    state = get_profile_states().get(service.username)
+    index = state.get('search_index')
+    if index is None:
+        index = state.setdefault('search_index', SearchIndex())
+
+    version = meta['version'] if meta is not None else None
+    if index.version is None or index.version != version:
+        index.update(service.get_repositories(), version)
+    return index
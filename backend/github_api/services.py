@@ -1,9 +1,27 @@
 import requests
+import base64
+import hashlib
 import logging
-from typing import Dict, List, Optional
-from datetime import datetime
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime, timedelta
+from urllib.parse import urlencode, urlparse, parse_qs
 from django.conf import settings
 from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from . import ratelimit, swr
+from .breaker import get_breaker
+from .client import get_client, rate_limit_wait
+from .languages import LanguageBytes
+from .models import GitHubProfile, GitHubRepository, format_github_datetime
+from .profiles import default_profile
+from .readme import sanitize_html
 
 logger = logging.getLogger(__name__)
 
@@ -11,14 +29,143 @@ class GitHubAPIError(Exception):
     """Custom exception for GitHub API errors."""
     pass
 
+class CircuitOpenError(GitHubAPIError):
+    """Raised instead of calling GitHub while the circuit breaker is open."""
+    pass
+
+class GitHubNotFoundError(GitHubAPIError):
+    """Raised when GitHub answers 404, e.g. for a repository without a README."""
+    pass
+
+class RateLimitBudgetError(GitHubAPIError):
+    """Raised instead of calling GitHub when the call's priority has no budget left."""
+    pass
+
+# Serializes the write phase of syncs running in parallel threads (the batch
+# refresher). SQLite cannot upgrade concurrent read transactions to writes
+# and fails them with "database is locked" instead of waiting.
+_store_lock = threading.Lock()
+
+def _is_outage(response) -> bool:
+    """
+    Whether a failed call says GitHub is unavailable rather than rejecting the request.
+    
+    Connection errors, timeouts (no response), server errors and rate limiting
+    count; other client errors such as 404 do not.
+    """
+    if response is None:
+        return True
+    return response.status_code >= 500 or rate_limit_wait(response) is not None
+
+def _page_number(url: Optional[str]) -> Optional[int]:
+    """Extract the `page` query parameter from a pagination link."""
+    if not url:
+        return None
+    try:
+        return int(parse_qs(urlparse(url).query)['page'][0])
+    except (KeyError, IndexError, ValueError):
+        return None
+
+LANGUAGE_COLORS = {
+    'Python': '#3776ab',
+    'JavaScript': '#f1e05a',
+    'TypeScript': '#2b7489',
+    'Java': '#b07219',
+    'C++': '#f34b7d',
+    'C': '#555555',
+    'HTML': '#e34c26',
+    'CSS': '#1572b6',
+    'PHP': '#4f5d95',
+    'Ruby': '#701516',
+    'Go': '#00ADD8',
+    'Rust': '#dea584',
+    'Swift': '#ffac45',
+    'Kotlin': '#F18E33',
+    'Dart': '#00B4AB',
+    'Shell': '#89e051',
+    'Vue': '#2c3e50',
+    'React': '#61dafb',
+}
+
+# Fetches exactly the fields RepositorySerializer and GitHubStatsSerializer use.
+# Profile counters are only requested with the first page.
+PROFILE_QUERY = """
+query($login: String!, $pageSize: Int!, $cursor: String, $withProfile: Boolean!) {
+  user(login: $login) {
+    followers @include(if: $withProfile) { totalCount }
+    following @include(if: $withProfile) { totalCount }
+    publicRepositories: repositories(privacy: PUBLIC, ownerAffiliations: OWNER) @include(if: $withProfile) {
+      totalCount
+    }
+    repositories(
+      first: $pageSize
+      after: $cursor
+      privacy: PUBLIC
+      isFork: false
+      ownerAffiliations: OWNER
+      orderBy: {field: UPDATED_AT, direction: DESC}
+    ) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        databaseId
+        name
+        description
+        url
+        homepageUrl
+        repositoryTopics(first: 20) { nodes { topic { name } } }
+        stargazerCount
+        forkCount
+        primaryLanguage { name }
+        updatedAt
+        pushedAt
+        createdAt
+        visibility
+      }
+    }
+  }
+}
+"""
+
+def _reached_unchanged(repos: List[Dict], known: Dict) -> bool:
+    """Whether any repository in a page matches its stored `updated_at`/`pushed_at`."""
+    return any(
+        known.get(repo['id']) == (repo['updated_at'], repo['pushed_at'])
+        for repo in repos
+    )
+
+def _readme_text(data: Dict) -> str:
+    """Markdown source from a `/repos/{owner}/{repo}/readme` response."""
+    if data.get('encoding') != 'base64':
+        return data.get('content') or ''
+    return base64.b64decode(data['content']).decode('utf-8', errors='replace')
+
+def _apply_aggregate_delta(aggregates: Dict, previous: Optional[Dict], current: Optional[Dict]) -> Dict:
+    """Move statistics aggregates from one version of a repository to another."""
+    result = dict(aggregates, language_counts=dict(aggregates['language_counts']))
+    
+    for repo, sign in ((previous, -1), (current, 1)):
+        if repo is None:
+            continue
+        result['total_repos'] += sign
+        result['total_stars'] += sign * repo['stargazers_count']
+        result['total_forks'] += sign * repo['forks_count']
+        if repo['language']:
+            count = result['language_counts'].get(repo['language'], 0) + sign
+            if count > 0:
+                result['language_counts'][repo['language']] = count
+            else:
+                result['language_counts'].pop(repo['language'], None)
+    
+    return result
+
 class GitHubService:
-    """Service class for GitHub API integration."""
+    """Service class for GitHub API integration of one profile (the default profile unless given)."""
     
     BASE_URL = "https://api.github.com"
     
-    def __init__(self):
+    def __init__(self, username: Optional[str] = None):
         self.token = settings.GITHUB_TOKEN
-        self.username = settings.GITHUB_USERNAME
+        self.username = username or default_profile()
         self.headers = {
             'Accept': 'application/vnd.github.v3+json',
             'User-Agent': f'Portfolio-API/1.0 ({self.username})',
@@ -26,18 +173,108 @@ class GitHubService:
         
         if self.token:
             self.headers['Authorization'] = f'token {self.token}'
+        
+        # The GraphQL API rejects unauthenticated requests
+        self.use_graphql = settings.GITHUB_USE_GRAPHQL and bool(self.token)
+        # Rate limit bucket that syncs are charged to
+        self.rate_limit_resource = 'graphql' if self.use_graphql else 'core'
+    
+    def _check_breaker(self):
+        """Fail fast, without touching the network, while GitHub is known to be down."""
+        if not get_breaker().allow_request():
+            raise CircuitOpenError("GitHub is unavailable (circuit breaker open)")
+    
+    def _claim_budget(self, resource: str):
+        """Charge one call to the shared rate limit budget at the current priority."""
+        if not ratelimit.acquire(resource):
+            # Nothing was sent, so a half-open trial learned nothing
+            get_breaker().release_trial()
+            raise RateLimitBudgetError(
+                f"GitHub {resource} rate limit budget is reserved for higher-priority calls"
+            )
+    
+    def repos_soft_ttl(self) -> int:
+        """Repository soft TTL, stretched while the rate limit budget runs low."""
+        return ratelimit.adaptive_ttl(
+            settings.GITHUB_REPOS_SOFT_TTL, self.rate_limit_resource, settings.GITHUB_REPOS_HARD_TTL
+        )
     
-    def _make_request(self, endpoint: str, params: Optional[Dict] = None) -> Dict:
-        """Make authenticated request to GitHub API."""
+    def stats_soft_ttl(self) -> int:
+        """Statistics soft TTL, stretched while the rate limit budget runs low."""
+        return ratelimit.adaptive_ttl(
+            settings.GITHUB_STATS_SOFT_TTL, self.rate_limit_resource, settings.GITHUB_STATS_HARD_TTL
+        )
+    
+    def _record_failure(self, response):
+        if _is_outage(response):
+            get_breaker().record_failure()
+        else:
+            get_breaker().release_trial()
+    
+    def _validator_key(self, endpoint: str, params: Optional[Dict] = None) -> str:
+        """Cache key holding the ETag/Last-Modified validators for one endpoint and page."""
+        query = urlencode(sorted((params or {}).items()))
+        digest = hashlib.sha1(f"{endpoint}?{query}".encode()).hexdigest()
+        return f"github_validators_{digest}"
+    
+    def _request(self, endpoint: str, params: Optional[Dict] = None) -> Tuple[Dict, bool, Dict]:
+        """
+        Make a conditional request to GitHub API.
+        
+        Stored validators are sent as If-None-Match/If-Modified-Since. A 304
+        reuses the payload parsed on the previous fetch and does not count
+        against the rate limit. Calls go through the shared circuit breaker.
+        
+        Returns:
+            Tuple of (parsed payload, whether it changed since the last fetch,
+            parsed `Link` header relations)
+        """
         url = f"{self.BASE_URL}{endpoint}"
+        validator_key = self._validator_key(endpoint, params)
+        stored = cache.get(validator_key)
         
+        headers = dict(self.headers)
+        if stored:
+            if stored.get('etag'):
+                headers['If-None-Match'] = stored['etag']
+            if stored.get('last_modified'):
+                headers['If-Modified-Since'] = stored['last_modified']
+        
+        self._check_breaker()
+        self._claim_budget('core')
+        response = None
         try:
-            response = requests.get(url, headers=self.headers, params=params, timeout=10)
+            response = get_client().get(url, headers=headers, params=params)
+            ratelimit.record(response)
+            
+            if response.status_code == 304 and stored:
+                get_breaker().record_success()
+                return stored['data'], False, stored.get('links', {})
+            
+            if response.status_code == 404:
+                get_breaker().record_success()
+                raise GitHubNotFoundError(f"GitHub resource not found: {endpoint}")
+            
             response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
+            data = response.json()
+        except (requests.exceptions.RequestException, ValueError) as e:
             logger.error(f"GitHub API request failed: {e}")
+            self._record_failure(response)
             raise GitHubAPIError(f"Failed to fetch data from GitHub: {str(e)}")
+        
+        get_breaker().record_success()
+        
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if etag or last_modified:
+            cache.set(validator_key, {
+                'etag': etag,
+                'last_modified': last_modified,
+                'data': data,
+                'links': response.links,
+            }, settings.GITHUB_VALIDATOR_TTL)
+        
+        return data, True, response.links
     
     def get_repositories(self, per_page: int = 50) -> List[Dict]:
         """
@@ -49,169 +286,917 @@ class GitHubService:
         Returns:
             List of repository dictionaries
         """
-        cache_key = f"github_repos_{self.username}"
-        cached_data = cache.get(cache_key)
-        
-        if cached_data:
-            logger.info("Returning cached repository data")
-            return cached_data
-        
         if not self.username:
             raise GitHubAPIError("GitHub username not configured")
         
+        return swr.get_or_refresh(
+            f"github_repos_{self.username}",
+            ratelimit.prioritized(ratelimit.INTERACTIVE, lambda: self._load_repositories(per_page)),
+            soft_ttl=self.repos_soft_ttl(),
+            hard_ttl=settings.GITHUB_REPOS_HARD_TTL,
+            lock_timeout=settings.GITHUB_REFRESH_LOCK_TTL,
+            refresh_loader=ratelimit.prioritized(ratelimit.REFRESH, lambda: self._load_repositories(per_page)),
+        )
+    
+    def _load_repositories(self, per_page: int = 50) -> List[Dict]:
+        """
+        Load repositories from the database, bypassing the cache.
+        
+        GitHub is only contacted when the stored data is missing or older
+        than the repository soft TTL, and then only for changed pages.
+        """
         try:
-            repos_data = []
-            page = 1
-            
-            while True:
-                endpoint = f"/users/{self.username}/repos"
-                params = {
-                    'type': 'public',
-                    'sort': 'updated',
-                    'direction': 'desc',
-                    'per_page': per_page,
-                    'page': page
-                }
-                
-                data = self._make_request(endpoint, params)
-                
-                if not data:
-                    break
-                
-                # Filter and process repositories
-                for repo in data:
-                    if not repo.get('fork', True):  # Exclude forks
-                        processed_repo = {
-                            'id': repo['id'],
-                            'name': repo['name'],
-                            'description': repo.get('description', '') or f"A project by {self.username}",
-                            'html_url': repo['html_url'],
-                            'homepage': repo.get('homepage'),
-                            'topics': repo.get('topics', []),
-                            'stargazers_count': repo['stargazers_count'],
-                            'forks_count': repo['forks_count'],
-                            'language': repo.get('language'),
-                            'updated_at': repo['updated_at'],
-                            'created_at': repo['created_at'],
-                            'visibility': repo.get('visibility', 'public'),
-                        }
-                        repos_data.append(processed_repo)
-                
-                # If we got less than per_page results, we're done
-                if len(data) < per_page:
-                    break
-                
-                page += 1
-                
-                # Limit to prevent too many requests
-                if page > 10:
-                    break
-            
-            # Sort by stars and update date
-            repos_data.sort(key=lambda x: (x['stargazers_count'], x['updated_at']), reverse=True)
-            
-            # Cache for 1 hour
-            cache.set(cache_key, repos_data, 3600)
-            logger.info(f"Fetched and cached {len(repos_data)} repositories")
-            
-            return repos_data
+            self._ensure_synced(per_page)
+            return self._read_repositories()
             
         except Exception as e:
             logger.error(f"Error fetching repositories: {e}")
             raise GitHubAPIError(f"Failed to fetch repositories: {str(e)}")
     
-    def get_user_stats(self) -> Dict:
+    def _read_repositories(self) -> List[Dict]:
+        """Read the stored repositories and refresh the processed snapshot."""
+        repos_data = [
+            repo.to_dict()
+            for repo in GitHubRepository.objects.filter(owner=self.username)
+        ]
+        
+        self._update_repository_snapshot(repos_data)
+        logger.info(f"Loaded {len(repos_data)} repositories")
+        
+        return repos_data
+    
+    def _ensure_synced(self, per_page: int = 50) -> GitHubProfile:
+        """Return the stored profile, syncing from GitHub first if it is missing or stale."""
+        profile = GitHubProfile.objects.filter(username=self.username).first()
+        stale_before = timezone.now() - timedelta(seconds=self.repos_soft_ttl())
+        
+        if profile is None or profile.synced_at < stale_before:
+            self.sync_database(per_page=per_page)
+            profile = GitHubProfile.objects.get(username=self.username)
+        
+        return profile
+    
+    def sync_database(self, full: bool = False, per_page: int = 50) -> bool:
         """
-        Fetch user statistics from GitHub API.
+        Bring the stored profile and repositories up to date with GitHub.
+        
+        A delta sync walks repositories newest-updated first and stops at the
+        first page holding a repository whose `updated_at`/`pushed_at` match
+        the stored row; only new or changed rows are written. A full sync
+        (forced, first run, or every GITHUB_FULL_SYNC_INTERVAL) fetches every
+        page and also removes repositories that disappeared upstream.
         
         Returns:
-            Dictionary containing user statistics
+            Whether any stored repository changed
         """
-        cache_key = f"github_stats_{self.username}"
-        cached_data = cache.get(cache_key)
-        
-        if cached_data:
-            logger.info("Returning cached stats data")
-            return cached_data
+        full, known = self._plan_sync(full)
+        user_data, repos_data = self._fetch_upstream(full, per_page, known)
+        return self._store_sync(user_data, repos_data, full)
+    
+    def _plan_sync(self, full: bool) -> Tuple[bool, Dict]:
+        """
+        Decide between a full and a delta sync.
         
-        if not self.username:
-            raise GitHubAPIError("GitHub username not configured")
+        Returns:
+            Tuple of (whether to run a full sync, stored `(updated_at,
+            pushed_at)` pairs keyed by repository id for a delta sync)
+        """
+        profile = GitHubProfile.objects.filter(username=self.username).first()
+        if (profile is None or profile.last_full_sync_at is None or
+                profile.last_full_sync_at < timezone.now() - timedelta(seconds=settings.GITHUB_FULL_SYNC_INTERVAL)):
+            full = True
         
-        try:
-            # Get user info
-            user_data = self._make_request(f"/users/{self.username}")
-            
-            # Get repositories for language stats
-            repos = self.get_repositories()
-            
-            # Calculate statistics
-            total_repos = len(repos)
-            total_stars = sum(repo['stargazers_count'] for repo in repos)
-            total_forks = sum(repo['forks_count'] for repo in repos)
-            
-            # Language statistics
-            language_counts = {}
-            for repo in repos:
-                if repo['language']:
-                    language_counts[repo['language']] = language_counts.get(repo['language'], 0) + 1
-            
-            # Calculate language percentages and assign colors
-            total_repos_with_language = sum(language_counts.values())
-            language_colors = {
-                'Python': '#3776ab',
-                'JavaScript': '#f1e05a',
-                'TypeScript': '#2b7489',
-                'Java': '#b07219',
-                'C++': '#f34b7d',
-                'C': '#555555',
-                'HTML': '#e34c26',
-                'CSS': '#1572b6',
-                'PHP': '#4f5d95',
-                'Ruby': '#701516',
-                'Go': '#00ADD8',
-                'Rust': '#dea584',
-                'Swift': '#ffac45',
-                'Kotlin': '#F18E33',
-                'Dart': '#00B4AB',
-                'Shell': '#89e051',
-                'Vue': '#2c3e50',
-                'React': '#61dafb',
+        known = {}
+        if not full:
+            known = {
+                github_id: (
+                    format_github_datetime(updated_at),
+                    format_github_datetime(pushed_at),
+                )
+                for github_id, updated_at, pushed_at in GitHubRepository.objects.filter(
+                    owner=self.username
+                ).values_list('github_id', 'updated_at', 'pushed_at')
             }
+        
+        return full, known
+    
+    def _fetch_upstream(self, full: bool, per_page: int, known: Dict) -> Tuple[Dict, List[Dict]]:
+        """Fetch the profile and the repositories a sync needs from GitHub."""
+        if self.use_graphql:
+            user_data, repos_data = self._fetch_profile_graphql(known if not full else None)
+        else:
+            user_data, _, _ = self._request(f"/users/{self.username}")
+            if full:
+                repos_data = self._fetch_repositories_rest(per_page)
+            else:
+                repos_data = self._fetch_changed_repositories_rest(per_page, known)
+        
+        return user_data, repos_data
+    
+    def _store_sync(self, user_data: Dict, repos_data: List[Dict], full: bool) -> bool:
+        """Write fetched sync results to the database; returns whether repositories changed."""
+        with _store_lock, transaction.atomic():
+            changed = self._upsert_repositories(repos_data, prune=full)
             
-            languages = []
-            for lang, count in sorted(language_counts.items(), key=lambda x: x[1], reverse=True):
-                if total_repos_with_language > 0:
-                    percentage = (count / total_repos_with_language) * 100
-                    languages.append({
-                        'name': lang,
-                        'count': count,
-                        'percentage': round(percentage, 1),
-                        'color': language_colors.get(lang, '#586069')
-                    })
-            
-            stats = {
-                'total_repos': total_repos,
-                'total_stars': total_stars,
-                'total_forks': total_forks,
-                'public_repos': user_data.get('public_repos', total_repos),
+            now = timezone.now()
+            defaults = {
+                'public_repos': user_data.get('public_repos', 0),
                 'followers': user_data.get('followers', 0),
                 'following': user_data.get('following', 0),
-                'languages': languages[:10],  # Top 10 languages
-                'last_updated': datetime.now().isoformat(),
+                'synced_at': now,
             }
+            if full:
+                defaults['last_full_sync_at'] = now
+            GitHubProfile.objects.update_or_create(username=self.username, defaults=defaults)
+        
+        logger.info(
+            f"{'Full' if full else 'Delta'} sync checked {len(repos_data)} repositories "
+            f"({'changes stored' if changed else 'no changes'})"
+        )
+        return changed
+    
+    def _upsert_repositories(self, repos_data: List[Dict], prune: bool = False) -> bool:
+        """
+        Write new or changed repositories to the database.
+        
+        Args:
+            repos_data: Processed repository dictionaries
+            prune: Delete stored repositories missing from `repos_data`
+            
+        Returns:
+            Whether any row was created, updated or deleted
+        """
+        existing = {
+            repo.github_id: repo
+            for repo in GitHubRepository.objects.filter(
+                github_id__in=[repo['id'] for repo in repos_data]
+            )
+        }
+        
+        to_create = []
+        to_update = []
+        for data in repos_data:
+            current = existing.get(data['id'])
+            if current is not None and current.to_dict() == data:
+                continue
+            
+            repo = current or GitHubRepository(github_id=data['id'])
+            repo.owner = self.username
+            repo.name = data['name']
+            repo.description = data['description']
+            repo.html_url = data['html_url']
+            repo.homepage = data['homepage']
+            repo.topics = data['topics']
+            repo.stargazers_count = data['stargazers_count']
+            repo.forks_count = data['forks_count']
+            repo.language = data['language']
+            repo.visibility = data['visibility']
+            repo.created_at = parse_datetime(data['created_at'])
+            repo.updated_at = parse_datetime(data['updated_at'])
+            repo.pushed_at = parse_datetime(data['pushed_at']) if data.get('pushed_at') else None
+            
+            if current is None:
+                to_create.append(repo)
+            else:
+                to_update.append(repo)
+        
+        if to_create:
+            GitHubRepository.objects.bulk_create(to_create)
+        if to_update:
+            # bulk_update() skips pre_save(), so auto_now is not applied
+            synced_at = timezone.now()
+            for repo in to_update:
+                repo.synced_at = synced_at
+            GitHubRepository.objects.bulk_update(to_update, [
+                'owner', 'name', 'description', 'html_url', 'homepage', 'topics',
+                'stargazers_count', 'forks_count', 'language', 'visibility',
+                'created_at', 'updated_at', 'pushed_at', 'synced_at',
+            ])
+        
+        deleted = 0
+        if prune:
+            deleted, _ = GitHubRepository.objects.filter(owner=self.username).exclude(
+                github_id__in=[repo['id'] for repo in repos_data]
+            ).delete()
+        
+        return bool(to_create or to_update or deleted)
+    
+    def _fetch_repositories_rest(self, per_page: int) -> List[Dict]:
+        """Fetch and process repositories through the REST API."""
+        pages, changed = self._fetch_repository_pages(per_page)
+        
+        snapshot = cache.get(f"github_repos_snapshot_{self.username}")
+        if not changed and snapshot:
+            # Every page answered 304: the processed list is still current
+            logger.info("Repository data unchanged upstream, reusing processed snapshot")
+            return snapshot['repos']
+        
+        return self._process_repository_pages(pages)
+    
+    def _process_repository_pages(self, pages: List[List[Dict]]) -> List[Dict]:
+        """Process raw REST repository pages into the sorted repository list."""
+        repos_data = [
+            self._process_repository(repo)
+            for data in pages
+            for repo in data
+            if not repo.get('fork', True)  # Exclude forks
+        ]
+        
+        # Sort by stars and update date
+        repos_data.sort(key=lambda x: (x['stargazers_count'], x['updated_at']), reverse=True)
+        return repos_data
+    
+    def _fetch_changed_repositories_rest(self, per_page: int, known: Dict) -> List[Dict]:
+        """
+        Fetch repositories updated since the last sync through the REST API.
+        
+        Pages are sorted by `updated_at` descending, so paging stops after the
+        first page containing a repository that matches its stored row.
+        
+        Args:
+            per_page: Number of repositories to fetch per page
+            known: Stored `(updated_at, pushed_at)` pairs keyed by repository id
+        """
+        endpoint = f"/users/{self.username}/repos"
+        repos_data = []
+        
+        for page in range(1, settings.GITHUB_MAX_PAGES + 1):
+            data, _, _ = self._request(endpoint, self._repository_page_params(per_page, page))
+            
+            page_repos = [
+                self._process_repository(repo)
+                for repo in data
+                if not repo.get('fork', True)  # Exclude forks
+            ]
+            repos_data.extend(page_repos)
+            
+            if len(data) < per_page or _reached_unchanged(page_repos, known):
+                break
+        
+        return repos_data
+    
+    def _update_repository_snapshot(self, repos_data: List[Dict]):
+        """
+        Keep the long-lived snapshot of the processed repository list.
+        
+        The snapshot carries a version that only changes when the list
+        itself does, so derived data can tell whether it is still current.
+        It is also the last-known-good copy served while GitHub is down, so
+        it is kept for GITHUB_LAST_KNOWN_GOOD_TTL and `saved_at` records when
+        it was last confirmed.
+        """
+        snapshot_key = f"github_repos_snapshot_{self.username}"
+        snapshot = cache.get(snapshot_key)
+        
+        version = snapshot['version'] if snapshot and snapshot['repos'] == repos_data else uuid.uuid4().hex
+        cache.set(snapshot_key, {
+            'repos': repos_data,
+            'version': version,
+            'saved_at': time.time(),
+        }, settings.GITHUB_LAST_KNOWN_GOOD_TTL)
+    
+    def _repository_page_params(self, per_page: int, page: int) -> Dict:
+        return {
+            'type': 'public',
+            'sort': 'updated',
+            'direction': 'desc',
+            'per_page': per_page,
+            'page': page
+        }
+    
+    def _fetch_repository_pages(self, per_page: int) -> Tuple[List[List[Dict]], bool]:
+        """
+        Fetch every page of the user's repositories.
+        
+        Page 1 is fetched first; its `Link: rel="last"` header gives the page
+        count, and the remaining pages are fetched concurrently. Pages are
+        returned in page order regardless of completion order.
+        
+        Returns:
+            Tuple of (list of pages, whether any page changed upstream)
+        """
+        endpoint = f"/users/{self.username}/repos"
+        
+        first_page, changed, links = self._request(endpoint, self._repository_page_params(per_page, 1))
+        pages = [first_page]
+        
+        last_page = min(_page_number(links.get('last', {}).get('url')) or 1, settings.GITHUB_MAX_PAGES)
+        if last_page > 1:
+            workers = min(settings.GITHUB_MAX_WORKERS, last_page - 1)
+            # Pool threads don't inherit the caller's call priority
+            level = ratelimit.current_priority()
             
-            # Cache for 2 hours
-            cache.set(cache_key, stats, 7200)
-            logger.info(f"Fetched and cached user statistics")
+            def fetch(page):
+                with ratelimit.priority(level):
+                    return self._request(endpoint, self._repository_page_params(per_page, page))
             
-            return stats
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = executor.map(fetch, range(2, last_page + 1))
+                for data, page_changed, _ in results:
+                    pages.append(data)
+                    changed = changed or page_changed
+        
+        return [page for page in pages if page], changed
+    
+    def _graphql(self, query: str, variables: Dict) -> Dict:
+        """Run a GraphQL query and return its `data` object."""
+        self._check_breaker()
+        self._claim_budget('graphql')
+        response = None
+        try:
+            response = get_client().post(
+                f"{self.BASE_URL}/graphql",
+                headers=self.headers,
+                json={'query': query, 'variables': variables},
+            )
+            ratelimit.record(response)
+            response.raise_for_status()
+            payload = response.json()
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.error(f"GitHub GraphQL request failed: {e}")
+            self._record_failure(response)
+            raise GitHubAPIError(f"Failed to fetch data from GitHub: {str(e)}")
+        
+        get_breaker().record_success()
+        
+        if payload.get('errors'):
+            message = '; '.join(error.get('message', 'unknown error') for error in payload['errors'])
+            logger.error(f"GitHub GraphQL query failed: {message}")
+            raise GitHubAPIError(f"GitHub GraphQL error: {message}")
+        
+        return payload['data']
+    
+    def _fetch_profile_graphql(self, known: Optional[Dict] = None) -> Tuple[Dict, List[Dict]]:
+        """
+        Fetch profile counters and repositories with one GraphQL query per page.
+        
+        Args:
+            known: Stored `(updated_at, pushed_at)` pairs keyed by repository
+                id. When given, paging stops after the first page containing
+                an unchanged repository (pages are ordered by `updated_at`).
+        
+        Returns:
+            Tuple of (user data shaped like the REST `/users/{username}`
+            fields we read, processed repository list)
+        """
+        user_data = {}
+        repos_data = []
+        cursor = None
+        
+        for page in range(settings.GITHUB_MAX_PAGES):
+            data = self._graphql(PROFILE_QUERY, {
+                'login': self.username,
+                'pageSize': 100,
+                'cursor': cursor,
+                'withProfile': page == 0,
+            })
+            
+            page_user, page_repos, page_info = self._parse_graphql_page(data, page == 0)
+            if page == 0:
+                user_data = page_user
+            repos_data.extend(page_repos)
+            
+            if not page_info['hasNextPage']:
+                break
+            if known is not None and _reached_unchanged(page_repos, known):
+                break
+            cursor = page_info['endCursor']
+        
+        # Sort by stars and update date
+        repos_data.sort(key=lambda x: (x['stargazers_count'], x['updated_at']), reverse=True)
+        return user_data, repos_data
+    
+    def _parse_graphql_page(self, data: Dict, with_profile: bool) -> Tuple[Dict, List[Dict], Dict]:
+        """
+        Split one page of PROFILE_QUERY results.
+        
+        Returns:
+            Tuple of (user data, or {} without `with_profile`, processed
+            repositories, `pageInfo` of the repository connection)
+        """
+        user = data.get('user')
+        if user is None:
+            raise GitHubAPIError(f"GitHub user '{self.username}' not found")
+        
+        user_data = {}
+        if with_profile:
+            user_data = {
+                'public_repos': user['publicRepositories']['totalCount'],
+                'followers': user['followers']['totalCount'],
+                'following': user['following']['totalCount'],
+            }
+        
+        connection = user['repositories']
+        page_repos = [self._process_graphql_repository(node) for node in connection['nodes']]
+        return user_data, page_repos, connection['pageInfo']
+    
+    def _process_graphql_repository(self, node: Dict) -> Dict:
+        """Map a GraphQL repository node onto the REST-derived repository shape."""
+        return {
+            'id': node['databaseId'],
+            'name': node['name'],
+            'description': node.get('description') or f"A project by {self.username}",
+            'html_url': node['url'],
+            'homepage': node.get('homepageUrl'),
+            'topics': [topic['topic']['name'] for topic in node['repositoryTopics']['nodes']],
+            'stargazers_count': node['stargazerCount'],
+            'forks_count': node['forkCount'],
+            'language': (node.get('primaryLanguage') or {}).get('name'),
+            'updated_at': node['updatedAt'],
+            'created_at': node['createdAt'],
+            'visibility': node.get('visibility', 'PUBLIC').lower(),
+            'pushed_at': node.get('pushedAt'),
+        }
+    
+    def _process_repository(self, repo: Dict) -> Dict:
+        """Reduce a GitHub repository payload to the fields the API exposes."""
+        return {
+            'id': repo['id'],
+            'name': repo['name'],
+            'description': repo.get('description', '') or f"A project by {self.username}",
+            'html_url': repo['html_url'],
+            'homepage': repo.get('homepage'),
+            'topics': repo.get('topics', []),
+            'stargazers_count': repo['stargazers_count'],
+            'forks_count': repo['forks_count'],
+            'language': repo.get('language'),
+            'updated_at': repo['updated_at'],
+            'created_at': repo['created_at'],
+            'visibility': repo.get('visibility', 'public'),
+            'pushed_at': repo.get('pushed_at'),
+        }
+    
+    def get_user_stats(self) -> Dict:
+        """
+        Fetch user statistics from GitHub API.
+        
+        Returns:
+            Dictionary containing user statistics
+        """
+        if not self.username:
+            raise GitHubAPIError("GitHub username not configured")
+        
+        return swr.get_or_refresh(
+            f"github_stats_{self.username}",
+            ratelimit.prioritized(ratelimit.INTERACTIVE, self._load_user_stats),
+            soft_ttl=self.stats_soft_ttl(),
+            hard_ttl=settings.GITHUB_STATS_HARD_TTL,
+            lock_timeout=settings.GITHUB_REFRESH_LOCK_TTL,
+            refresh_loader=ratelimit.prioritized(ratelimit.REFRESH, self._load_user_stats),
+        )
+    
+    def _load_user_stats(self) -> Dict:
+        """Compute user statistics from stored data, bypassing the stats cache."""
+        try:
+            profile = self._ensure_synced()
+            
+            # Get repositories for language stats
+            return self._compute_user_stats(profile.to_dict(), self.get_repositories())
             
         except Exception as e:
             logger.error(f"Error fetching user stats: {e}")
             raise GitHubAPIError(f"Failed to fetch user statistics: {str(e)}")
     
+    def _compute_user_stats(self, user_data: Dict, repos: List[Dict]) -> Dict:
+        """Build statistics, reusing the previous result if nothing it depends on changed."""
+        repos_snapshot = cache.get(f"github_repos_snapshot_{self.username}")
+        repos_version = repos_snapshot['version'] if repos_snapshot else None
+        
+        languages = None
+        if settings.GITHUB_LANGUAGE_STATS == 'bytes':
+            languages = self._update_languages(repos)
+        languages_version = languages.version if languages else None
+        
+        snapshot_key = f"github_stats_snapshot_{self.username}"
+        snapshot = cache.get(snapshot_key)
+        
+        if (snapshot and repos_version and snapshot['repos_version'] == repos_version
+                and snapshot['profile'] == user_data
+                and snapshot.get('languages_version') == languages_version):
+            logger.info("Profile and repositories unchanged, reusing computed statistics")
+            stats = dict(snapshot['stats'], last_updated=datetime.now().isoformat())
+            # Keep the last-known-good copy alive and dated
+            cache.set(snapshot_key, dict(snapshot, stats=stats), settings.GITHUB_LAST_KNOWN_GOOD_TTL)
+        else:
+            aggregates = self._aggregate_repositories(repos)
+            if languages is not None:
+                aggregates['language_bytes'] = dict(languages.totals)
+                aggregates['language_repos'] = dict(languages.repo_counts)
+            stats = self._format_stats(user_data, aggregates)
+            cache.set(snapshot_key, {
+                'stats': stats,
+                'aggregates': aggregates,
+                'repos_version': repos_version,
+                'languages_version': languages_version,
+                'profile': user_data,
+            }, settings.GITHUB_LAST_KNOWN_GOOD_TTL)
+        
+        logger.info("Computed user statistics")
+        
+        return stats
+    
+    def _load_languages(self) -> LanguageBytes:
+        return LanguageBytes(cache.get(f"github_languages_{self.username}"))
+    
+    def _store_languages(self, languages: LanguageBytes, repos: List[Dict], fetched: Dict[int, Dict[str, int]]):
+        """Merge fetched byte counts into the running totals and save them."""
+        changed = languages.update(repos, fetched)
+        if changed or fetched:
+            cache.set(f"github_languages_{self.username}", languages.state, settings.GITHUB_LAST_KNOWN_GOOD_TTL)
+        if fetched:
+            logger.info(
+                f"Fetched language bytes for {len(fetched)} repositories "
+                f"({'totals changed' if changed else 'totals unchanged'})"
+            )
+    
+    def _update_languages(self, repos: List[Dict]) -> LanguageBytes:
+        """
+        Bring per-repository language byte counts up to date.
+        
+        Only repositories pushed to since their counts were fetched are
+        requested, concurrently through at most GITHUB_MAX_WORKERS threads.
+        """
+        languages = self._load_languages()
+        stale = languages.stale(repos)
+        
+        fetched = {}
+        if stale:
+            workers = min(settings.GITHUB_MAX_WORKERS, len(stale))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for repo, counts in zip(stale, executor.map(self._fetch_languages, stale)):
+                    if counts is not None:
+                        fetched[repo['id']] = counts
+        
+        self._store_languages(languages, repos, fetched)
+        return languages
+    
+    def _languages_endpoint(self, repo: Dict) -> str:
+        return f"/repos/{self.username}/{repo['name']}/languages"
+    
+    def _fetch_languages(self, repo: Dict) -> Optional[Dict[str, int]]:
+        """Byte counts for one repository, or None if they could not be fetched."""
+        # Optional data: never spend budget reserved for visitors and refreshes
+        with ratelimit.priority(ratelimit.PREFETCH):
+            try:
+                data, _, _ = self._request(self._languages_endpoint(repo))
+            except GitHubAPIError as e:
+                logger.warning(f"Could not fetch languages for {repo['name']}: {e}")
+                return None
+        return data
+    
+    def _readmes_key(self) -> str:
+        """Cache key of the `{repo id: {'pushed_at', 'sha'}}` README entries."""
+        return f"github_readmes_{self.username}"
+    
+    def _readme_html_key(self, repo_id: int, sha: str) -> str:
+        """Rendered README of one repository, addressed by the README blob SHA."""
+        return f"github_readme_{repo_id}_{sha}"
+    
+    def _readme_endpoint(self, repo: Dict) -> str:
+        return f"/repos/{self.username}/{repo['name']}/readme"
+    
+    def _readme_context(self, repo: Dict) -> str:
+        """Repository that issue and commit references in the README resolve against."""
+        return f"{self.username}/{repo['name']}"
+    
+    def get_readme(self, repo: Dict, fetch: bool = True) -> Optional[Dict]:
+        """
+        Rendered README of a repository, from the cache.
+        
+        READMEs are prefetched during sync, so GitHub is only called for a
+        repository that has never been fetched (e.g. before the first sync)
+        or whose rendering has expired. A README changed by a newer push is
+        served until the next sync renders it.
+        
+        Args:
+            repo: Processed repository dictionary
+            fetch: Whether a missing README may be fetched from GitHub
+        
+        Returns:
+            `{'sha', 'html'}`, or None if the repository has no README or it
+            is not available
+        """
+        entry = (cache.get(self._readmes_key()) or {}).get(repo['id'])
+        html = None
+        if entry is not None and entry['sha']:
+            html = cache.get(self._readme_html_key(repo['id'], entry['sha']))
+        
+        if fetch and (entry is None or (entry['sha'] and html is None)):
+            entry = self._fetch_readme(repo, ratelimit.INTERACTIVE)
+            if entry is not None:
+                entries = cache.get(self._readmes_key()) or {}
+                entries[repo['id']] = entry
+                cache.set(self._readmes_key(), entries, settings.GITHUB_LAST_KNOWN_GOOD_TTL)
+                if entry['sha']:
+                    html = cache.get(self._readme_html_key(repo['id'], entry['sha']))
+        
+        if entry is None or html is None:
+            return None
+        return {'sha': entry['sha'], 'html': html}
+    
+    def prefetch_readmes(self, repos: List[Dict]) -> int:
+        """
+        Fetch and render the READMEs that may have changed since the last prefetch.
+        
+        A README only changes with a push, so repositories whose `pushed_at`
+        matches their stored entry are skipped without a request. The others
+        get a conditional request for `/readme`; an unchanged README answers
+        `304` and is not rendered again, since renderings are addressed by the
+        README blob SHA. Requests run at prefetch priority, through at most
+        GITHUB_MAX_WORKERS threads.
+        
+        Returns:
+            Number of repositories checked upstream
+        """
+        entries = cache.get(self._readmes_key()) or {}
+        stale = self._stale_readmes(repos, entries)
+        
+        fetched = {}
+        if stale:
+            workers = min(settings.GITHUB_MAX_WORKERS, len(stale))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for repo, entry in zip(stale, executor.map(self._fetch_readme, stale)):
+                    if entry is not None:
+                        fetched[repo['id']] = entry
+        
+        self._store_readmes(entries, repos, fetched)
+        if stale:
+            logger.info(f"Checked READMEs of {len(stale)} repositories ({len(fetched)} available)")
+        return len(stale)
+    
+    def _stale_readmes(self, repos: List[Dict], entries: Dict) -> List[Dict]:
+        """
+        Repositories pushed to since their README entry, or whose rendering is gone.
+        
+        Touching the renderings of the others keeps them cached for as long
+        as their repository is listed.
+        """
+        stale = []
+        for repo in repos:
+            entry = entries.get(repo['id'])
+            if entry is None or entry['pushed_at'] != repo['pushed_at']:
+                stale.append(repo)
+            elif entry['sha'] and not cache.touch(
+                self._readme_html_key(repo['id'], entry['sha']), settings.GITHUB_LAST_KNOWN_GOOD_TTL
+            ):
+                stale.append(repo)
+        return stale
+    
+    def _store_readmes(self, entries: Dict, repos: List[Dict], fetched: Dict[int, Dict]):
+        """Save README entries, dropping repositories no longer listed."""
+        listed = {repo['id'] for repo in repos}
+        entries = {repo_id: entry for repo_id, entry in entries.items() if repo_id in listed}
+        entries.update(fetched)
+        cache.set(self._readmes_key(), entries, settings.GITHUB_LAST_KNOWN_GOOD_TTL)
+    
+    def _fetch_readme(self, repo: Dict, level: str = ratelimit.PREFETCH) -> Optional[Dict]:
+        """
+        Fetch one repository's README and render it unless that SHA already is.
+        
+        Returns:
+            The `{'pushed_at', 'sha'}` entry (`sha` is None without a
+            README), or None if it could not be fetched
+        """
+        with ratelimit.priority(level):
+            try:
+                data, _, _ = self._request(self._readme_endpoint(repo))
+                if not self._has_rendered_readme(repo, data):
+                    html = self._render_markdown(_readme_text(data), self._readme_context(repo))
+                    self._store_rendered_readme(repo, data, html)
+            except GitHubNotFoundError:
+                return {'pushed_at': repo['pushed_at'], 'sha': None}
+            except GitHubAPIError as e:
+                logger.warning(f"Could not fetch README for {repo['name']}: {e}")
+                return None
+        
+        return {'pushed_at': repo['pushed_at'], 'sha': data['sha']}
+    
+    def _has_rendered_readme(self, repo: Dict, data: Dict) -> bool:
+        return cache.touch(self._readme_html_key(repo['id'], data['sha']), settings.GITHUB_LAST_KNOWN_GOOD_TTL)
+    
+    def _store_rendered_readme(self, repo: Dict, data: Dict, html: str):
+        """Sanitize rendered README HTML and cache it under its blob SHA."""
+        cache.set(
+            self._readme_html_key(repo['id'], data['sha']),
+            sanitize_html(html, link_base=data.get('html_url'), image_base=data.get('download_url')),
+            settings.GITHUB_LAST_KNOWN_GOOD_TTL,
+        )
+    
+    def _render_markdown(self, text: str, context: str) -> str:
+        """Render GitHub Flavored Markdown to HTML with GitHub's `/markdown` endpoint."""
+        self._check_breaker()
+        self._claim_budget('core')
+        response = None
+        try:
+            response = get_client().post(
+                f"{self.BASE_URL}/markdown",
+                headers=self.headers,
+                json={'text': text, 'mode': 'gfm', 'context': context},
+            )
+            ratelimit.record(response)
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            logger.error(f"GitHub markdown rendering failed: {e}")
+            self._record_failure(response)
+            raise GitHubAPIError(f"Failed to render markdown on GitHub: {str(e)}")
+        
+        get_breaker().record_success()
+        return response.text
+    
+    def _aggregate_repositories(self, repos: List[Dict]) -> Dict:
+        """Compute the additive totals statistics are derived from."""
+        # Language statistics
+        language_counts = {}
+        for repo in repos:
+            if repo['language']:
+                language_counts[repo['language']] = language_counts.get(repo['language'], 0) + 1
+        
+        return {
+            'total_repos': len(repos),
+            'total_stars': sum(repo['stargazers_count'] for repo in repos),
+            'total_forks': sum(repo['forks_count'] for repo in repos),
+            'language_counts': language_counts,
+        }
+    
+    def _format_stats(self, user_data: Dict, aggregates: Dict) -> Dict:
+        """
+        Turn aggregate totals into the statistics payload.
+        
+        With language byte totals, percentages are shares of code size and
+        `count` is the number of repositories containing the language;
+        otherwise both come from each repository's primary language.
+        """
+        language_counts = aggregates['language_counts']
+        language_weights = language_counts
+        if aggregates.get('language_bytes'):
+            language_counts = aggregates['language_repos']
+            language_weights = aggregates['language_bytes']
+        total_repos = aggregates['total_repos']
+        
+        # Calculate language percentages and assign colors
+        total_weight = sum(language_weights.values())
+        
+        languages = []
+        for lang, weight in sorted(language_weights.items(), key=lambda x: (-x[1], x[0])):
+            if total_weight > 0:
+                percentage = (weight / total_weight) * 100
+                languages.append({
+                    'name': lang,
+                    'count': language_counts[lang],
+                    'percentage': round(percentage, 1),
+                    'color': LANGUAGE_COLORS.get(lang, '#586069')
+                })
+        
+        return {
+            'total_repos': total_repos,
+            'total_stars': aggregates['total_stars'],
+            'total_forks': aggregates['total_forks'],
+            'public_repos': user_data.get('public_repos', total_repos),
+            'followers': user_data.get('followers', 0),
+            'following': user_data.get('following', 0),
+            'languages': languages[:10],  # Top 10 languages
+            'last_updated': datetime.now().isoformat(),
+        }
+    
+    def sync(self, full: bool = False) -> Dict:
+        """
+        Sync the database from GitHub and write fresh data to the cache.
+        
+        Unlike `get_repositories`/`get_user_stats` this ignores freshness and
+        always revalidates upstream. Delta syncs and conditional requests keep
+        an unchanged profile down to a couple of 304s.
+        
+        Args:
+            full: Fetch every repository page instead of only changed ones
+            
+        Returns:
+            Dictionary with the repositories, statistics and whether the
+            repository data changed
+        """
+        if not self.username:
+            raise GitHubAPIError("GitHub username not configured")
+        
+        changed = self.sync_database(full=full)
+        
+        repos = self._load_repositories()
+        swr.store(
+            f"github_repos_{self.username}", repos,
+            self.repos_soft_ttl(), settings.GITHUB_REPOS_HARD_TTL,
+        )
+        
+        stats = self._load_user_stats()
+        swr.store(
+            f"github_stats_{self.username}", stats,
+            self.stats_soft_ttl(), settings.GITHUB_STATS_HARD_TTL,
+        )
+        
+        if settings.GITHUB_PREFETCH_READMES:
+            # Detail pages then never wait on GitHub
+            self.prefetch_readmes(repos)
+        
+        return {
+            'repositories': repos,
+            'stats': stats,
+            'changed': changed,
+        }
+    
+    def apply_repository_change(self, repo_id: int, repository: Optional[Dict] = None):
+        """
+        Patch a single repository into stored and cached data.
+        
+        Used by the webhook receiver. The database row, the cached repository
+        list and the statistics aggregates are updated in place, so no other
+        repository needs to be fetched or re-processed.
+        
+        Args:
+            repo_id: GitHub repository id
+            repository: Processed repository dictionary, or None to remove it
+        """
+        lock_key = f"github_patch_lock_{self.username}"
+        deadline = time.time() + settings.GITHUB_REFRESH_LOCK_TTL
+        while not cache.add(lock_key, True, settings.GITHUB_REFRESH_LOCK_TTL):
+            if time.time() > deadline:
+                raise GitHubAPIError("Timed out waiting for concurrent repository update")
+            time.sleep(0.05)
+        
+        try:
+            with transaction.atomic():
+                if repository is not None:
+                    self._upsert_repositories([repository])
+                else:
+                    GitHubRepository.objects.filter(github_id=repo_id).delete()
+            
+            self._patch_cached_repository(repo_id, repository)
+        finally:
+            cache.delete(lock_key)
+    
+    def _patch_cached_repository(self, repo_id: int, repository: Optional[Dict]):
+        repos_key = f"github_repos_{self.username}"
+        stats_key = f"github_stats_{self.username}"
+        
+        repos_snapshot = cache.get(f"github_repos_snapshot_{self.username}")
+        if not repos_snapshot:
+            # Nothing to patch; the next load rebuilds from the database
+            swr.delete(repos_key)
+            swr.delete(stats_key)
+            return
+        
+        repos = [repo for repo in repos_snapshot['repos'] if repo['id'] != repo_id]
+        previous = next((repo for repo in repos_snapshot['repos'] if repo['id'] == repo_id), None)
+        if repository is not None:
+            repos.append(repository)
+        
+        # Sort by stars and update date
+        repos.sort(key=lambda x: (x['stargazers_count'], x['updated_at']), reverse=True)
+        self._update_repository_snapshot(repos)
+        swr.store(repos_key, repos, self.repos_soft_ttl(), settings.GITHUB_REPOS_HARD_TTL)
+        
+        stats_snapshot = cache.get(f"github_stats_snapshot_{self.username}")
+        if (not stats_snapshot or 'aggregates' not in stats_snapshot
+                or stats_snapshot['repos_version'] != repos_snapshot['version']):
+            swr.delete(stats_key)
+            return
+        
+        aggregates = _apply_aggregate_delta(stats_snapshot['aggregates'], previous, repository)
+        languages_version = stats_snapshot.get('languages_version')
+        if settings.GITHUB_LANGUAGE_STATS == 'bytes':
+            languages = self._load_languages()
+            if repository is not None and languages.stale([repository]):
+                # Byte counts for this push are not known yet; the next load fetches them
+                swr.delete(stats_key)
+                return
+            # Drops a deleted repository's counts from the totals
+            self._store_languages(languages, repos, {})
+            aggregates['language_bytes'] = dict(languages.totals)
+            aggregates['language_repos'] = dict(languages.repo_counts)
+            languages_version = languages.version
+        
+        stats = self._format_stats(stats_snapshot['profile'], aggregates)
+        cache.set(f"github_stats_snapshot_{self.username}", dict(
+            stats_snapshot,
+            stats=stats,
+            aggregates=aggregates,
+            repos_version=cache.get(f"github_repos_snapshot_{self.username}")['version'],
+            languages_version=languages_version,
+        ), settings.GITHUB_LAST_KNOWN_GOOD_TTL)
+        swr.store(stats_key, stats, self.stats_soft_ttl(), settings.GITHUB_STATS_HARD_TTL)
+    
+    def last_known_repositories(self) -> Optional[Dict]:
+        """
+        Last-known-good repository list, read from the cache only.
+        
+        Returns:
+            The snapshot (`repos`, `version`, `saved_at`), or None if there is none
+        """
+        return cache.get(f"github_repos_snapshot_{self.username}")
+    
+    def last_known_stats(self) -> Optional[Dict]:
+        """Last-known-good statistics, read from the cache only, or None."""
+        snapshot = cache.get(f"github_stats_snapshot_{self.username}")
+        return snapshot['stats'] if snapshot else None
+    
     def clear_cache(self):
         """Clear all GitHub-related cache."""
-        cache.delete(f"github_repos_{self.username}")
-        cache.delete(f"github_stats_{self.username}")
+        swr.delete(f"github_repos_{self.username}")
+        swr.delete(f"github_stats_{self.username}")
         logger.info("GitHub cache cleared")
\ No newline at end of file
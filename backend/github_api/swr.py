@@ -0,0 +1,182 @@
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+# How often a request waiting on another worker's fill re-checks the cache
+WAIT_POLL_INTERVAL = 0.1
+
+# Running background refresh tasks; the event loop only keeps weak references
+_refresh_tasks = set()
+
+def _lock_key(key: str) -> str:
+    return f"{key}_refresh_lock"
+
+def _meta_key(key: str) -> str:
+    return f"{key}_meta"
+
+def store(key: str, value: Any, soft_ttl: int, hard_ttl: int):
+    """
+    Cache a value for stale-while-revalidate reads.
+
+    The value is served as fresh for `soft_ttl` seconds and kept, as stale,
+    until `hard_ttl` seconds have passed. Every store also records a new
+    version in a small metadata entry (see `get_meta`).
+    """
+    fresh_until = time.time() + soft_ttl
+    cache.set(key, {
+        'value': value,
+        'fresh_until': fresh_until,
+    }, hard_ttl)
+    cache.set(_meta_key(key), {
+        'version': uuid.uuid4().hex,
+        'fresh_until': fresh_until,
+    }, hard_ttl)
+
+def delete(key: str):
+    """Drop a stored value together with its metadata."""
+    cache.delete(key)
+    cache.delete(_meta_key(key))
+
+def get_meta(key: str) -> Optional[Dict]:
+    """
+    Return `{'version', 'fresh_until'}` for a stored value without loading it.
+
+    Lets callers that cache data derived from the value check it is still
+    current without unpickling the value itself.
+    """
+    return cache.get(_meta_key(key))
+
+def get_or_refresh(
+    key: str,
+    loader: Callable[[], Any],
+    soft_ttl: int,
+    hard_ttl: int,
+    lock_timeout: int = 60,
+    refresh_loader: Optional[Callable[[], Any]] = None,
+) -> Any:
+    """
+    Return the cached value for `key`, refreshing it with `loader` as needed.
+
+    - Fresh hit: returned as-is.
+    - Stale hit: returned immediately; one background refresh is started
+      by whichever caller wins the refresh lock. It uses `refresh_loader`
+      if given, e.g. to load at a lower priority than callers waiting on a
+      miss.
+    - Miss: the lock winner loads synchronously while other callers wait
+      for its result, falling back to loading themselves if it never lands.
+
+    The lock is taken with `cache.add`, so it coordinates across workers
+    whenever the cache backend is shared between them.
+    """
+    entry = cache.get(key)
+
+    if entry is not None:
+        if entry['fresh_until'] <= time.time() and cache.add(_lock_key(key), True, lock_timeout):
+            logger.info(f"Serving stale '{key}' while refreshing in the background")
+            threading.Thread(
+                target=_refresh_in_background,
+                args=(key, refresh_loader or loader, soft_ttl, hard_ttl),
+                daemon=True,
+            ).start()
+        return entry['value']
+
+    if cache.add(_lock_key(key), True, lock_timeout):
+        try:
+            value = loader()
+            store(key, value, soft_ttl, hard_ttl)
+            return value
+        finally:
+            cache.delete(_lock_key(key))
+
+    # Another caller is filling the cache; wait for its result
+    deadline = time.time() + lock_timeout
+    while time.time() < deadline:
+        time.sleep(WAIT_POLL_INTERVAL)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry['value']
+        if cache.get(_lock_key(key)) is None:
+            break
+
+    value = loader()
+    store(key, value, soft_ttl, hard_ttl)
+    return value
+
+def _refresh_in_background(key: str, loader: Callable[[], Any], soft_ttl: int, hard_ttl: int):
+    try:
+        store(key, loader(), soft_ttl, hard_ttl)
+    except Exception as e:
+        # Keep serving the stale value; the next stale read retries
+        logger.error(f"Background refresh of '{key}' failed: {e}")
+    finally:
+        cache.delete(_lock_key(key))
+        connections.close_all()
+
+async def astore(key: str, value: Any, soft_ttl: int, hard_ttl: int):
+    """Async version of `store`."""
+    await sync_to_async(store, thread_sensitive=False)(key, value, soft_ttl, hard_ttl)
+
+async def aget_or_refresh(
+    key: str,
+    loader: Callable[[], Awaitable[Any]],
+    soft_ttl: int,
+    hard_ttl: int,
+    lock_timeout: int = 60,
+    refresh_loader: Optional[Callable[[], Awaitable[Any]]] = None,
+) -> Any:
+    """
+    Async version of `get_or_refresh` for coroutine loaders.
+
+    Uses the same cache entries and refresh lock, so sync and async callers
+    share the single-flight behaviour. Background refreshes run as tasks on
+    the current event loop, and waiting callers poll without blocking it.
+    """
+    entry = await cache.aget(key)
+
+    if entry is not None:
+        if entry['fresh_until'] <= time.time() and await cache.aadd(_lock_key(key), True, lock_timeout):
+            logger.info(f"Serving stale '{key}' while refreshing in the background")
+            task = asyncio.ensure_future(_arefresh_in_background(key, refresh_loader or loader, soft_ttl, hard_ttl))
+            _refresh_tasks.add(task)
+            task.add_done_callback(_refresh_tasks.discard)
+        return entry['value']
+
+    if await cache.aadd(_lock_key(key), True, lock_timeout):
+        try:
+            value = await loader()
+            await astore(key, value, soft_ttl, hard_ttl)
+            return value
+        finally:
+            await cache.adelete(_lock_key(key))
+
+    # Another caller is filling the cache; wait for its result
+    deadline = time.time() + lock_timeout
+    while time.time() < deadline:
+        await asyncio.sleep(WAIT_POLL_INTERVAL)
+        entry = await cache.aget(key)
+        if entry is not None:
+            return entry['value']
+        if await cache.aget(_lock_key(key)) is None:
+            break
+
+    value = await loader()
+    await astore(key, value, soft_ttl, hard_ttl)
+    return value
+
+async def _arefresh_in_background(key: str, loader: Callable[[], Awaitable[Any]], soft_ttl: int, hard_ttl: int):
+    try:
+        await astore(key, await loader(), soft_ttl, hard_ttl)
+    except Exception as e:
+        # Keep serving the stale value; the next stale read retries
+        logger.error(f"Background refresh of '{key}' failed: {e}")
+    finally:
+        await cache.adelete(_lock_key(key))
@@ -0,0 +1,175 @@
+"""
+Scheduled refresh of GitHub data, outside the request path.
+
+`sync_all` runs `GitHubService.sync` for every configured profile so the
+cache is refreshed before its soft TTL runs out and requests almost never
+have to wait on GitHub. It is run by `BackgroundSync`, a thread in each web
+worker, and by `manage.py github_sync` for cron or manual runs.
+
+The refresh has to run where the web workers read the cache. With the
+default SQLite cache backends that is a file local to the host, and
+platforms such as Heroku and Railway give every Procfile process its own
+container and filesystem, so a separate worker process would warm a cache
+that no web worker ever reads.
+"""
+
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+from . import ratelimit
+from .models import GitHubProfile
+from .profiles import configured_profiles
+from .services import CircuitOpenError, GitHubAPIError, GitHubService, RateLimitBudgetError
+
+logger = logging.getLogger(__name__)
+
+# Held for one interval by the worker that runs a scheduled sync
+SYNC_DUE_KEY = 'github_sync_due'
+
+def next_delay(interval: int, jitter: float) -> float:
+    """Seconds until the next sync, stretched with the TTLs while the rate limit budget runs low."""
+    base = ratelimit.adaptive_ttl(interval, GitHubService().rate_limit_resource)
+    return base * (1 + random.uniform(-jitter, jitter))
+
+def sync_all(full: bool = False, usernames: Optional[List[str]] = None):
+    """
+    Sync every profile once, GITHUB_SYNC_WORKERS at a time.
+
+    Profiles synced longest ago go first. All of them share the client's
+    connection pool and the rate limit budget; once the budget (or the
+    circuit breaker) refuses a call, the profiles not yet started are
+    skipped until the next run instead of each failing on its own.
+    """
+    usernames = schedule(usernames or configured_profiles())
+    if not usernames:
+        logger.error("GitHub sync skipped: no GitHub profiles configured")
+        return
+
+    started = time.monotonic()
+    halted = threading.Event()
+
+    def run(username):
+        if halted.is_set():
+            return 'skipped'
+        try:
+            return sync_profile(username, full)
+        except (RateLimitBudgetError, CircuitOpenError) as e:
+            halted.set()
+            logger.warning(f"GitHub sync of '{username}' refused, skipping remaining profiles: {e}")
+            return 'failed'
+        finally:
+            # Pool threads each opened their own database connection
+            connections.close_all()
+
+    workers = min(settings.GITHUB_SYNC_WORKERS, len(usernames))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='github-sync') as executor:
+        outcomes = list(executor.map(run, usernames))
+
+    counts = {outcome: outcomes.count(outcome) for outcome in set(outcomes)}
+    logger.info(
+        f"GitHub sync of {len(usernames)} profiles finished in {time.monotonic() - started:.2f}s: "
+        + ', '.join(f"{count} {outcome}" for outcome, count in sorted(counts.items()))
+    )
+
+def schedule(usernames: List[str]) -> List[str]:
+    """Order profiles never synced first, then by how long ago they were synced."""
+    synced_at = dict(
+        GitHubProfile.objects.filter(username__in=usernames).values_list('username', 'synced_at')
+    )
+    never = [username for username in usernames if username not in synced_at]
+    return never + sorted(synced_at, key=synced_at.get)
+
+def sync_profile(username: str, full: bool = False) -> str:
+    """
+    Sync one profile.
+
+    Returns:
+        'changed', 'unchanged' or 'failed'
+
+    Raises:
+        RateLimitBudgetError, CircuitOpenError: When GitHub calls are being refused
+    """
+    started = time.monotonic()
+
+    try:
+        result = GitHubService(username).sync(full=full)
+    except (RateLimitBudgetError, CircuitOpenError):
+        raise
+    except GitHubAPIError as e:
+        # Keep the loop alive; the cached data stays until its hard TTL
+        logger.error(f"GitHub sync of '{username}' failed: {e}")
+        return 'failed'
+    except Exception:
+        logger.exception(f"Unexpected error during GitHub sync of '{username}'")
+        return 'failed'
+
+    elapsed = time.monotonic() - started
+    if result['changed']:
+        logger.info(
+            f"GitHub sync of '{username}' stored {len(result['repositories'])} repositories in {elapsed:.2f}s"
+        )
+        return 'changed'
+
+    logger.info(
+        f"GitHub data of '{username}' unchanged upstream, cache refreshed from the database ({elapsed:.2f}s)"
+    )
+    return 'unchanged'
+
+class BackgroundSync:
+    """
+    Runs `sync_all` on a schedule from a background thread.
+
+    Every web worker runs one, started by its first request. They share the
+    host's cache, and a sync is due whenever `SYNC_DUE_KEY` is missing: the
+    first worker to claim the key with `cache.add` syncs, and the key's
+    timeout is the delay until the next sync. The other workers only check
+    the key every `check_interval` seconds.
+    """
+
+    def __init__(self, interval: int, jitter: float, check_interval: float):
+        self.interval = interval
+        self.jitter = jitter
+        self.check_interval = check_interval
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Start the sync thread if it is not running."""
+        if self._thread is None or not self._thread.is_alive():
+            with self._lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = threading.Thread(target=self._run, name='github-sync', daemon=True)
+                    self._thread.start()
+
+    def _run(self):
+        while True:
+            try:
+                if cache.add(SYNC_DUE_KEY, os.getpid(), next_delay(self.interval, self.jitter)):
+                    sync_all()
+            except Exception:
+                logger.exception("Background GitHub sync failed")
+            finally:
+                connections.close_all()
+            time.sleep(self.check_interval)
+
+_background_sync: Optional[BackgroundSync] = None
+
+def get_background_sync() -> BackgroundSync:
+    global _background_sync
+
+    if _background_sync is None:
+        _background_sync = BackgroundSync(
+            settings.GITHUB_SYNC_INTERVAL,
+            settings.GITHUB_SYNC_JITTER,
+            min(60, settings.GITHUB_SYNC_INTERVAL),
+        )
+    return _background_sync
@@ -0,0 +1,118 @@
+from django.test import SimpleTestCase
+
+from .readme import sanitize_html
+
+class SanitizeHtmlTests(SimpleTestCase):
+    """README HTML comes from outside the site, so every bypass here is an XSS."""
+
+    def test_keeps_allowed_markup(self):
+        html = '<h1 id="user-content-title">Title</h1><p>Some <strong>bold</strong> text</p>'
+        self.assertEqual(sanitize_html(html), html)
+
+    def test_escapes_text(self):
+        self.assertEqual(sanitize_html('<p>a &lt;b&gt; &amp; c</p>'), '<p>a &lt;b&gt; &amp; c</p>')
+
+    def test_drops_disallowed_attributes(self):
+        self.assertEqual(
+            sanitize_html('<p onclick="alert(1)" style="color: red" id="main">x</p>'),
+            '<p>x</p>',
+        )
+
+    def test_drops_containers_with_their_content(self):
+        for tag in ('script', 'style', 'iframe', 'object', 'noscript', 'template', 'textarea',
+                    'select', 'button', 'form', 'title', 'svg', 'math'):
+            with self.subTest(tag=tag):
+                html = f'<p>a</p><{tag}><p>hidden</p>alert(1)</{tag}><p>b</p>'
+                self.assertEqual(sanitize_html(html), '<p>a</p><p>b</p>')
+
+    def test_nested_dropped_containers(self):
+        html = '<form><svg><script>alert(1)</script></svg><p>hidden</p></form><p>rest</p>'
+        self.assertEqual(sanitize_html(html), '<p>rest</p>')
+
+    def test_void_elements_do_not_swallow_what_follows(self):
+        for html in ('<p>a</p><embed src=x><p>rest</p>', '<p>a</p><frame src=x><p>rest</p>',
+                     '<p>a</p><embed src=x /><p>rest</p>', '<p>a</p><input value=x><p>rest</p>'):
+            with self.subTest(html=html):
+                self.assertEqual(sanitize_html(html), '<p>a</p><p>rest</p>')
+
+    def test_unbalanced_end_tags(self):
+        self.assertEqual(sanitize_html('</script></div><p>a</p></p></svg><p>b</p>'), '<p>a</p><p>b</p>')
+
+    def test_closes_tags_left_open(self):
+        self.assertEqual(sanitize_html('<ul><li><em>a</ul><p>b'), '<ul><li><em>a</em></li></ul><p>b</p>')
+
+    def test_rejects_script_urls(self):
+        for href in (
+            'javascript:alert(1)',
+            'JavaScript:alert(1)',
+            '  javascript:alert(1)',
+            'java\tscript:alert(1)',
+            'java\nscript:alert(1)',
+            '\x01javascript:alert(1)',
+            'jav&#x61;script:alert(1)',
+            'jav&#97;script:alert(1)',
+            '&#106;&#97;&#118;&#97;&#115;&#99;&#114;&#105;&#112;&#116;&#58;alert(1)',
+            'javascript&colon;alert(1)',
+            'java&Tab;script:alert(1)',
+            'java&#x09;script:alert(1)',
+            'vbscript:msgbox(1)',
+            'data:text/html;base64,PHNjcmlwdD5hbGVydCgxKTwvc2NyaXB0Pg==',
+        ):
+            with self.subTest(href=href):
+                self.assertEqual(sanitize_html(f'<a href="{href}">x</a>'), '<a>x</a>')
+                self.assertEqual(sanitize_html(f'<img src="{href}">'), '<img>')
+
+    def test_allows_safe_urls(self):
+        self.assertEqual(
+            sanitize_html('<a href="https://example.com/a">x</a>'),
+            '<a href="https://example.com/a" rel="nofollow noopener">x</a>',
+        )
+        self.assertEqual(
+            sanitize_html('<a href="mailto:me@example.com">x</a>'),
+            '<a href="mailto:me@example.com" rel="nofollow noopener">x</a>',
+        )
+        self.assertEqual(
+            sanitize_html('<a href="#user-content-usage">x</a>', link_base='https://github.com/u/r/blob/main/README.md'),
+            '<a href="#user-content-usage" rel="nofollow noopener">x</a>',
+        )
+
+    def test_resolves_relative_urls(self):
+        html = '<a href="docs/a.md">docs</a><img src="img/logo.png">'
+        self.assertEqual(
+            sanitize_html(
+                html,
+                link_base='https://github.com/u/r/blob/main/README.md',
+                image_base='https://raw.githubusercontent.com/u/r/main/README.md',
+            ),
+            '<a href="https://github.com/u/r/blob/main/docs/a.md" rel="nofollow noopener">docs</a>'
+            '<img src="https://raw.githubusercontent.com/u/r/main/img/logo.png">',
+        )
+
+    def test_srcset(self):
+        self.assertEqual(
+            sanitize_html(
+                '<picture><source srcset="dark.png 1x, https://cdn.example.com/dark@2x.png 2x"></picture>',
+                image_base='https://raw.githubusercontent.com/u/r/main/README.md',
+            ),
+            '<picture><source srcset="https://raw.githubusercontent.com/u/r/main/dark.png 1x, '
+            'https://cdn.example.com/dark@2x.png 2x"></picture>',
+        )
+
+    def test_srcset_with_a_script_candidate_is_dropped(self):
+        for srcset in ('https://a.example/x.png 1x, javascript:alert(1) 2x',
+                       'https://a.example/x.png 1x, jav&#x61;script:alert(1) 2x',
+                       'java\tscript:alert(1)'):
+            with self.subTest(srcset=srcset):
+                self.assertEqual(
+                    sanitize_html(f'<picture><source srcset="{srcset}"></picture>'),
+                    '<picture><source></picture>',
+                )
+
+    def test_escapes_attribute_values(self):
+        self.assertEqual(
+            sanitize_html('<img alt="&quot; onerror=&quot;alert(1)">'),
+            '<img alt="&quot; onerror=&quot;alert(1)">',
+        )
+
+    def test_only_prefixed_ids(self):
+        self.assertEqual(sanitize_html('<h2 id="root">a</h2>'), '<h2>a</h2>')
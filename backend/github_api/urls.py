@@ -1,9 +1,23 @@
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import async_views, views
+
+# The async views only help when served by an ASGI server
+api_views = async_views if settings.GITHUB_ASYNC_VIEWS else views
 
 urlpatterns = [
-    path('repos/', views.get_repositories, name='github-repositories'),
-    path('stats/', views.get_github_stats, name='github-stats'),
-    path('refresh/', views.refresh_cache, name='github-refresh-cache'),
-    path('health/', views.health_check, name='github-health-check'),
-]
\ No newline at end of file
+    path('repos/', api_views.get_repositories, name='github-repositories'),
+    path('repos/<str:name>/', views.get_repository, name='github-repository'),
+    path('search/', views.search_repositories, name='github-search'),
+    path('stats/', api_views.get_github_stats, name='github-stats'),
+    path('refresh/', api_views.refresh_cache, name='github-refresh-cache'),
+    path('health/', api_views.health_check, name='github-health-check'),
+    path('rate-limit/', views.rate_limit_status, name='github-rate-limit'),
+    path('webhook/', views.github_webhook, name='github-webhook'),
+    # The same data for any profile in GITHUB_PROFILES
+    path('<str:username>/repos/', api_views.get_repositories, name='github-profile-repositories'),
+    path('<str:username>/repos/<str:name>/', views.get_repository, name='github-profile-repository'),
+    path('<str:username>/search/', views.search_repositories, name='github-profile-search'),
+    path('<str:username>/stats/', api_views.get_github_stats, name='github-profile-stats'),
+    path('<str:username>/refresh/', api_views.refresh_cache, name='github-profile-refresh-cache'),
+]
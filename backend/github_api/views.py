@@ -1,19 +1,37 @@
 import logging
 from datetime import datetime
+from typing import Dict, Optional
 from rest_framework import status
 from rest_framework.decorators import api_view, throttle_classes
 from rest_framework.response import Response
 from rest_framework.throttling import UserRateThrottle, AnonRateThrottle
-from django.views.decorators.cache import cache_page
-from django.utils.decorators import method_decorator
-from django.views.decorators.vary import vary_on_headers
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
 
-from .services import GitHubService, GitHubAPIError
-from .serializers import (
-    RepositorySerializer, 
-    GitHubStatsSerializer, 
-    ErrorResponseSerializer
+from core.http_cache import cached_response
+
+from . import ratelimit
+from .breaker import OPEN, get_breaker
+from .encoders import encode_repositories, render_json
+from .indexes import DIRECTIONS, SORT_KEYS, InvalidCursor, get_repository_index
+from .models import format_github_datetime
+from .payloads import (
+    encode_search_results,
+    repositories_payload,
+    repository_detail,
+    stale_repositories_payload,
+    stale_repository_detail_payload,
+    stale_search_payload,
+    stale_stats_payload,
+    stats_payload,
 )
+from .profiles import resolve_profile
+from .search import get_search_index
+from .services import GitHubService, GitHubAPIError
+from .webhooks import handle_event, verify_signature
+from .serializers import ErrorResponseSerializer
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +39,13 @@ class GitHubRateThrottle(AnonRateThrottle):
     """Custom throttle for GitHub API endpoints."""
     rate = '30/hour'
 
+# Error contexts, shared with the async views so both return the same error bodies
+FETCH_REPOSITORIES = 'fetching repositories'
+FETCH_REPOSITORY = 'fetching repository'
+SEARCH_REPOSITORIES = 'searching repositories'
+FETCH_STATS = 'fetching GitHub statistics'
+REFRESH_CACHE = 'refreshing cache'
+
 def handle_github_error(error: Exception, context: str) -> Response:
     """Helper function to handle GitHub API errors consistently."""
     
@@ -38,98 +63,346 @@ def handle_github_error(error: Exception, context: str) -> Response:
         error_data['status_code'] = status.HTTP_500_INTERNAL_SERVER_ERROR
         return Response(error_data, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+def unknown_profile_response(username: str) -> Response:
+    """404 for a username that is not one of the configured profiles."""
+    return Response({
+        'success': False,
+        'message': f"Unknown GitHub profile '{username}'",
+        'timestamp': datetime.now().isoformat()
+    }, status=status.HTTP_404_NOT_FOUND)
+
+def last_known_good(build) -> Optional[Dict]:
+    """
+    Build fallback response data from last-known-good snapshots.
+    
+    Args:
+        build: Callable returning the data, or None if nothing is stored
+    
+    Returns:
+        The data, or None if there is none or it cannot be built
+    """
+    try:
+        return build()
+    except Exception as e:
+        logger.error(f"Last-known-good data unavailable: {e}")
+        return None
+
+def stale_response(data: Dict) -> HttpResponse:
+    """
+    Serve last-known-good data in place of an upstream error.
+    
+    Besides `stale: true` in the body, the response carries a `Warning`
+    header, which keeps `cached_response` from storing it, and `no-cache`,
+    so clients and CDNs go back to the API once GitHub recovers.
+    """
+    response = HttpResponse(render_json(data), content_type='application/json')
+    response['Warning'] = '110 - "Response is Stale"'
+    response['Cache-Control'] = 'no-cache'
+    return response
+
+# Query parameters that need the repository index rather than a prebuilt payload
+INDEX_QUERY_PARAMS = ('language', 'topic', 'min_stars', 'updated_since', 'sort', 'order', 'cursor')
+
+def parse_repository_query(params) -> dict:
+    """
+    Validate repository query parameters.
+    
+    Raises:
+        ValueError: With a message suitable for the client
+    """
+    query = {}
+    
+    try:
+        query['limit'] = max(1, min(int(params.get('limit', 20)), 50))
+    except ValueError:
+        raise ValueError("'limit' must be an integer")
+    
+    query['featured'] = params.get('featured', 'false').lower() == 'true'
+    query['language'] = params.get('language') or None
+    query['topic'] = params.get('topic') or None
+    query['cursor'] = params.get('cursor') or None
+    
+    if params.get('min_stars'):
+        try:
+            query['min_stars'] = int(params['min_stars'])
+        except ValueError:
+            raise ValueError("'min_stars' must be an integer")
+    
+    if params.get('updated_since'):
+        value = params['updated_since']
+        since = parse_datetime(value) or (
+            datetime.combine(parse_date(value), datetime.min.time()) if parse_date(value) else None
+        )
+        if since is None:
+            raise ValueError("'updated_since' must be an ISO 8601 date or datetime")
+        if timezone.is_naive(since):
+            since = timezone.make_aware(since, timezone.utc)
+        query['updated_since'] = format_github_datetime(since)
+    
+    query['sort'] = params.get('sort', 'stars')
+    if query['sort'] not in SORT_KEYS:
+        raise ValueError(f"'sort' must be one of: {', '.join(SORT_KEYS)}")
+    
+    query['direction'] = params.get('order', 'desc')
+    if query['direction'] not in DIRECTIONS:
+        raise ValueError("'order' must be 'asc' or 'desc'")
+    
+    return query
+
 @api_view(['GET'])
 @throttle_classes([GitHubRateThrottle])
-@cache_page(60 * 30)  # Cache for 30 minutes
-@vary_on_headers('User-Agent')
-def get_repositories(request):
+@cached_response(
+    60,
+    query_params=('limit', 'featured') + INDEX_QUERY_PARAMS,
+    s_maxage=300,
+    stale_while_revalidate=3600,
+    normalize=parse_repository_query,
+)
+def get_repositories(request, username=None):
     """
-    Get GitHub repositories for the configured user.
+    Get GitHub repositories for the default profile, or for `username`.
     
     Query Parameters:
     - limit: Number of repositories to return (default: 20, max: 50)
     - featured: If true, return only featured repositories (default: false)
+    - language: Only repositories with this primary language
+    - topic: Only repositories tagged with this topic
+    - min_stars: Only repositories with at least this many stars
+    - updated_since: Only repositories updated at or after this ISO 8601 date/datetime
+    - sort: stars (default), forks, updated, created or name
+    - order: desc (default) or asc
+    - cursor: Opaque cursor from `next_cursor` of the previous page
     
     Returns:
     - List of repository objects with metadata
     """
     try:
         # Get query parameters
-        limit = min(int(request.GET.get('limit', 20)), 50)
-        featured_only = request.GET.get('featured', 'false').lower() == 'true'
+        try:
+            query = parse_repository_query(request.GET)
+        except ValueError as e:
+            return Response({
+                'success': False,
+                'message': str(e),
+                'timestamp': datetime.now().isoformat()
+            }, status=status.HTTP_400_BAD_REQUEST)
         
-        # Initialize GitHub service
-        github_service = GitHubService()
+        profile = resolve_profile(username)
+        if profile is None:
+            return unknown_profile_response(username)
         
-        # Fetch repositories
-        repos = github_service.get_repositories()
+        # Initialize GitHub service
+        github_service = GitHubService(profile)
         
-        # Filter featured repositories if requested
-        if featured_only:
-            # Consider repos with more stars or specific topics as featured
-            repos = [repo for repo in repos 
-                    if repo['stargazers_count'] > 0 or 
-                    any(topic in ['featured', 'portfolio', 'showcase'] 
-                        for topic in repo['topics'])]
+        if not any(request.GET.get(param) for param in INDEX_QUERY_PARAMS):
+            # Rendered once per data version and variant
+            body = repositories_payload(github_service, query['limit'], query['featured'])
+            return HttpResponse(body, content_type='application/json')
         
-        # Limit results
-        repos = repos[:limit]
+        try:
+            repos, next_cursor, total = get_repository_index(github_service).query(**query)
+        except InvalidCursor as e:
+            return Response({
+                'success': False,
+                'message': str(e),
+                'timestamp': datetime.now().isoformat()
+            }, status=status.HTTP_400_BAD_REQUEST)
         
-        # Serialize data
-        serializer = RepositorySerializer(repos, many=True)
+        data = encode_repositories(repos)
         
-        return Response({
+        body = render_json({
             'success': True,
-            'count': len(serializer.data),
-            'data': serializer.data,
+            'count': len(data),
+            'total': total,
+            'next_cursor': next_cursor,
+            'data': data,
             'last_updated': datetime.now().isoformat()
         })
+        return HttpResponse(body, content_type='application/json')
         
     except GitHubAPIError as e:
         logger.error(f"GitHub API error in get_repositories: {e}")
-        return handle_github_error(e, 'fetching repositories')
+        data = last_known_good(lambda: stale_repositories_payload(github_service, query))
+        if data is not None:
+            return stale_response(data)
+        return handle_github_error(e, FETCH_REPOSITORIES)
     
     except Exception as e:
         logger.error(f"Unexpected error in get_repositories: {e}")
-        return handle_github_error(e, 'fetching repositories')
+        return handle_github_error(e, FETCH_REPOSITORIES)
 
 @api_view(['GET'])
 @throttle_classes([GitHubRateThrottle])
-@cache_page(60 * 60)  # Cache for 1 hour
-@vary_on_headers('User-Agent')
-def get_github_stats(request):
+@cached_response(60, s_maxage=300, stale_while_revalidate=3600)
+def get_repository(request, name, username=None):
     """
-    Get GitHub user statistics.
+    Get one repository with its README rendered to sanitized HTML.
+    
+    READMEs are rendered during sync and cached by blob SHA, so this is
+    answered from the cache; GitHub is only called for a README that has
+    never been fetched.
     
     Returns:
-    - User statistics including total repos, stars, forks, and language breakdown
+    - Repository metadata plus `readme_html` and `readme_sha` (null when
+      the repository has no README)
     """
     try:
+        profile = resolve_profile(username)
+        if profile is None:
+            return unknown_profile_response(username)
+        
         # Initialize GitHub service
-        github_service = GitHubService()
+        github_service = GitHubService(profile)
         
-        # Fetch user statistics
-        stats = github_service.get_user_stats()
+        repo = get_repository_index(github_service).get(name)
+        if repo is None:
+            return Response({
+                'success': False,
+                'message': f"Repository '{name}' not found",
+                'timestamp': datetime.now().isoformat()
+            }, status=status.HTTP_404_NOT_FOUND)
         
-        # Serialize data
-        serializer = GitHubStatsSerializer(stats)
+        body = render_json({
+            'success': True,
+            'data': repository_detail(github_service, repo),
+            'last_updated': datetime.now().isoformat()
+        })
+        return HttpResponse(body, content_type='application/json')
         
-        return Response({
+    except GitHubAPIError as e:
+        logger.error(f"GitHub API error in get_repository: {e}")
+        data = last_known_good(lambda: stale_repository_detail_payload(github_service, name))
+        if data is not None:
+            return stale_response(data)
+        return handle_github_error(e, FETCH_REPOSITORY)
+    
+    except Exception as e:
+        logger.error(f"Unexpected error in get_repository: {e}")
+        return handle_github_error(e, FETCH_REPOSITORY)
+
+@api_view(['GET'])
+@throttle_classes([GitHubRateThrottle])
+@cached_response(60, query_params=('q', 'limit'), s_maxage=300, stale_while_revalidate=3600)
+def search_repositories(request, username=None):
+    """
+    Full-text search over repository names, descriptions and topics.
+    
+    Query Parameters:
+    - q: Search text; partial words match by prefix
+    - limit: Number of results to return (default: 20, max: 50)
+    
+    Returns:
+    - Matching repositories, best first, each with its relevance `score`
+    """
+    try:
+        query = request.GET.get('q', '').strip()
+        if not query:
+            return Response({
+                'success': False,
+                'message': "'q' is required",
+                'timestamp': datetime.now().isoformat()
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            limit = max(1, min(int(request.GET.get('limit', 20)), 50))
+        except ValueError:
+            return Response({
+                'success': False,
+                'message': "'limit' must be an integer",
+                'timestamp': datetime.now().isoformat()
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        profile = resolve_profile(username)
+        if profile is None:
+            return unknown_profile_response(username)
+        
+        # Initialize GitHub service
+        github_service = GitHubService(profile)
+        
+        results = get_search_index(github_service).search(query, limit)
+        
+        data = encode_search_results(results)
+        
+        body = render_json({
             'success': True,
-            'data': serializer.data
+            'query': query,
+            'count': len(data),
+            'data': data,
+            'last_updated': datetime.now().isoformat()
         })
+        return HttpResponse(body, content_type='application/json')
+        
+    except GitHubAPIError as e:
+        logger.error(f"GitHub API error in search_repositories: {e}")
+        data = last_known_good(lambda: stale_search_payload(github_service, query, limit))
+        if data is not None:
+            return stale_response(data)
+        return handle_github_error(e, SEARCH_REPOSITORIES)
+    
+    except Exception as e:
+        logger.error(f"Unexpected error in search_repositories: {e}")
+        return handle_github_error(e, SEARCH_REPOSITORIES)
+
+@api_view(['GET'])
+@throttle_classes([GitHubRateThrottle])
+@cached_response(60, s_maxage=300, stale_while_revalidate=3600)
+def get_github_stats(request, username=None):
+    """
+    Get GitHub user statistics.
+    
+    Returns:
+    - User statistics including total repos, stars, forks, and language breakdown
+    """
+    try:
+        profile = resolve_profile(username)
+        if profile is None:
+            return unknown_profile_response(username)
+        
+        # Initialize GitHub service
+        github_service = GitHubService(profile)
+        
+        # Rendered once per data version
+        body = stats_payload(github_service)
+        
+        return HttpResponse(body, content_type='application/json')
         
     except GitHubAPIError as e:
         logger.error(f"GitHub API error in get_github_stats: {e}")
-        return handle_github_error(e, 'fetching GitHub statistics')
+        data = last_known_good(lambda: stale_stats_payload(github_service))
+        if data is not None:
+            return stale_response(data)
+        return handle_github_error(e, FETCH_STATS)
     
     except Exception as e:
         logger.error(f"Unexpected error in get_github_stats: {e}")
-        return handle_github_error(e, 'fetching GitHub statistics')
+        return handle_github_error(e, FETCH_STATS)
+
+@api_view(['GET'])
+def rate_limit_status(request):
+    """
+    Current GitHub rate limit budget, shared by all workers.
+    
+    Returns:
+    - Per bucket (`core`, `graphql`): limit, remaining calls, reset time,
+      the factor cache TTLs are stretched by and which call priorities may
+      still spend; null until a response from that bucket has been seen
+    - The repository and statistics soft TTLs currently in effect
+    """
+    github_service = GitHubService()
+    
+    return Response({
+        'success': True,
+        'data': ratelimit.status(),
+        'cache_ttl': {
+            'repositories': github_service.repos_soft_ttl(),
+            'stats': github_service.stats_soft_ttl(),
+        },
+        'timestamp': datetime.now().isoformat()
+    })
 
 @api_view(['POST'])
 @throttle_classes([GitHubRateThrottle])
-def refresh_cache(request):
+def refresh_cache(request, username=None):
     """
     Refresh GitHub data cache.
     
@@ -137,33 +410,38 @@ def refresh_cache(request):
     Should be used sparingly to avoid hitting GitHub rate limits.
     """
     try:
+        profile = resolve_profile(username)
+        if profile is None:
+            return unknown_profile_response(username)
+        
         # Initialize GitHub service
-        github_service = GitHubService()
+        github_service = GitHubService(profile)
         
-        # Clear existing cache
-        github_service.clear_cache()
+        # Revalidate upstream and overwrite the cache; the old entries keep
+        # serving concurrent requests until the new ones are written
+        result = github_service.sync()
         
-        # Fetch fresh data (this will populate the cache)
-        repos = github_service.get_repositories()
-        stats = github_service.get_user_stats()
+        # Bring this worker's search index up to date with the new data
+        get_search_index(github_service)
         
         return Response({
             'success': True,
             'message': 'Cache refreshed successfully',
             'data': {
-                'repositories_count': len(repos),
-                'total_stars': stats['total_stars'],
+                'repositories_count': len(result['repositories']),
+                'total_stars': result['stats']['total_stars'],
+                'changed': result['changed'],
                 'last_updated': datetime.now().isoformat()
             }
         })
         
     except GitHubAPIError as e:
         logger.error(f"GitHub API error in refresh_cache: {e}")
-        return handle_github_error(e, 'refreshing cache')
+        return handle_github_error(e, REFRESH_CACHE)
     
     except Exception as e:
         logger.error(f"Unexpected error in refresh_cache: {e}")
-        return handle_github_error(e, 'refreshing cache')
+        return handle_github_error(e, REFRESH_CACHE)
 
 @api_view(['GET'])
 def health_check(request):
@@ -183,21 +461,18 @@ def health_check(request):
             'service_available': True
         }
         
-        # Try to make a simple API call to verify connectivity
-        if config_status['has_username']:
-            try:
-                github_service._make_request(f"/users/{github_service.username}")
-                config_status['api_accessible'] = True
-            except:
-                config_status['api_accessible'] = False
-        else:
-            config_status['api_accessible'] = False
+        # Judged from the shared circuit breaker instead of a live call, so
+        # probes never spend rate limit or wait on GitHub
+        breaker_state = get_breaker().state()
+        config_status['api_accessible'] = config_status['has_username'] and breaker_state != OPEN
         
         return Response({
             'success': True,
             'service': 'GitHub API Integration',
             'status': 'healthy' if all(config_status.values()) else 'degraded',
             'configuration': config_status,
+            'circuit_breaker': breaker_state,
+            'rate_limit': ratelimit.status(),
             'timestamp': datetime.now().isoformat()
         })
         
@@ -208,4 +483,51 @@ def health_check(request):
             'status': 'unhealthy',
             'error': str(e),
             'timestamp': datetime.now().isoformat()
-        }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
\ No newline at end of file
+        }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+@api_view(['POST'])
+@throttle_classes([])
+def github_webhook(request):
+    """
+    Receive GitHub webhooks and patch the affected repository.
+    
+    Handles `push`, `repository`, `star` and `fork` events signed with
+    GITHUB_WEBHOOK_SECRET. Only the repository in the payload is updated;
+    statistics totals are adjusted incrementally.
+    """
+    # Read the raw body before DRF parses it; the signature covers the exact bytes
+    body = request.body
+    
+    if not settings.GITHUB_WEBHOOK_SECRET:
+        return Response({
+            'success': False,
+            'message': 'Webhook secret not configured',
+        }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+    
+    if not verify_signature(settings.GITHUB_WEBHOOK_SECRET, body, request.META.get('HTTP_X_HUB_SIGNATURE_256')):
+        logger.warning("Rejected GitHub webhook with invalid signature")
+        return Response({
+            'success': False,
+            'message': 'Invalid signature',
+        }, status=status.HTTP_403_FORBIDDEN)
+    
+    event = request.META.get('HTTP_X_GITHUB_EVENT', '')
+    if event == 'ping':
+        return Response({'success': True, 'result': 'pong'})
+    
+    try:
+        result = handle_event(event, request.data)
+        
+        return Response({
+            'success': True,
+            'event': event,
+            'result': result,
+        })
+        
+    except GitHubAPIError as e:
+        logger.error(f"GitHub API error in github_webhook: {e}")
+        return handle_github_error(e, 'processing webhook')
+    
+    except Exception as e:
+        logger.error(f"Unexpected error in github_webhook: {e}")
+        return handle_github_error(e, 'processing webhook')
\ No newline at end of file
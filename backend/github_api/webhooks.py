@@ -0,0 +1,80 @@
+import hashlib
+import hmac
+import logging
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from .models import GITHUB_DATETIME_FORMAT
+from .profiles import resolve_profile
+from .services import GitHubService
+
+logger = logging.getLogger(__name__)
+
+# Events that carry an up-to-date `repository` object worth patching in
+HANDLED_EVENTS = {'push', 'repository', 'star', 'fork'}
+
+# `repository` event actions after which the repo no longer belongs in the list
+REMOVAL_ACTIONS = {'deleted', 'privatized', 'transferred'}
+
+def verify_signature(secret: str, body: bytes, signature: Optional[str]) -> bool:
+    """Check GitHub's `X-Hub-Signature-256` header against the raw request body."""
+    if not secret or not signature or not signature.startswith('sha256='):
+        return False
+    expected = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(f"sha256={expected}", signature)
+
+def _normalize_repository(repository: Dict) -> Dict:
+    """
+    Convert webhook repository timestamps to the REST API format.
+
+    Push events send `created_at`/`pushed_at` as epoch seconds rather than
+    ISO 8601 strings.
+    """
+    normalized = dict(repository)
+    for field in ('created_at', 'updated_at', 'pushed_at'):
+        value = normalized.get(field)
+        if isinstance(value, (int, float)):
+            normalized[field] = datetime.fromtimestamp(value, tz=timezone.utc).strftime(GITHUB_DATETIME_FORMAT)
+    return normalized
+
+def handle_event(event: str, payload: Dict, service: Optional[GitHubService] = None) -> str:
+    """
+    Apply a webhook event to stored and cached repository data.
+
+    Events are applied to the configured profile owning the repository;
+    repositories of other owners are ignored.
+
+    Returns:
+        Short description of what was done, for the response body
+    """
+    if event not in HANDLED_EVENTS:
+        return 'ignored'
+
+    repository = payload.get('repository')
+    if not repository:
+        return 'ignored'
+
+    owner = (repository.get('owner') or {}).get('login', '')
+    if service is None:
+        profile = resolve_profile(owner)
+        if not profile:
+            return 'ignored'
+        service = GitHubService(profile)
+    elif owner.lower() != service.username.lower():
+        return 'ignored'
+
+    removed = (
+        (event == 'repository' and payload.get('action') in REMOVAL_ACTIONS)
+        or repository.get('private')
+        or repository.get('fork')
+    )
+
+    if removed:
+        service.apply_repository_change(repository['id'])
+        logger.info(f"Webhook '{event}' removed repository {repository.get('full_name') or repository['id']}")
+        return 'removed'
+
+    processed = service._process_repository(_normalize_repository(repository))
+    service.apply_repository_change(repository['id'], processed)
+    logger.info(f"Webhook '{event}' updated repository {repository.get('full_name') or repository['id']}")
+    return 'updated'
@@ -0,0 +1,260 @@
+"""
+Host-local cache backends shared by every worker process.
+
+`SQLiteCache` keeps entries in a SQLite database in WAL mode, so all
+gunicorn workers on a host see the same data and `add`/`incr` are atomic
+across processes. `TieredCache` puts a small in-process LRU in front of it
+for hot reads.
+"""
+
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+class SQLiteCache(BaseCache):
+    """
+    Cache backend storing pickled values in a SQLite database file.
+
+    LOCATION is the database path. Each thread gets its own connection;
+    writes that read before they write (`add`, `incr`, `touch`) take the
+    database write lock so they are atomic across processes.
+    """
+
+    pickle_protocol = pickle.HIGHEST_PROTOCOL
+
+    # Culling runs every CULL_EVERY writes rather than on each one
+    CULL_EVERY = 100
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        self._path = location
+        self._local = threading.local()
+        self._writes = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        # Connections must not cross a fork
+        if conn is None or self._local.pid != os.getpid():
+            directory = os.path.dirname(self._path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self._path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS cache ('
+                'key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS cache_expires ON cache (expires)')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    # Operations on already-made keys; TieredCache builds on these.
+
+    def _get(self, key):
+        row = self._connection().execute(
+            'SELECT value, expires FROM cache WHERE key = ?', (key,)
+        ).fetchone()
+        if row is None or _expired(row[1]):
+            return None, None
+        return row[0], row[1]
+
+    def _set(self, key, pickled, expires):
+        self._connection().execute(
+            'INSERT OR REPLACE INTO cache (key, value, expires) VALUES (?, ?, ?)',
+            (key, pickled, expires),
+        )
+        self._maybe_cull()
+
+    def _add(self, key, pickled, expires) -> bool:
+        cursor = self._connection().execute(
+            'INSERT INTO cache (key, value, expires) VALUES (?, ?, ?) '
+            'ON CONFLICT (key) DO UPDATE SET value = excluded.value, expires = excluded.expires '
+            'WHERE cache.expires IS NOT NULL AND cache.expires <= ?',
+            (key, pickled, expires, time.time()),
+        )
+        return cursor.rowcount == 1
+
+    def _incr(self, key, delta):
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute('SELECT value, expires FROM cache WHERE key = ?', (key,)).fetchone()
+            if row is None or _expired(row[1]):
+                raise ValueError("Key '%s' not found" % key)
+            new_value = pickle.loads(row[0]) + delta
+            conn.execute(
+                'UPDATE cache SET value = ? WHERE key = ?',
+                (pickle.dumps(new_value, self.pickle_protocol), key),
+            )
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        return new_value
+
+    def _touch(self, key, expires) -> bool:
+        cursor = self._connection().execute(
+            'UPDATE cache SET expires = ? WHERE key = ? AND (expires IS NULL OR expires > ?)',
+            (expires, key, time.time()),
+        )
+        return cursor.rowcount == 1
+
+    def _delete(self, key) -> bool:
+        cursor = self._connection().execute('DELETE FROM cache WHERE key = ?', (key,))
+        return cursor.rowcount == 1
+
+    def _maybe_cull(self):
+        self._writes += 1
+        if self._writes % self.CULL_EVERY:
+            return
+
+        conn = self._connection()
+        conn.execute('DELETE FROM cache WHERE expires IS NOT NULL AND expires <= ?', (time.time(),))
+        count = conn.execute('SELECT COUNT(*) FROM cache').fetchone()[0]
+        if count > self._max_entries:
+            if self._cull_frequency == 0:
+                conn.execute('DELETE FROM cache')
+            else:
+                # Drop the entries closest to expiry first
+                conn.execute(
+                    'DELETE FROM cache WHERE key IN ('
+                    'SELECT key FROM cache ORDER BY expires IS NULL, expires LIMIT ?)',
+                    (count // self._cull_frequency,),
+                )
+
+    # Django cache API
+
+    def get(self, key, default=None, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        pickled, _ = self._get(key)
+        return default if pickled is None else pickle.loads(pickled)
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        self._set(key, pickle.dumps(value, self.pickle_protocol), self.get_backend_timeout(timeout))
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        return self._add(key, pickle.dumps(value, self.pickle_protocol), self.get_backend_timeout(timeout))
+
+    def incr(self, key, delta=1, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        return self._incr(key, delta)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        return self._touch(key, self.get_backend_timeout(timeout))
+
+    def has_key(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        return self._get(key)[0] is not None
+
+    def delete(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        return self._delete(key)
+
+    def clear(self):
+        self._connection().execute('DELETE FROM cache')
+
+class TieredCache(SQLiteCache):
+    """
+    SQLiteCache with a small in-process LRU (L1) in front of it.
+
+    Reads are answered from L1 when possible; every write goes to SQLite
+    (L2) first. `add`, `incr` and `touch` always run against L2 and drop
+    the L1 copy, so locks and counters stay exact across workers. Plain
+    reads may lag another worker's write by at most L1_TIMEOUT seconds.
+
+    OPTIONS:
+        L1_MAX_ENTRIES: entries kept in process (default 256)
+        L1_TIMEOUT: seconds an L1 entry may be served (default 5)
+    """
+
+    def __init__(self, location, params):
+        super().__init__(location, params)
+        options = params.get('OPTIONS', {})
+        self._l1_max_entries = int(options.get('L1_MAX_ENTRIES', 256))
+        self._l1_timeout = float(options.get('L1_TIMEOUT', 5))
+        self._l1 = OrderedDict()
+        self._l1_lock = threading.Lock()
+
+    def _l1_get(self, key):
+        with self._l1_lock:
+            entry = self._l1.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= time.time():
+                del self._l1[key]
+                return None
+            self._l1.move_to_end(key)
+            return entry[0]
+
+    def _l1_set(self, key, pickled, expires):
+        l1_expires = time.time() + self._l1_timeout
+        if expires is not None:
+            l1_expires = min(l1_expires, expires)
+        with self._l1_lock:
+            self._l1[key] = (pickled, l1_expires)
+            self._l1.move_to_end(key)
+            while len(self._l1) > self._l1_max_entries:
+                self._l1.popitem(last=False)
+
+    def _l1_delete(self, key):
+        with self._l1_lock:
+            self._l1.pop(key, None)
+
+    def get(self, key, default=None, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        pickled = self._l1_get(key)
+        if pickled is None:
+            pickled, expires = self._get(key)
+            if pickled is None:
+                return default
+            self._l1_set(key, pickled, expires)
+        return pickle.loads(pickled)
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        pickled = pickle.dumps(value, self.pickle_protocol)
+        expires = self.get_backend_timeout(timeout)
+        self._set(key, pickled, expires)
+        self._l1_set(key, pickled, expires)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        self._l1_delete(key)
+        return self._add(key, pickle.dumps(value, self.pickle_protocol), self.get_backend_timeout(timeout))
+
+    def incr(self, key, delta=1, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        self._l1_delete(key)
+        return self._incr(key, delta)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        self._l1_delete(key)
+        return self._touch(key, self.get_backend_timeout(timeout))
+
+    def has_key(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        return self._l1_get(key) is not None or self._get(key)[0] is not None
+
+    def delete(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        self._l1_delete(key)
+        return self._delete(key)
+
+    def clear(self):
+        with self._l1_lock:
+            self._l1.clear()
+        super().clear()
+
+def _expired(expires) -> bool:
+    return expires is not None and expires <= time.time()
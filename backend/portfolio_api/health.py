@@ -0,0 +1,145 @@
+import logging
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.http import HttpResponse, JsonResponse
+from django.views.decorators.http import require_http_methods
+
+from github_api import ratelimit
+from github_api.breaker import get_breaker
+from github_api.encoders import render_json
+
+logger = logging.getLogger(__name__)
+
+class HealthProber:
+    """
+    Periodically checks the service's dependencies from a background thread.
+
+    Each worker runs its own prober, started by the first readiness probe.
+    Every `interval` seconds it checks the database and the cache and reads
+    the GitHub circuit breaker and the last observed rate limit from the
+    cache; GitHub itself is never called. The result is rendered once per
+    run, so answering a probe only returns prepared bytes.
+    """
+
+    def __init__(self, interval: int):
+        self.interval = interval
+        self.record: Optional[Dict] = None
+        self.body = b''
+        self.ready = False
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def status(self):
+        """Return `(ready, rendered record)`, starting the prober if needed."""
+        if self._thread is None or not self._thread.is_alive():
+            with self._lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self.refresh()
+                    self._thread = threading.Thread(target=self._run, name='health-prober', daemon=True)
+                    self._thread.start()
+        elif time.time() - self.record['checked_at'] > 3 * self.interval:
+            # The prober is alive but stuck; a stale record is not evidence of health
+            return False, self.body
+
+        return self.ready, self.body
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception("Health probe failed")
+
+    def refresh(self):
+        checks = {
+            'database': self._check(self._check_database),
+            'cache': self._check(self._check_cache),
+            'github': self._github_status(),
+        }
+        ready = checks['database']['ok'] and checks['cache']['ok']
+
+        record = {
+            'status': 'ready' if ready else 'not_ready',
+            'checks': checks,
+            'checked_at': time.time(),
+        }
+        body = render_json(dict(record, checked_at=datetime.now().isoformat()))
+
+        self.record, self.body, self.ready = record, body, ready
+        if not ready:
+            logger.warning(f"Service not ready: {checks}")
+
+    def _check(self, check) -> Dict:
+        started = time.perf_counter()
+        try:
+            check()
+        except Exception as e:
+            return {'ok': False, 'error': str(e)}
+        return {'ok': True, 'latency_ms': round((time.perf_counter() - started) * 1000, 2)}
+
+    def _check_database(self):
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+        finally:
+            # Runs outside the request cycle; don't keep a connection per prober thread
+            connection.close()
+
+    def _check_cache(self):
+        # Per process: other workers' probers write their own tokens to a shared cache
+        key = f"health_probe_{os.getpid()}"
+        token = uuid.uuid4().hex
+        cache.set(key, token, 3 * self.interval)
+        if cache.get(key) != token:
+            raise RuntimeError('cache did not return the value just written')
+
+    def _github_status(self) -> Dict:
+        try:
+            return {
+                'circuit_breaker': get_breaker().state(),
+                'rate_limit': ratelimit.status(),
+            }
+        except Exception as e:
+            return {'error': str(e)}
+
+_prober: Optional[HealthProber] = None
+
+def get_prober() -> HealthProber:
+    global _prober
+
+    if _prober is None:
+        _prober = HealthProber(settings.HEALTH_PROBE_INTERVAL)
+    return _prober
+
+@require_http_methods(["GET", "HEAD"])
+def liveness(request):
+    """
+    Liveness probe: the process is up and answering requests.
+
+    Checks nothing else, so a slow or failing dependency never gets the
+    process restarted.
+    """
+    return JsonResponse({'status': 'alive'})
+
+@require_http_methods(["GET", "HEAD"])
+def readiness(request):
+    """
+    Readiness probe: 200 while the database and cache are reachable, else 503.
+
+    Answered from the background prober's latest record. GitHub's state
+    (circuit breaker, rate limit) is reported but does not affect readiness,
+    since GitHub outages are covered by last-known-good data.
+    """
+    ready, body = get_prober().status()
+    response = HttpResponse(body, content_type='application/json', status=200 if ready else 503)
+    response['Cache-Control'] = 'no-store'
+    return response
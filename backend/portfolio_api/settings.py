@@ -43,7 +43,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
-    "whitenoise.middleware.WhiteNoiseMiddleware",
+    "core.middleware.WhiteNoiseMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -51,6 +51,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "github_api.middleware.BackgroundSyncMiddleware",
 ]
 
 ROOT_URLCONF = "portfolio_api.urls"
@@ -127,6 +128,9 @@ REST_FRAMEWORK = {
     "PAGE_SIZE": 20,
 }
 
+# Encoder for pre-rendered JSON responses: "json" (stdlib) or "orjson" if installed
+JSON_ENCODER_BACKEND = os.getenv("JSON_ENCODER_BACKEND", "json")
+
 # CORS
 CORS_ALLOWED_ORIGINS = os.getenv(
     "CORS_ALLOWED_ORIGINS",
@@ -138,18 +142,148 @@ CORS_ALLOW_CREDENTIALS = True
 # GitHub API
 GITHUB_TOKEN = os.getenv("GITHUB_TOKEN", "")
 GITHUB_USERNAME = os.getenv("GITHUB_USERNAME", "")
+# Further profiles served under /api/github/<username>/, comma-separated
+GITHUB_PROFILES = [name.strip() for name in os.getenv("GITHUB_PROFILES", "").split(",") if name.strip()]
+# Profiles whose indexes each worker keeps in memory; the least recently used go first
+GITHUB_MAX_ACTIVE_PROFILES = int(os.getenv("GITHUB_MAX_ACTIVE_PROFILES", 16))
+GITHUB_WEBHOOK_SECRET = os.getenv("GITHUB_WEBHOOK_SECRET", "")
+GITHUB_TIMEOUT = float(os.getenv("GITHUB_TIMEOUT", 10))
+GITHUB_POOL_SIZE = int(os.getenv("GITHUB_POOL_SIZE", 10))
+GITHUB_MAX_RETRIES = int(os.getenv("GITHUB_MAX_RETRIES", 3))
+GITHUB_BACKOFF_BASE = float(os.getenv("GITHUB_BACKOFF_BASE", 0.5))
+GITHUB_RATE_LIMIT_MAX_WAIT = float(os.getenv("GITHUB_RATE_LIMIT_MAX_WAIT", 60))
+GITHUB_VALIDATOR_TTL = int(os.getenv("GITHUB_VALIDATOR_TTL", 7 * 24 * 3600))
+GITHUB_MAX_PAGES = int(os.getenv("GITHUB_MAX_PAGES", 10))
+GITHUB_MAX_WORKERS = int(os.getenv("GITHUB_MAX_WORKERS", 4))
+GITHUB_USE_GRAPHQL = os.getenv("GITHUB_USE_GRAPHQL", "False") == "True"
+# Language breakdown in stats: "primary" counts each repo's primary language;
+# "bytes" weighs languages by code size from each repo's /languages endpoint
+GITHUB_LANGUAGE_STATS = os.getenv("GITHUB_LANGUAGE_STATS", "primary")
+# Fetch and render changed READMEs during sync for the repository detail endpoint
+GITHUB_PREFETCH_READMES = os.getenv("GITHUB_PREFETCH_READMES", "True") == "True"
+# Route repos/stats/refresh/health to the async views; use with an ASGI server
+GITHUB_ASYNC_VIEWS = os.getenv("GITHUB_ASYNC_VIEWS", "False") == "True"
+
+# GitHub data is served fresh until the soft TTL, then served stale while a
+# single background refresh runs, until the hard TTL evicts it.
+GITHUB_REPOS_SOFT_TTL = int(os.getenv("GITHUB_REPOS_SOFT_TTL", 3600))
+GITHUB_REPOS_HARD_TTL = int(os.getenv("GITHUB_REPOS_HARD_TTL", 24 * 3600))
+GITHUB_STATS_SOFT_TTL = int(os.getenv("GITHUB_STATS_SOFT_TTL", 7200))
+GITHUB_STATS_HARD_TTL = int(os.getenv("GITHUB_STATS_HARD_TTL", 24 * 3600))
+GITHUB_REFRESH_LOCK_TTL = int(os.getenv("GITHUB_REFRESH_LOCK_TTL", 60))
+# Processed repositories and statistics kept as a fallback for GitHub outages
+GITHUB_LAST_KNOWN_GOOD_TTL = int(os.getenv("GITHUB_LAST_KNOWN_GOOD_TTL", 30 * 24 * 3600))
+
+# Circuit breaker, shared by all workers through the cache: after this many
+# upstream failures in a row, GitHub calls fail immediately until a single
+# trial request, let through after the reset timeout, succeeds.
+GITHUB_BREAKER_FAILURE_THRESHOLD = int(os.getenv("GITHUB_BREAKER_FAILURE_THRESHOLD", 5))
+GITHUB_BREAKER_RESET_TIMEOUT = int(os.getenv("GITHUB_BREAKER_RESET_TIMEOUT", 30))
+
+# Rate limit budget: share of the hourly limit that background refreshes and
+# optional prefetches must leave for visitor-facing loads. Cache TTLs are
+# stretched (up to the reset time) as the budget runs low.
+GITHUB_BUDGET_REFRESH_RESERVE = float(os.getenv("GITHUB_BUDGET_REFRESH_RESERVE", 0.1))
+GITHUB_BUDGET_PREFETCH_RESERVE = float(os.getenv("GITHUB_BUDGET_PREFETCH_RESERVE", 0.25))
+GITHUB_ADAPTIVE_TTL = os.getenv("GITHUB_ADAPTIVE_TTL", "True") == "True"
+
+# Background refresh: a thread in each web worker syncs GitHub data into the
+# host's cache; one worker per interval runs it. `manage.py github_sync` runs
+# the same sync from cron or by hand
+GITHUB_BACKGROUND_SYNC = os.getenv("GITHUB_BACKGROUND_SYNC", "True") == "True"
+GITHUB_SYNC_INTERVAL = int(os.getenv("GITHUB_SYNC_INTERVAL", 1800))
+GITHUB_SYNC_JITTER = float(os.getenv("GITHUB_SYNC_JITTER", 0.1))
+# Profiles synced concurrently by each run
+GITHUB_SYNC_WORKERS = int(os.getenv("GITHUB_SYNC_WORKERS", 4))
+# Delta syncs only fetch changed pages; a full sync also prunes deleted repos
+GITHUB_FULL_SYNC_INTERVAL = int(os.getenv("GITHUB_FULL_SYNC_INTERVAL", 24 * 3600))
+
+# Contact form write-behind: submissions are journaled to a local SQLite file
+# and answered with 202; a thread in each web worker inserts them in batches
+CONTACT_WRITE_BEHIND = os.getenv("CONTACT_WRITE_BEHIND", "False") == "True"
+CONTACT_QUEUE_PATH = os.getenv("CONTACT_QUEUE_PATH", str(BASE_DIR / "queue" / "contact-submissions.sqlite3"))
+CONTACT_QUEUE_BATCH_SIZE = int(os.getenv("CONTACT_QUEUE_BATCH_SIZE", 100))
+CONTACT_QUEUE_INTERVAL = float(os.getenv("CONTACT_QUEUE_INTERVAL", 1))
+# Seconds a claimed batch has to be stored before another worker may retry it
+CONTACT_QUEUE_LEASE = int(os.getenv("CONTACT_QUEUE_LEASE", 60))
+# Failed inserts of one submission before it is moved to the journal's dead letters
+CONTACT_QUEUE_MAX_FAILURES = int(os.getenv("CONTACT_QUEUE_MAX_FAILURES", 5))
+
+# Contact form duplicate detection: messages with an estimated similarity
+# (Jaccard, of their MinHash signatures) of at least CONTACT_DUPLICATE_SIMILARITY
+# to one received in the last CONTACT_DUPLICATE_WINDOW seconds are rejected
+CONTACT_DUPLICATE_WINDOW = int(os.getenv("CONTACT_DUPLICATE_WINDOW", 3600))
+CONTACT_DUPLICATE_SIMILARITY = float(os.getenv("CONTACT_DUPLICATE_SIMILARITY", 0.7))
+CONTACT_DUPLICATE_INDEX_PATH = os.getenv(
+    "CONTACT_DUPLICATE_INDEX_PATH", str(BASE_DIR / "cache" / "contact-signatures.sqlite3")
+)
+
+# Contact form spam rules: a JSON file replacing the built-in rules in
+# core/rules.py; rules added in the admin apply on top, without a restart
+CONTACT_SPAM_RULES_FILE = os.getenv("CONTACT_SPAM_RULES_FILE", "")
+
+# Email, used for contact form notifications
+EMAIL_BACKEND = os.getenv("EMAIL_BACKEND", "django.core.mail.backends.smtp.EmailBackend")
+EMAIL_HOST = os.getenv("EMAIL_HOST", "localhost")
+EMAIL_PORT = int(os.getenv("EMAIL_PORT", 25))
+EMAIL_HOST_USER = os.getenv("EMAIL_HOST_USER", "")
+EMAIL_HOST_PASSWORD = os.getenv("EMAIL_HOST_PASSWORD", "")
+EMAIL_USE_TLS = os.getenv("EMAIL_USE_TLS", "False") == "True"
+EMAIL_TIMEOUT = int(os.getenv("EMAIL_TIMEOUT", 10))
+DEFAULT_FROM_EMAIL = os.getenv("DEFAULT_FROM_EMAIL", "webmaster@localhost")
+
+# Contact form notifications, sent by `manage.py send_contact_notifications`;
+# addresses are comma-separated, and none disables the dispatcher
+CONTACT_NOTIFY_RECIPIENTS = [
+    address.strip() for address in os.getenv("CONTACT_NOTIFY_RECIPIENTS", "").split(",") if address.strip()
+]
+CONTACT_NOTIFY_INTERVAL = float(os.getenv("CONTACT_NOTIFY_INTERVAL", 5))
+CONTACT_NOTIFY_BATCH_SIZE = int(os.getenv("CONTACT_NOTIFY_BATCH_SIZE", 50))
+# Submissions due at once from which a single digest is sent instead
+CONTACT_NOTIFY_DIGEST_THRESHOLD = int(os.getenv("CONTACT_NOTIFY_DIGEST_THRESHOLD", 3))
+CONTACT_NOTIFY_MAX_ATTEMPTS = int(os.getenv("CONTACT_NOTIFY_MAX_ATTEMPTS", 5))
+# Seconds before the first retry, doubling with each further one
+CONTACT_NOTIFY_RETRY_BACKOFF = float(os.getenv("CONTACT_NOTIFY_RETRY_BACKOFF", 30))
+# Seconds an unused SMTP connection is kept open
+CONTACT_NOTIFY_IDLE_TIMEOUT = float(os.getenv("CONTACT_NOTIFY_IDLE_TIMEOUT", 60))
+
+# Seconds between background dependency checks behind /health/ready
+HEALTH_PROBE_INTERVAL = int(os.getenv("HEALTH_PROBE_INTERVAL", 10))
 
 # Cache
-CACHES = {
-    "default": {
-        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
-        "LOCATION": "portfolio-cache",
-        "TIMEOUT": int(os.getenv("CACHE_TTL", 3600)),
-        "OPTIONS": {
-            "MAX_ENTRIES": 1000,
-        },
+# "tiered" shares entries between all workers on the host through a SQLite
+# file in WAL mode, with a small per-process LRU in front of it. "sqlite"
+# drops the LRU; "locmem" gives every worker its own private cache.
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "tiered")
+
+if CACHE_BACKEND == "locmem":
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "portfolio-cache",
+            "TIMEOUT": int(os.getenv("CACHE_TTL", 3600)),
+            "OPTIONS": {
+                "MAX_ENTRIES": 1000,
+            },
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": (
+                "portfolio_api.cache_backends.SQLiteCache"
+                if CACHE_BACKEND == "sqlite"
+                else "portfolio_api.cache_backends.TieredCache"
+            ),
+            "LOCATION": os.getenv("CACHE_LOCATION", str(BASE_DIR / "cache" / "portfolio-cache.sqlite3")),
+            "TIMEOUT": int(os.getenv("CACHE_TTL", 3600)),
+            "OPTIONS": {
+                "MAX_ENTRIES": int(os.getenv("CACHE_MAX_ENTRIES", 10000)),
+                "L1_MAX_ENTRIES": int(os.getenv("CACHE_L1_MAX_ENTRIES", 256)),
+                "L1_TIMEOUT": float(os.getenv("CACHE_L1_TIMEOUT", 5)),
+            },
+        }
     }
-}
 
 # Logging
 LOGGING = {
@@ -162,6 +296,10 @@ LOGGING = {
         "handlers": ["console"],
         "level": "INFO",
     },
+    "loggers": {
+        # httpx logs every request at INFO
+        "httpx": {"level": "WARNING"},
+    },
 }
 
 # Security (production only)
@@ -14,10 +14,12 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 from django.http import JsonResponse
 from django.views.decorators.http import require_http_methods
 
+from .health import liveness, readiness
+
 @require_http_methods(["GET"])
 def health_check(request):
     """Simple health check endpoint."""
@@ -37,6 +39,8 @@ def api_info(request):
             'github': '/api/github/',
             'contact': '/api/contact/',
             'health': '/health/',
+            'liveness': '/health/live',
+            'readiness': '/health/ready',
         }
     })
 
@@ -46,4 +50,7 @@ urlpatterns = [
     path('api/github/', include('github_api.urls')),
     path('api/contact/', include('core.urls')),
     path('health/', health_check, name='health-check'),
+    # Probes often skip the trailing slash; answer both without a redirect
+    re_path(r'^health/live/?$', liveness, name='health-live'),
+    re_path(r'^health/ready/?$', readiness, name='health-ready'),
 ]
\ No newline at end of file